@@ -0,0 +1,27 @@
+"""
+Stub msvcrt supaya package `functions` bisa di-import di Linux headless
+"""
+import sys
+import types
+
+
+def install(keys=None):
+    """
+    Pasang module msvcrt palsu di sys.modules.
+    getch() mengembalikan key dari `keys` lalu ESC, kbhit() selalu False
+    (jadi loop ESC-to-cancel di scan/hash tidak pernah berhenti sendiri).
+    """
+    if 'msvcrt' in sys.modules:
+        return sys.modules['msvcrt']
+
+    # subprocess memilih implementasi Windows jika msvcrt bisa di-import,
+    # jadi harus sudah ter-import sebelum stub dipasang
+    import subprocess  # noqa: F401
+
+    pending = list(keys or [])
+    module = types.ModuleType('msvcrt')
+    module.getch = lambda: pending.pop(0) if pending else b'\x1b'
+    module.getwch = lambda: module.getch().decode('utf-8', 'replace')
+    module.kbhit = lambda: False
+    sys.modules['msvcrt'] = module
+    return module
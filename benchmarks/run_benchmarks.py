@@ -0,0 +1,314 @@
+"""
+Benchmark hot path file explorer pada synthetic tree.
+
+Contoh:
+    python benchmarks/run_benchmarks.py                          # profil small
+    python benchmarks/run_benchmarks.py --profile full --repeat 1
+    python benchmarks/run_benchmarks.py --save-baseline          # simpan hasil sebagai baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/run_benchmarks.py --only startup --startup-budget 150
+
+Exit code 1 jika ada case yang lebih lambat dari baseline melebihi threshold,
+atau cold start TUI melewati startup budget.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import msvcrt_stub  # noqa: E402
+msvcrt_stub.install()
+
+from trees import build_trees  # noqa: E402
+from functions import (  # noqa: E402
+    scan_directory,
+    scan_listing,
+    sort_items,
+    search_items,
+    filter_by_extension,
+    copy_multiple_items,
+    move_multiple_items,
+    delete_multiple_items,
+    copy_item,
+    compress_to_zip,
+    analyze_tree,
+    DirSizeEngine,
+    plan_transfer,
+)
+from functions.sorting import (  # noqa: E402
+    format_item_display_detailed,
+    format_item_display_compact,
+    format_item_display_list,
+)
+from functions.compression import extract_zip  # noqa: E402
+from functions.listing import has_numpy  # noqa: E402
+from functions.async_io import get_async_fs, scan_listing_async  # noqa: E402
+from functions.startup import profile_startup, MAIN_SCRIPT  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+SORT_MODES = ["name", "size", "date", "type"]
+STARTUP_BUDGET_MS = 250  # Time to first render (dari baris pertama main.py)
+
+# Child process: pasang stub msvcrt lalu jalankan main.py sebagai __main__ (mode TUI)
+STARTUP_BOOTSTRAP = (
+    "import sys, runpy; sys.path[:0] = [{bench!r}, {root!r}]; "
+    "import msvcrt_stub; msvcrt_stub.install(); "
+    "runpy.run_path({main!r}, run_name='__main__')"
+)
+
+
+def _time(func, repeat, setup=None):
+    """Jalankan func `repeat` kali, return (list durasi, hasil terakhir)"""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def _entries(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def run_cases(trees, workdir, repeat, only=None):
+    """Jalankan semua case, return dict name -> {runs, median, min, entries}"""
+    results = {}
+
+    def case(name, func, setup=None, count=None):
+        if only and not any(pattern in name for pattern in only):
+            return None
+        runs, result = _time(func, repeat, setup)
+        results[name] = {
+            'median': statistics.median(runs),
+            'min': min(runs),
+            'runs': runs,
+            'entries': count if count is not None else _entries(result),
+        }
+        print(f"  {name:<40} {statistics.median(runs) * 1000:>10.2f} ms")
+        return result
+
+    flat = trees['flat']
+    list_items = scan_directory(flat)
+    columnar = scan_listing(flat)
+
+    # Scan
+    case("scan_directory/flat", lambda: scan_directory(flat))
+    case("scan_listing/flat", lambda: scan_listing(flat))
+    # Jalur network file system (stat paralel lewat AsyncFS), di disk lokal = overhead asyncio
+    case("scan_listing/flat/async", lambda: get_async_fs().run(scan_listing_async(flat)))
+
+    # Sort, search, filter (list of tuples & columnar)
+    for mode in SORT_MODES:
+        case(f"sort_items/{mode}/list", lambda mode=mode: sort_items(list_items, mode))
+        case(f"sort_items/{mode}/columnar", lambda mode=mode: sort_items(columnar, mode))
+    case("search_items/list", lambda: search_items(list_items, "file_00"))
+    case("search_items/columnar", lambda: search_items(columnar, "file_00"))
+    case("filter_by_extension/list", lambda: filter_by_extension(list_items, "txt"))
+    case("filter_by_extension/columnar", lambda: filter_by_extension(columnar, "txt"))
+
+    # Format tampilan untuk seluruh listing
+    for name, formatter in (("detailed", format_item_display_detailed),
+                            ("compact", format_item_display_compact),
+                            ("list", format_item_display_list)):
+        case(f"format_item_display/{name}",
+             lambda formatter=formatter: [formatter(item, 100) for item in list_items],
+             count=len(list_items))
+
+    # Tree walk
+    case("analyze_tree/deep", lambda: analyze_tree(trees['deep']))
+    case("analyze_tree/small", lambda: analyze_tree(trees['small']))
+    case("dir_size/small", lambda: DirSizeEngine().compute([trees['small']]))
+
+    # Copy / move / delete engine (setiap repeat mulai dari folder kosong)
+    sources = sorted(os.path.join(trees['small'], name) for name in os.listdir(trees['small']))
+    copy_dest = os.path.join(workdir, "bench_copy")
+    move_dest = os.path.join(workdir, "bench_move")
+
+    def reset_dir(path):
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+    small_files = sum(len(files) for _, _, files in os.walk(trees['small']))
+    case("copy_multiple_items/small", lambda: copy_multiple_items(sources, copy_dest),
+         setup=lambda: reset_dir(copy_dest), count=small_files)
+
+    def prepare_move():
+        reset_dir(move_dest)
+        if not os.listdir(copy_dest):
+            copy_multiple_items(sources, copy_dest)
+    copied = lambda: [os.path.join(copy_dest, name) for name in os.listdir(copy_dest)]
+    case("move_multiple_items/small", lambda: move_multiple_items(copied(), move_dest),
+         setup=prepare_move, count=small_files)
+
+    def prepare_delete():
+        if not os.path.exists(move_dest) or not os.listdir(move_dest):
+            reset_dir(move_dest)
+            copy_multiple_items(sources, move_dest)
+    moved = lambda: [os.path.join(move_dest, name) for name in os.listdir(move_dest)]
+    case("delete_multiple_items/small", lambda: delete_multiple_items(moved()),
+         setup=prepare_delete, count=small_files)
+
+    huge_files = sorted(os.path.join(trees['huge'], name) for name in os.listdir(trees['huge']))
+    huge_dest = os.path.join(workdir, "bench_huge")
+    case("copy_item/huge", lambda: [copy_item(path, huge_dest) for path in huge_files],
+         setup=lambda: reset_dir(huge_dest), count=len(huge_files))
+
+    # Nama bentrok: folder dengan f.txt + 500 copy, lalu 500 paste file yang sama dalam satu batch
+    collide_dir = os.path.join(workdir, "bench_collide")
+    reset_dir(collide_dir)
+    for name in ["f.txt"] + [f"f_copy{i}.txt" for i in range(1, 501)]:
+        open(os.path.join(collide_dir, name), 'w').close()
+    collide_src = os.path.join(collide_dir, "f.txt")
+    case("plan_transfer/collisions", lambda: plan_transfer([collide_src] * 500, collide_dir, 'copy'), count=500)
+
+    # ZIP
+    archive = os.path.join(workdir, "bench.zip")
+    extract_dest = os.path.join(workdir, "bench_extract")
+    case("compress_to_zip/small", lambda: compress_to_zip([trees['small']], archive), count=small_files)
+    case("extract_zip/small", lambda: extract_zip(archive, extract_dest),
+         setup=lambda: reset_dir(extract_dest), count=small_files)
+
+    for path in (copy_dest, move_dest, huge_dest, collide_dir, extract_dest):
+        shutil.rmtree(path, ignore_errors=True)
+    return results
+
+
+def run_startup(start_dir, repeat, only=None):
+    """
+    Cold start TUI di subprocess sampai frame pertama.
+    Return (results, loaded): loaded = module berat yang sudah dimuat sebelum frame pertama.
+    """
+    if only and not any(pattern in "startup" for pattern in only):
+        return {}, []
+    command = ["-c", STARTUP_BOOTSTRAP.format(bench=BENCH_DIR, root=os.path.dirname(BENCH_DIR), main=MAIN_SCRIPT)]
+    profiles = [profile_startup(command, cwd=start_dir) for _ in range(repeat)]
+
+    results = {}
+    for name, key in (("startup/first_render", 'first_render'), ("startup/wall", 'wall')):
+        runs = [profile[key] for profile in profiles]
+        results[name] = {'median': statistics.median(runs), 'min': min(runs), 'runs': runs, 'entries': None}
+        print(f"  {name:<40} {statistics.median(runs) * 1000:>10.2f} ms")
+    return results, profiles[-1]['loaded']
+
+
+def check_startup_budget(results, loaded, budget_ms):
+    """Return list pelanggaran startup budget (kosong = lolos)"""
+    failures = []
+    first_render = results.get("startup/first_render")
+    if first_render and first_render['median'] * 1000 > budget_ms:
+        failures.append(f"time to first render {first_render['median'] * 1000:.1f} ms > budget {budget_ms} ms")
+    if loaded:
+        failures.append(f"loaded before first render: {', '.join(loaded)}")
+    return failures
+
+
+def compare(results, baseline, threshold):
+    """Bandingkan median dengan baseline, return list case yang regresi"""
+    regressions = []
+    print(f"\n  {'case':<40} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            print(f"  {name:<40} {'-':>10} {current['median'] * 1000:>8.2f}ms {'new':>8}")
+            continue
+        delta = (current['median'] - previous['median']) / previous['median'] if previous['median'] else 0.0
+        flag = "  REGRESSION" if delta > threshold else ""
+        print(f"  {name:<40} {previous['median'] * 1000:>8.2f}ms {current['median'] * 1000:>8.2f}ms {delta:>+7.1%}{flag}")
+        if delta > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="File explorer benchmark suite")
+    parser.add_argument("--profile", choices=["small", "full"], default="small")
+    parser.add_argument("--workdir", help="Folder untuk synthetic tree (default: temp, dihapus setelah selesai)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="Hanya jalankan case yang namanya mengandung salah satu string ini")
+    parser.add_argument("--output", help="Tulis hasil ke file JSON ini")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON untuk perbandingan")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Batas regresi (0.15 = 15%% lebih lambat)")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS,
+                        help="Batas time to first render dalam ms")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="explorer_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    # Journal, trash & hash cache dari file operation jangan sampai masuk ke home user
+    os.environ["FILE_EXPLORER_HOME"] = os.path.join(workdir, "app_home")
+
+    try:
+        print(f"Building '{args.profile}' trees in {workdir} ...")
+        start = time.perf_counter()
+        trees = build_trees(workdir, args.profile)
+        print(f"  done in {time.perf_counter() - start:.1f}s\n")
+
+        results = run_cases(trees, workdir, args.repeat, args.only)
+        startup_results, loaded = run_startup(trees['small'], args.repeat, args.only)
+        results.update(startup_results)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'profile': args.profile,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': has_numpy(),
+        },
+        'results': results,
+    }
+
+    budget_failures = check_startup_budget(results, loaded, args.startup_budget)
+    for failure in budget_failures:
+        print(f"\nSTARTUP BUDGET: {failure}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 1 if budget_failures else 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('profile') != args.profile:
+            print(f"\nBaseline profile is '{baseline.get('meta', {}).get('profile')}', skipping comparison")
+            return 1 if budget_failures else 0
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions")
+    return 1 if budget_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
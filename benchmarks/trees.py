@@ -0,0 +1,110 @@
+"""
+Generator synthetic tree yang reproducible (seed tetap) untuk benchmark
+"""
+import os
+import random
+
+
+EXTENSIONS = ['.txt', '.py', '.jpg', '.png', '.pdf', '.docx', '.zip', '.log', '.csv', '']
+BASE_MTIME = 1_600_000_000  # mtime tetap supaya sort by date reproducible
+
+
+def _content(rng, size):
+    """Isi file deterministik (random per 64 KB blok, diulang untuk file besar)"""
+    block = rng.randbytes(min(size, 64 * 1024)) if size else b""
+    if size <= len(block):
+        return block[:size]
+    return (block * (size // len(block) + 1))[:size]
+
+
+def make_flat(root, count, seed=1):
+    """Satu folder dengan `count` file kosong/kecil (nama & mtime acak tapi tetap)"""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    for idx in range(count):
+        name = f"file_{idx:07d}_{rng.randrange(1 << 20):05x}{rng.choice(EXTENSIONS)}"
+        path = os.path.join(root, name)
+        with open(path, 'wb') as f:
+            size = rng.randrange(0, 4096)
+            if size:
+                f.truncate(size)
+        mtime = BASE_MTIME + rng.randrange(10 ** 8)
+        os.utime(path, (mtime, mtime))
+    # Beberapa subfolder supaya sort by type / folder-first ikut teruji
+    for idx in range(max(1, count // 1000)):
+        os.makedirs(os.path.join(root, f"dir_{idx:05d}"), exist_ok=True)
+    return root
+
+
+def make_deep(root, depth, files_per_level=3, seed=2):
+    """Rantai folder sedalam `depth`, beberapa file di setiap level"""
+    rng = random.Random(seed)
+    path = root
+    for level in range(depth):
+        path = os.path.join(path, f"level_{level:04d}")
+        os.makedirs(path, exist_ok=True)
+        for idx in range(files_per_level):
+            with open(os.path.join(path, f"f{idx}{rng.choice(EXTENSIONS)}"), 'wb') as f:
+                f.write(_content(rng, rng.randrange(16, 512)))
+    return root
+
+
+def make_small_files(root, dirs, files_per_dir, seed=3):
+    """Banyak file kecil (1-4 KB, isi acak) tersebar di `dirs` folder"""
+    rng = random.Random(seed)
+    for dir_idx in range(dirs):
+        folder = os.path.join(root, f"group_{dir_idx:04d}")
+        os.makedirs(folder, exist_ok=True)
+        for idx in range(files_per_dir):
+            with open(os.path.join(folder, f"item_{idx:04d}{rng.choice(EXTENSIONS)}"), 'wb') as f:
+                f.write(_content(rng, rng.randrange(1024, 4096)))
+    return root
+
+
+def make_huge(root, count, size, seed=4):
+    """Beberapa file besar berukuran `size` bytes"""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    chunk = _content(rng, 4 * 1024 * 1024)
+    for idx in range(count):
+        with open(os.path.join(root, f"huge_{idx}.bin"), 'wb') as f:
+            remaining = size
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= len(chunk)
+    return root
+
+
+# Profil ukuran tree: small untuk CI / laptop, full sesuai skenario produksi
+# (deep dibatasi 300 level supaya path tetap di bawah PATH_MAX 4096).
+# huge_size harus di atas LARGE_FILE_THRESHOLD (64 MB, functions/transfer.py) supaya
+# copy_item/huge lewat copy_file_resumable (chunk + journal), bukan shutil.copy2
+PROFILES = {
+    'small': {'flat': 20_000, 'deep': 100, 'small_dirs': 50, 'small_files': 100,
+              'huge_count': 1, 'huge_size': 96 * 1024 * 1024},
+    'full': {'flat': 1_000_000, 'deep': 300, 'small_dirs': 1000, 'small_files': 100,
+             'huge_count': 3, 'huge_size': 1024 * 1024 * 1024},
+}
+
+
+def build_trees(workdir, profile='small'):
+    """Buat semua tree untuk profil (di-skip jika sudah ada). Return dict nama -> path"""
+    spec = PROFILES[profile]
+    trees = {
+        'flat': os.path.join(workdir, f"flat_{spec['flat']}"),
+        'deep': os.path.join(workdir, f"deep_{spec['deep']}"),
+        'small': os.path.join(workdir, f"small_{spec['small_dirs']}x{spec['small_files']}"),
+        'huge': os.path.join(workdir, f"huge_{spec['huge_count']}x{spec['huge_size']}"),
+    }
+    builders = {
+        'flat': lambda path: make_flat(path, spec['flat']),
+        'deep': lambda path: make_deep(path, spec['deep']),
+        'small': lambda path: make_small_files(path, spec['small_dirs'], spec['small_files']),
+        'huge': lambda path: make_huge(path, spec['huge_count'], spec['huge_size']),
+    }
+    for name, path in trees.items():
+        marker = os.path.join(workdir, f".{os.path.basename(path)}.done")
+        if not os.path.exists(marker):
+            builders[name](path)
+            open(marker, 'w').close()
+    return trees
@@ -1,118 +1,116 @@
 """
 File Explorer Functions Package
+
+Submodule di-import saat nama pertama kali diakses (PEP 562), jadi
+`from functions import get_key` tidak ikut memuat compression, menu, dll.
 """
+import importlib
 
-from .keyboard import get_key
-from .ui import (
-    clear_screen,
-    get_terminal_size,
-    draw_header,
-    draw_footer,
-    render_ui
-)
-from .file_system import (
-    format_size,
-    get_file_info,
-    scan_directory,
-    open_file,
-    change_directory,
-    go_to_parent
-)
-from .file_operations import (
-    copy_item,
-    move_item,
-    delete_item,
-    rename_item,
-    create_folder,
-    create_file,
-    copy_multiple_items,
-    move_multiple_items,
-    delete_multiple_items
-)
-from .sorting import (
-    sort_items,
-    show_sort_menu,
-    show_view_menu,
-    format_item_display
-)
-from .search_filter import (
-    search_items,
-    filter_by_extension,
-    search_mode_input,
-    filter_mode_input
-)
-from .dialogs import (
-    get_text_input,
-    get_filename_input,
-    confirm_dialog
-)
-from .compression import (
-    is_archive,
-    compress_to_zip,
-    compress_to_7z,
-    compress_to_rar,
-    extract_archive,
-    show_compression_menu
-)
-from .layout import (
-    show_layout_menu
-)
 
-__all__ = [
+# Submodule -> nama yang di-export
+_SUBMODULES = {
     # Keyboard
-    'get_key',
-    
+    'keyboard': ('get_key',),
     # UI
-    'clear_screen',
-    'get_terminal_size',
-    'draw_header',
-    'draw_footer',
-    'render_ui',
-    
+    'ui': (
+        'clear_screen', 'get_terminal_size', 'draw_header', 'draw_footer', 'render_ui', 'render_ui_dual_pane',
+        'render_ui_preview', 'format_cell'
+    ),
     # File System
-    'format_size',
-    'get_file_info',
-    'scan_directory',
-    'open_file',
-    'change_directory',
-    'go_to_parent',
-    
+    'file_system': (
+        'get_app_dir', 'format_size', 'get_file_info', 'scan_directory', 'open_file',
+        'change_directory', 'go_to_parent'
+    ),
     # File Operations
-    'copy_item',
-    'move_item',
-    'delete_item',
-    'rename_item',
-    'create_folder',
-    'create_file',
-    'copy_multiple_items',
-    'move_multiple_items',
-    'delete_multiple_items',
-    
+    'file_operations': (
+        'copy_item', 'move_item', 'delete_item', 'rename_item', 'create_folder', 'create_file',
+        'copy_multiple_items', 'move_multiple_items', 'delete_multiple_items'
+    ),
+    'collisions': ('NameResolver', 'plan_transfer', 'CONFLICT_POLICIES'),
+    'tree_walk': ('walk_tree', 'copy_tree', 'LinkTracker', 'get_symlink_policy'),
     # Sorting
-    'sort_items',
-    'show_sort_menu',
-    'show_view_menu',
-    'format_item_display',
-    
+    'sorting': ('sort_items', 'show_sort_menu', 'show_view_menu', 'format_item_display'),
     # Search & Filter
-    'search_items',
-    'filter_by_extension',
-    'search_mode_input',
-    'filter_mode_input',
-    
+    'search_filter': (
+        'search_items', 'filter_by_extension', 'search_mode_input', 'filter_mode_input'
+    ),
     # Dialogs
-    'get_text_input',
-    'get_filename_input',
-    'confirm_dialog',
-    
+    'dialogs': ('get_text_input', 'get_filename_input', 'confirm_dialog', 'choose_conflict_policy'),
     # Compression
-    'is_archive',
-    'compress_to_zip',
-    'compress_to_7z',
-    'compress_to_rar',
-    'extract_archive',
-    'show_compression_menu',
-    
+    'compression': (
+        'is_archive', 'compress_to_zip', 'compress_to_7z', 'compress_to_rar', 'extract_archive', 'list_archive',
+        'show_compression_menu'
+    ),
     # Layout
-    'show_layout_menu',
-]
\ No newline at end of file
+    'layout': ('show_layout_menu',),
+    # Listing
+    'listing': (
+        'ColumnarListing', 'ListingCache', 'scan_listing', 'apply_listing_changes', 'snapshot_listing', 'restore_listing',
+        'listing_names', 'has_numpy'
+    ),
+    # Viewport
+    'viewport': ('Viewport', 'StreamingSource', 'calculate_layout_info'),
+    # Directory Size
+    'dir_size': ('DirSizeEngine', 'get_dir_size_engine', 'list_dir_paths', 'apply_dir_sizes'),
+    # Analyzer
+    'analyzer': ('analyze_tree', 'show_analyzer'),
+    # Hashing
+    'hashing': ('HashCache', 'hash_partial', 'hash_full', 'available_algorithms'),
+    # Duplicates
+    'duplicates': ('find_duplicates', 'duplicate_items', 'run_duplicate_finder'),
+    # Watcher
+    'watcher': ('DirectoryWatcher', 'coalesce_events'),
+    # Selection
+    'selection': ('Selection', 'all_paths', 'find_index'),
+    # Transfer
+    'transfer': ('copy_file', 'copy_file_resumable', 'discard_partial', 'get_copy_chunk_size'),
+    # Metrics
+    'metrics': ('timed', 'format_overlay', 'flush_export'),
+    # Journal
+    'journal': ('OperationJournal', 'get_journal'),
+    # Sync
+    'sync': ('SyncPlan', 'plan_sync', 'execute_sync', 'show_sync_menu'),
+    # Session
+    'session': ('ExplorerSession',),
+    # CLI
+    'cli': ('run_cli', 'iter_find'),
+    # State
+    'state': ('SessionState', 'get_session_state', 'show_bookmark_menu'),
+    # Jobs
+    'jobs': ('JobQueue',),
+    # Dual Pane
+    'dual_pane': ('DualPane',),
+    # Preview
+    'preview': ('Preview', 'PreviewEngine', 'build_preview'),
+    # Bulk rename
+    'bulk_rename': ('Renamer', 'RenamePlan', 'plan_rename', 'execute_rename', 'show_bulk_rename'),
+    # Tail viewer
+    'tail': ('TailReader', 'show_tail_viewer'),
+    # Async I/O, per-mount tuning & I/O throttle
+    'mounts': ('find_mount', 'is_remote_path'),
+    'io_profile': ('AIMDController', 'ProfileStore', 'get_profile_store'),
+    'throttle': ('IOThrottle', 'TokenBucket', 'get_throttle', 'parse_rate'),
+    'async_io': ('AsyncFS', 'get_async_fs', 'scan_listing_async'),
+    # Checksum
+    'checksum': ('create_manifest', 'read_manifest', 'verify_manifest', 'verify_items', 'run_checksum_tool'),
+    # Startup
+    'startup': ('profile_startup', 'format_startup_report'),
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import submodule pemilik `name` saat pertama kali dipakai, lalu cache di namespace package"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
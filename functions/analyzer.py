@@ -0,0 +1,235 @@
+"""
+Disk usage analyzer (top-N files/folders, extension breakdown)
+"""
+import os
+import heapq
+import msvcrt
+from pathlib import Path
+from .ui import clear_screen, draw_header, get_terminal_size
+from .file_system import format_size
+from .listing import get_extension
+from .tree_walk import LinkTracker
+
+
+# Batas jumlah extension yang dicatat (sisanya masuk "(other)")
+MAX_EXTENSIONS = 2000
+
+
+def _push_top(heap, limit, size, path):
+    """Simpan hanya `limit` item terbesar (min-heap)"""
+    if len(heap) < limit:
+        heapq.heappush(heap, (size, path))
+    elif size > heap[0][0]:
+        heapq.heapreplace(heap, (size, path))
+
+
+def analyze_tree(root, top_n=20, progress=None, should_cancel=None):
+    """
+    Analisa satu subtree dalam satu pass streaming (DFS dengan stack iterator).
+
+    Memory tetap kecil: hanya stack sedalam tree, heap top-N dan tabel extension.
+    Ukuran folder diketahui saat iterator folder habis (post-order), lalu
+    ditambahkan ke parent-nya.
+    """
+    root = str(root)
+    top_files = []
+    top_dirs = []
+    extensions = {}
+    children = []  # Anak langsung dari root: (size, path, is_dir)
+    links = LinkTracker()
+    stats = {'files': 0, 'dirs': 0, 'errors': 0, 'cancelled': False}
+
+    try:
+        stack = [[root, os.scandir(root), 0]]
+    except OSError as e:
+        return {'root': root, 'total': 0, 'error': str(e), 'top_files': [], 'top_dirs': [],
+                'extensions': [], 'children': [], **stats}
+
+    visited = 0
+    while stack:
+        frame = stack[-1]
+        path, entries, _ = frame
+        # Jika dibatalkan, stack tetap di-unwind supaya total partial tetap benar
+        entry = None if stats['cancelled'] else next(entries, None)
+
+        if entry is None:
+            # Folder selesai: catat ukurannya dan tambahkan ke parent
+            entries.close()
+            stack.pop()
+            total = frame[2]
+            if stack:
+                stack[-1][2] += total
+                _push_top(top_dirs, top_n, total, path)
+                if len(stack) == 1:
+                    children.append((total, path, True))
+            continue
+
+        visited += 1
+        if visited % 5000 == 0:
+            if progress is not None:
+                progress(stats['files'], path)
+            if should_cancel is not None and should_cancel():
+                stats['cancelled'] = True
+
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                stats['dirs'] += 1
+                stack.append([entry.path, os.scandir(entry.path), 0])
+                continue
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            stats['errors'] += 1
+            continue
+
+        if links.first_seen(entry.path, stat) is not None:
+            continue  # Hard link: hitung sekali saja
+
+        size = stat.st_size
+        frame[2] += size
+        stats['files'] += 1
+        _push_top(top_files, top_n, size, entry.path)
+
+        ext = get_extension(entry.name) or "(none)"
+        if ext not in extensions and len(extensions) >= MAX_EXTENSIONS:
+            ext = "(other)"
+        bucket = extensions.setdefault(ext, [0, 0])
+        bucket[0] += size
+        bucket[1] += 1
+
+        if len(stack) == 1:
+            children.append((size, entry.path, False))
+
+    total = sum(size for size, _, _ in children)
+    return {
+        'root': root,
+        'total': total,
+        'error': None,
+        'top_files': sorted(top_files, reverse=True),
+        'top_dirs': sorted(top_dirs, reverse=True),
+        'extensions': sorted(((data[0], ext, data[1]) for ext, data in extensions.items()), reverse=True),
+        'children': sorted(children, reverse=True),
+        **stats,
+    }
+
+
+def _bar(size, total, width):
+    """Bar horizontal proporsional (pengganti treemap di terminal)"""
+    if total <= 0 or width <= 0:
+        return ""
+    filled = int(round(width * size / total))
+    return "█" * filled + "░" * (width - filled)
+
+
+def _analyzer_rows(result, tab):
+    """Row untuk tab aktif: (size, label, path, is_dir)"""
+    root = result['root']
+    if tab == 'children':
+        return [(size, Path(path).name + ("/" if is_dir else ""), path, is_dir)
+                for size, path, is_dir in result['children']]
+    if tab == 'files':
+        return [(size, os.path.relpath(path, root), path, False) for size, path in result['top_files']]
+    if tab == 'dirs':
+        return [(size, os.path.relpath(path, root) + "/", path, True) for size, path in result['top_dirs']]
+    return [(size, f"{ext}  ({count} files)", None, False) for size, ext, count in result['extensions']]
+
+
+def _render_analyzer(result, tab, cursor, offset, rows_per_page):
+    clear_screen()
+    cols, _ = get_terminal_size()
+    draw_header(result['root'])
+
+    tabs = [("1", 'children', "Contents"), ("2", 'files', "Top Files"),
+            ("3", 'dirs', "Top Folders"), ("4", 'extensions', "Extensions")]
+    tab_text = "  ".join(f"[{key}] {label}" + (" ✓" if tab == name else "") for key, name, label in tabs)
+    print(f"\n 💽 Disk Usage: {format_size(result['total'])} in {result['files']} files, {result['dirs']} folders")
+    if result['cancelled']:
+        print(" ⚠️  Scan cancelled, results are partial")
+    print(f" {tab_text}")
+    print(" " + "─" * (cols - 2))
+
+    rows = _analyzer_rows(result, tab)
+    if not rows:
+        print("   (No items found)")
+
+    bar_width = max(10, min(30, cols // 4))
+    label_width = max(10, cols - bar_width - 22)
+    for idx in range(offset, min(offset + rows_per_page, len(rows))):
+        size, label, _, _ = rows[idx]
+        if len(label) > label_width:
+            label = "..." + label[-(label_width - 3):]
+        prefix = " > " if idx == cursor else "   "
+        print(f"{prefix}{_bar(size, result['total'], bar_width)} {format_size(size).rjust(10)}  {label}")
+
+    print("\n " + "─" * (cols - 2))
+    print(" [↑↓: Navigate | Enter: Drill down | Backspace: Up | O: Open in explorer | ESC: Close]")
+
+
+def show_analyzer(current_path, top_n=50):
+    """
+    Mode analyzer disk usage. Return path folder yang dipilih untuk dibuka
+    di explorer (tombol O), atau None jika ditutup.
+    """
+    _, lines = get_terminal_size()
+    rows_per_page = max(5, lines - 14)
+
+    def progress(count, path):
+        print(f"\r Scanning... {count} files ({path[-40:]})".ljust(70), end="", flush=True)
+
+    def should_cancel():
+        # ESC saat scan = stop dan tampilkan hasil partial
+        return msvcrt.kbhit() and msvcrt.getch() == b'\x1b'
+
+    def run(path):
+        clear_screen()
+        draw_header(path)
+        print("\n 💽 Analyzing disk usage... (ESC: Stop)")
+        return analyze_tree(path, top_n, progress, should_cancel)
+
+    history = []  # Stack hasil sebelumnya untuk tombol Backspace
+    result = run(current_path)
+    tab = 'children'
+    cursor = 0
+    offset = 0
+
+    while True:
+        rows = _analyzer_rows(result, tab)
+        cursor = max(0, min(cursor, len(rows) - 1))
+        if cursor < offset:
+            offset = cursor
+        elif cursor >= offset + rows_per_page:
+            offset = cursor - rows_per_page + 1
+        _render_analyzer(result, tab, cursor, offset, rows_per_page)
+
+        key = msvcrt.getch()
+        if key == b'\xe0':
+            key = msvcrt.getch()
+            if key == b'H':
+                cursor -= 1
+            elif key == b'P':
+                cursor += 1
+            elif key == b'I':
+                cursor -= rows_per_page
+            elif key == b'Q':
+                cursor += rows_per_page
+        elif key in (b'1', b'2', b'3', b'4'):
+            tab = {b'1': 'children', b'2': 'files', b'3': 'dirs', b'4': 'extensions'}[key]
+            cursor = 0
+            offset = 0
+        elif key == b'\r':
+            # Drill down ke folder yang dipilih
+            if rows and rows[cursor][3]:
+                history.append((result, tab, cursor))
+                result = run(rows[cursor][2])
+                tab = 'children'
+                cursor = 0
+                offset = 0
+        elif key == b'\x08':
+            if history:
+                result, tab, cursor = history.pop()
+                offset = 0
+        elif key in (b'o', b'O'):
+            if rows and rows[cursor][2]:
+                path = rows[cursor][2]
+                return path if rows[cursor][3] else str(Path(path).parent)
+        elif key in (b'\x1b', b'q', b'Q'):
+            return None
@@ -0,0 +1,221 @@
+"""
+Async I/O front end (asyncio) untuk file system dengan latency tinggi (SMB / NFS).
+Setiap stat / scandir / exists adalah satu round-trip jaringan; di sini call
+os.* dijalankan di thread pool dengan banyak request in-flight, dan listing
+di-pipeline dengan stat (stat batch pertama jalan selagi scandir masih membaca).
+"""
+import os
+import math
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_IO_WORKERS = 32   # Request in-flight ke file system remote
+SCAN_BATCH = 256          # Entry per batch dari thread scandir ke event loop
+STAT_BATCH = 8            # Entry per job stat (1 = latency terendah, lebih besar = overhead lebih kecil)
+
+
+def get_io_workers():
+    """Jumlah thread I/O, bisa diatur lewat env FILE_EXPLORER_IO_WORKERS"""
+    try:
+        workers = int(os.environ.get("FILE_EXPLORER_IO_WORKERS", DEFAULT_IO_WORKERS))
+    except ValueError:
+        workers = DEFAULT_IO_WORKERS
+    return max(1, workers)
+
+
+def _entry_row(entry):
+    """(name, is_dir, size, mtime) seperti scan_listing, None jika entry tidak bisa dibaca"""
+    try:
+        entry_is_dir = entry.is_dir()
+    except OSError:
+        return None
+    if entry_is_dir:
+        return (entry.name, True, -1, math.nan)
+    try:
+        stat = entry.stat()
+        return (entry.name, False, stat.st_size, stat.st_mtime)
+    except OSError:
+        return (entry.name, False, -1, math.nan)
+
+
+def _entry_rows(entries):
+    return [row for row in map(_entry_row, entries) if row is not None]
+
+
+def _needs_stat(entry):
+    """
+    True jika entry.stat() akan ke disk. Windows: stat sudah ikut hasil
+    FindNextFile. POSIX: is_dir() dari d_type, hanya file yang perlu stat.
+    """
+    if os.name == 'nt':
+        return False
+    try:
+        return not entry.is_dir()
+    except OSError:
+        return False
+
+
+def _safe_stat(path, follow_symlinks=True):
+    try:
+        return os.stat(path, follow_symlinks=follow_symlinks)
+    except OSError:
+        return None
+
+
+class AsyncFS:
+    """
+    Layer I/O async: coroutine stat / exists / listdir / scan dijalankan di
+    ThreadPoolExecutor sendiri (max_workers = request in-flight).
+
+    Coroutine bisa di-await dari event loop mana pun. UI loop (sinkron) memakai
+    submit() -> concurrent.futures.Future yang di-poll dengan done(), atau
+    run() untuk menunggu hasil; keduanya memakai event loop di thread background
+    yang dibuat saat pertama dipakai.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or get_io_workers()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="async-io")
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # --- Coroutine API -----------------------------------------------------
+
+    async def call(self, func, *args, **kwargs):
+        """Jalankan func(*args) di thread pool I/O"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def stat(self, path, follow_symlinks=True):
+        return await self.call(os.stat, path, follow_symlinks=follow_symlinks)
+
+    async def exists(self, path):
+        return await self.call(os.path.lexists, path)
+
+    async def listdir(self, path):
+        return await self.call(os.listdir, path)
+
+    async def stat_many(self, paths, follow_symlinks=True):
+        """Stat semua paths sekaligus (paralel), return list stat / None (gagal) dengan urutan yang sama"""
+        return await asyncio.gather(*(self.call(_safe_stat, path, follow_symlinks) for path in paths))
+
+    async def exists_many(self, paths):
+        return await asyncio.gather(*(self.exists(path) for path in paths))
+
+    async def scan(self, path):
+        """
+        Isi folder sebagai list of (name, is_dir, size, mtime), urutan tidak dijamin.
+        Thread scandir mengirim entry per batch; entry yang perlu stat langsung
+        dikirim ke pool sementara scandir masih membaca sisa folder.
+        Error membuka folder (PermissionError, FileNotFoundError) di-raise.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def produce():
+            batch = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        batch.append(entry)
+                        if len(batch) >= SCAN_BATCH:
+                            loop.call_soon_threadsafe(queue.put_nowait, batch)
+                            batch = []
+                loop.call_soon_threadsafe(queue.put_nowait, batch)
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except OSError as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        producer = loop.run_in_executor(self._executor, produce)
+        rows = []
+        jobs = []
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, OSError):
+                await asyncio.gather(*jobs, return_exceptions=True)
+                raise batch
+            pending = []
+            for entry in batch:
+                if _needs_stat(entry):
+                    pending.append(entry)
+                else:
+                    row = _entry_row(entry)
+                    if row is not None:
+                        rows.append(row)
+            for start in range(0, len(pending), STAT_BATCH):
+                jobs.append(loop.run_in_executor(self._executor, _entry_rows, pending[start:start + STAT_BATCH]))
+
+        await producer
+        for job_rows in await asyncio.gather(*jobs):
+            rows.extend(job_rows)
+        return rows
+
+    # --- Jembatan untuk UI loop (sinkron) -------------------------------------
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="async-io-loop", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro):
+        """Jadwalkan coroutine di event loop background, return concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro, timeout=None):
+        """Jalankan coroutine dan tunggu hasilnya (dari thread selain event loop ini)"""
+        return self.submit(coro).result(timeout)
+
+    def close(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+            self._executor.shutdown(wait=False)
+
+
+_async_fs = None
+_async_fs_lock = threading.Lock()
+
+
+def get_async_fs():
+    """AsyncFS bersama untuk seluruh aplikasi (thread pool & event loop dibuat sekali)"""
+    global _async_fs
+    with _async_fs_lock:
+        if _async_fs is None:
+            _async_fs = AsyncFS()
+        return _async_fs
+
+
+async def scan_listing_async(path):
+    """Versi async scan_listing: listing yang sama, scan lewat AsyncFS.scan"""
+    from .listing import build_listing, scan_error_row
+
+    try:
+        rows = await get_async_fs().scan(path)
+    except OSError as e:
+        return scan_error_row(e)
+    return build_listing(path, rows)
+
+
+def stat_paths(paths, follow_symlinks=True):
+    """
+    Stat banyak path (list stat / None). Di network file system semua stat
+    jalan paralel lewat AsyncFS, di disk lokal serial (lebih murah tanpa thread).
+    """
+    from .mounts import is_remote_path
+
+    paths = list(paths)
+    if len(paths) > 1 and is_remote_path(os.path.dirname(paths[0]) or "."):
+        return get_async_fs().run(get_async_fs().stat_many(paths, follow_symlinks))
+    return [_safe_stat(path, follow_symlinks) for path in paths]
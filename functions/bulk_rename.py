@@ -0,0 +1,337 @@
+"""
+Bulk rename: pattern regex / template dengan counter & case transform, preview live,
+deteksi konflik (graph pass) dan eksekusi two-phase atomic lewat journal
+"""
+import os
+import re
+from .ui import clear_screen, draw_header, get_terminal_size
+from .journal import get_journal
+
+
+DEFAULT_TEMPLATE = "{name}{ext}"
+CASES = (None, 'lower', 'upper', 'title')
+INVALID_CHARS = set('<>:"/\\|?*')  # Karakter yang tidak boleh ada di nama file Windows
+RESERVED_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f"{prefix}{i}" for prefix in ('COM', 'LPT') for i in range(1, 10)}
+TOKEN_RE = re.compile(r"\{(\w+)(?::(\d+))?\}")
+TEMP_PREFIX = ".~rename-"
+
+
+class Renamer:
+    """
+    Fungsi rename nama -> nama baru.
+
+    Tanpa pattern: template menggantikan seluruh nama. Dengan pattern (regex):
+    setiap match diganti template, bagian nama lain tetap (seperti re.sub).
+    Field template: {name} (nama tanpa extension), {ext} (extension dengan titik),
+    {n} counter (start + index * step, {n:3} = 001), {0} / {1} / {group}
+    hasil match regex. case: lower / upper berlaku untuk seluruh nama,
+    title hanya untuk nama tanpa extension.
+    """
+
+    def __init__(self, pattern="", template=DEFAULT_TEMPLATE, case=None, start=1, step=1):
+        try:
+            self.regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}")
+        if case not in CASES:
+            raise ValueError(f"Unknown case: {case}")
+
+        groups = set(self.regex.groupindex) | {str(i) for i in range(self.regex.groups + 1)} if self.regex else set()
+        for field, _ in TOKEN_RE.findall(template):
+            if field not in ('name', 'ext', 'n') and field not in groups:
+                raise ValueError(f"Unknown field: {{{field}}}")
+
+        self.template = template
+        self.case = case
+        self.start = start
+        self.step = step
+
+    def _expand(self, stem, ext, counter, match):
+        def field(token):
+            key, width = token.group(1), token.group(2)
+            if key == 'n':
+                return str(counter).zfill(int(width or 0))
+            if key == 'name':
+                value = stem
+            elif key == 'ext':
+                value = ext
+            else:
+                value = match.group(int(key) if key.isdigit() else key) or ""
+            return value.zfill(int(width)) if width else value
+        return TOKEN_RE.sub(field, self.template)
+
+    def __call__(self, name, index=0):
+        stem, ext = os.path.splitext(name)
+        counter = self.start + index * self.step
+        if self.regex is None:
+            new_name = self._expand(stem, ext, counter, None)
+        else:
+            new_name = self.regex.sub(lambda match: self._expand(stem, ext, counter, match), name)
+
+        if self.case == 'lower':
+            new_name = new_name.lower()
+        elif self.case == 'upper':
+            new_name = new_name.upper()
+        elif self.case == 'title':
+            new_stem, new_ext = os.path.splitext(new_name)
+            new_name = new_stem.title() + new_ext
+        return new_name
+
+
+def invalid_name_reason(name):
+    """Alasan nama tidak valid (Windows rules), None jika valid"""
+    if not name or name in ('.', '..'):
+        return "Empty name"
+    if any(char in INVALID_CHARS or ord(char) < 32 for char in name):
+        return "Invalid character"
+    if name[-1] in ' .':
+        return "Name ends with space or dot"
+    if name.split('.')[0].upper() in RESERVED_NAMES:
+        return "Reserved name"
+    return None
+
+
+class RenamePlan:
+    """
+    Hasil plan_rename (belum ada yang di-rename).
+    renames: (src, dst) yang aman dijalankan, conflicts: (src, new_name, reason),
+    unchanged: jumlah item yang namanya tetap, cycles: rantai a -> b -> a
+    (aman karena eksekusi two-phase).
+    """
+
+    def __init__(self):
+        self.renames = []
+        self.conflicts = []
+        self.unchanged = 0
+        self.cycles = 0
+
+    def is_empty(self):
+        return not self.renames
+
+    def summary(self):
+        parts = [f"{len(self.renames)} to rename"]
+        if self.conflicts:
+            parts.append(f"{len(self.conflicts)} conflicts (skipped)")
+        if self.unchanged:
+            parts.append(f"{self.unchanged} unchanged")
+        if self.cycles:
+            parts.append(f"{self.cycles} swap cycles")
+        return ", ".join(parts)
+
+
+def _folder_names(parent, names):
+    """Nama item di folder (normcase), di-scan sekali per folder dan di-cache di `names`"""
+    entries = names.get(parent)
+    if entries is None:
+        try:
+            entries = {os.path.normcase(name) for name in os.listdir(parent)}
+        except OSError:
+            entries = set()
+        names[parent] = entries
+    return entries
+
+
+def plan_rename(paths, renamer, names=None):
+    """
+    Hitung nama baru untuk semua paths (urutan = urutan counter) dan cek konflik
+    dalam satu pass tanpa stat per item:
+    - nama tidak valid, dua item ke nama yang sama
+    - nama tujuan sudah ada di disk dan bukan item yang ikut di-rename
+    - rantai ke item yang tidak jadi di-rename (propagasi lewat graph src -> dst)
+    Nama folder di-scan sekali per folder; `names` (dict) bisa dipakai ulang antar preview.
+    """
+    names = {} if names is None else names
+    key = os.path.normcase  # Windows: perbandingan nama case-insensitive
+    plan = RenamePlan()
+    targets = {}  # key(src) -> (src, dst)
+
+    for index, src in enumerate(paths):
+        parent, name = os.path.split(src)
+        try:
+            new_name = renamer(name, index)
+        except (IndexError, re.error) as e:
+            plan.conflicts.append((src, name, str(e)))
+            continue
+        if new_name == name:
+            plan.unchanged += 1
+            continue
+        reason = invalid_name_reason(new_name)
+        if reason:
+            plan.conflicts.append((src, new_name, reason))
+            continue
+        targets[key(src)] = (src, os.path.join(parent, new_name))
+
+    # Dua item dengan tujuan yang sama: semuanya konflik
+    by_target = {}
+    for src_key, (src, dst) in targets.items():
+        by_target.setdefault(key(dst), []).append(src_key)
+    stuck = []
+    for dst_key, src_keys in by_target.items():
+        if len(src_keys) > 1:
+            stuck.extend(src_keys)
+            for src_key in src_keys:
+                src, dst = targets[src_key]
+                plan.conflicts.append((src, os.path.basename(dst), "Duplicate target"))
+    for src_key in stuck:
+        del targets[src_key]
+
+    # Tujuan sudah ada dan item itu tidak ikut pindah (rename case saja tetap boleh)
+    for src_key, (src, dst) in list(targets.items()):
+        dst_key = key(dst)
+        if dst_key == src_key or dst_key in targets:
+            continue
+        parent, new_name = os.path.split(dst)
+        if key(new_name) in _folder_names(parent, names):
+            plan.conflicts.append((src, new_name, "Name already exists"))
+            del targets[src_key]
+            stuck.append(src_key)
+
+    # Propagasi: item yang tujuannya item lain yang tidak jadi pindah ikut batal
+    waiting = {key(dst): src_key for src_key, (src, dst) in targets.items()}
+    while stuck:
+        src_key = waiting.pop(stuck.pop(), None)
+        if src_key is not None and src_key in targets:
+            src, dst = targets.pop(src_key)
+            plan.conflicts.append((src, os.path.basename(dst), "Target is not renamed"))
+            stuck.append(src_key)
+
+    # Hitung cycle (a -> b -> a) untuk info; eksekusi two-phase aman untuk cycle
+    state = {}
+    for start in targets:
+        node = start
+        while node in targets and node not in state:
+            state[node] = start
+            node = key(targets[node][1])
+        if node in state and state[node] == start and node in targets:
+            plan.cycles += 1
+
+    plan.renames = list(targets.values())
+    return plan
+
+
+def execute_rename(plan):
+    """
+    Jalankan plan sebagai satu transaksi journal two-phase: semua src -> nama temp,
+    lalu temp -> tujuan. Mode atomic: gagal di tengah = semua dikembalikan.
+    Satu Ctrl+Z meng-undo seluruh batch. Return (success, message).
+    """
+    if not plan.renames:
+        return False, "Nothing to rename"
+
+    token = os.urandom(4).hex()
+    temps = [os.path.join(os.path.dirname(src), f"{TEMP_PREFIX}{token}-{idx}")
+             for idx, (src, _) in enumerate(plan.renames)]
+    ops = ([['move', src, temp] for (src, _), temp in zip(plan.renames, temps)] +
+           [['move', temp, dst] for (_, dst), temp in zip(plan.renames, temps)])
+
+    failed = get_journal().run('rename', ops, atomic=True)
+    if failed:
+        error = next(message for message in failed.values() if message not in ("Rolled back", "Not run"))
+        return False, f"Rename failed, nothing renamed: {error}"
+
+    message = f"Renamed {len(plan.renames)} items"
+    if plan.conflicts:
+        message += f", skipped {len(plan.conflicts)} conflicts"
+    return True, message
+
+
+def _render_bulk_rename(current_path, count, fields, active, case, plan, error):
+    clear_screen()
+    cols, lines = get_terminal_size()
+    draw_header(current_path)
+
+    print(f"\n ✏️  Bulk rename: {count} items")
+    print(" " + "─" * (cols - 2))
+    labels = (("find", "Find (regex)"), ("template", "Replace with"), ("start", "Counter start"))
+    for idx, (name, label) in enumerate(labels):
+        marker = ">" if idx == active else " "
+        cursor = "_" if idx == active else ""
+        print(f" {marker} {label:<14}: {fields[name]}{cursor}")
+    marker = ">" if active == len(labels) else " "
+    print(f" {marker} {'Case':<14}: {case or 'unchanged'}")
+    print("   Fields: {name} {ext} {n} {n:3} {1} (regex group)")
+    print(" " + "─" * (cols - 2))
+
+    if error:
+        print(f"   ⚠️  {error}")
+    elif plan is not None:
+        print(f"   {plan.summary()}")
+        rows = ([f"   ! {os.path.basename(src)} → {new_name}  ({reason})" for src, new_name, reason in plan.conflicts] +
+                [f"     {os.path.basename(src)} → {os.path.basename(dst)}" for src, dst in plan.renames])
+        limit = max(3, lines - 18)
+        for row in rows[:limit]:
+            print(row[:cols - 1])
+        if len(rows) > limit:
+            print(f"   ... and {len(rows) - limit} more")
+
+    print("\n " + "─" * (cols - 2))
+    print(" [Tab: Next field | Space (Case): Change | Enter: Rename | ESC: Cancel]")
+
+
+def show_bulk_rename(current_path, paths):
+    """
+    Dialog bulk rename dengan preview live. Plan dihitung ulang setelah
+    ketikan berhenti (key yang masih antri di-drain dulu), listing folder
+    di-cache antar preview. Return (success, message).
+    """
+    import msvcrt
+    fields = {'find': "", 'template': DEFAULT_TEMPLATE, 'start': "1"}
+    order = ('find', 'template', 'start', 'case')
+    active = 1
+    case = None
+    names = {}
+    plan = None
+    error = ""
+    dirty = True
+
+    def build():
+        try:
+            renamer = Renamer(fields['find'], fields['template'], case, int(fields['start'] or 1))
+            return plan_rename(paths, renamer, names), ""
+        except ValueError as e:
+            return None, str(e)
+
+    while True:
+        if dirty and not msvcrt.kbhit():
+            plan, error = build()
+            dirty = False
+        if not msvcrt.kbhit():
+            _render_bulk_rename(current_path, len(paths), fields, active, case, plan, error)
+
+        key = msvcrt.getch()
+        if key in (b'\xe0', b'\x00'):
+            msvcrt.getch()
+            continue
+        elif key == b'\x1b':
+            return False, "Rename cancelled"
+        elif key == b'\r':
+            if dirty:  # Enter diketik bersama key lain: plan di layar belum dihitung ulang
+                plan, error = build()
+                dirty = False
+            if plan is None:
+                continue
+            clear_screen()
+            draw_header(current_path)
+            print(f"\n ✏️  Renaming {len(plan.renames)} items...")
+            return execute_rename(plan)
+        elif key == b'\t':
+            active = (active + 1) % len(order)
+            continue
+
+        field = order[active]
+        if field == 'case':
+            if key == b' ':
+                case = CASES[(CASES.index(case) + 1) % len(CASES)]
+                dirty = True
+            continue
+        if key == b'\x08':
+            fields[field] = fields[field][:-1]
+        else:
+            try:
+                char = key.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+            if not char.isprintable() or (field == 'start' and not char.isdigit()):
+                continue
+            fields[field] += char
+        dirty = True
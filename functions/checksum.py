@@ -0,0 +1,307 @@
+"""
+Checksum tool: hash selection / subtree di process pool, tulis manifest
+(format sha256sum / b2sum) dan verifikasi tree terhadap manifest
+"""
+import os
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from .ui import clear_screen, draw_header
+from .file_system import format_size
+from .hashing import HashCache, available_algorithms, hash_full, _hash_full_worker
+from .tree_walk import walk_tree
+
+
+MANIFEST_NAME = "CHECKSUMS"
+MANIFEST_EXTENSIONS = {'sha256': ".sha256", 'blake2b': ".b2", 'xxh3_64': ".xxh3"}
+INLINE_HASH_FILES = 4  # Hash sebanyak ini (atau kurang) tidak perlu process pool
+
+
+def manifest_algorithm(path):
+    """Algoritma dari extension manifest (CHECKSUMS.sha256 -> sha256), None jika bukan manifest"""
+    ext = os.path.splitext(path)[1].lower()
+    for algorithm, manifest_ext in MANIFEST_EXTENSIONS.items():
+        if ext == manifest_ext:
+            return algorithm
+    return None
+
+
+def manifest_path(folder, algorithm):
+    if algorithm not in MANIFEST_EXTENSIONS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    return os.path.join(folder, MANIFEST_NAME + MANIFEST_EXTENSIONS[algorithm])
+
+
+def collect_files(paths, root, exclude=()):
+    """
+    File di paths (file langsung, folder di-walk tanpa mengikuti symlink).
+    Return list of (rel_path, full_path, size, mtime) dengan rel_path relatif terhadap root.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            entries = ((entry.path, entry.stat) for entry in walk_tree(path, symlinks='skip', hardlinks=False)
+                       if entry.kind == 'file')
+        else:
+            try:
+                entries = [(path, os.stat(path))]
+            except OSError:
+                continue
+        for full_path, stat in entries:
+            if full_path in exclude:
+                continue
+            files.append((os.path.relpath(full_path, root), full_path, stat.st_size, stat.st_mtime))
+    return files
+
+
+def hash_files(files, algorithm, progress=None, cache=None, max_workers=None, should_cancel=None):
+    """
+    Hash files (hasil collect_files). Digest diambil dari HashCache jika
+    (path, size, mtime) belum berubah, sisanya di-hash di process pool
+    (setiap file dibaca per chunk). Return dict full_path -> digest (None = gagal dibaca),
+    atau None jika dibatalkan lewat should_cancel (digest yang sudah jadi tetap masuk cache).
+    """
+    kind = f"full:{algorithm}"
+    own_cache = cache is None
+    if own_cache:
+        cache = HashCache()
+
+    digests = {}
+    missing = []
+    try:
+        for _, full_path, size, mtime in files:
+            digest = cache.get(full_path, kind, size, mtime)
+            if digest is None:
+                missing.append((full_path, size, mtime))
+            else:
+                digests[full_path] = digest
+
+        def store(done, full_path, digest, size, mtime):
+            digests[full_path] = digest
+            if digest is not None:
+                cache.put(full_path, kind, size, mtime, digest)
+            if progress is not None and (done % 50 == 0 or done == len(missing)):
+                progress(done, len(missing))
+
+        if len(missing) <= INLINE_HASH_FILES:
+            for done, (full_path, size, mtime) in enumerate(missing, 1):
+                try:
+                    digest = hash_full(full_path, algorithm)
+                except OSError:
+                    digest = None
+                store(done, full_path, digest, size, mtime)
+                if should_cancel is not None and should_cancel():
+                    return None
+        else:
+            stats = {full_path: (size, mtime) for full_path, size, mtime in missing}
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                jobs = ((full_path, algorithm) for full_path, _, _ in missing)
+                for done, (full_path, digest) in enumerate(pool.map(_hash_full_worker, jobs, chunksize=4), 1):
+                    store(done, full_path, digest, *stats[full_path])
+                    if should_cancel is not None and should_cancel():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return None
+    finally:
+        cache.flush()
+        if own_cache:
+            cache.close()
+    return digests
+
+
+def write_manifest(path, entries):
+    """Tulis manifest "<digest>  <rel_path>" (separator /, urut nama) secara atomic"""
+    lines = sorted(f"{digest}  {rel.replace(os.sep, '/')}\n" for rel, digest in entries)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(lines)
+    os.replace(temp_path, path)
+
+
+def read_manifest(path):
+    """Baca manifest, return dict rel_path (separator OS) -> digest"""
+    entries = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            digest, _, rel = line.partition(" ")
+            rel = rel[1:] if rel.startswith(("*", " ")) else rel  # "*" = binary mode sha256sum
+            if digest and rel:
+                entries[rel.replace('/', os.sep)] = digest.lower()
+    return entries
+
+
+def create_manifest(paths, folder, algorithm="sha256", progress=None, cache=None, should_cancel=None):
+    """
+    Hash paths (file / folder) lalu tulis manifest di folder.
+    Return (success, message, manifest_path); dibatalkan = manifest tidak ditulis.
+    """
+    output = manifest_path(folder, algorithm)
+    files = collect_files(paths, folder, exclude={output})
+    if not files:
+        return False, "No files to checksum", None
+    digests = hash_files(files, algorithm, progress, cache, should_cancel=should_cancel)
+    if digests is None:
+        return False, "Checksum cancelled, no manifest written", None
+
+    entries = [(rel, digests[full_path]) for rel, full_path, _, _ in files if digests.get(full_path)]
+    write_manifest(output, entries)
+    failed = len(files) - len(entries)
+    total = sum(size for _, _, size, _ in files)
+    message = f"{len(entries)} files ({format_size(total)}) hashed to {os.path.basename(output)}"
+    if failed:
+        message += f", {failed} unreadable"
+    return True, message, output
+
+
+class VerifyResult:
+    """Hasil verify_manifest: ok (jumlah), mismatched / missing / extra / unreadable (list rel_path)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.ok = 0
+        self.mismatched = []
+        self.missing = []
+        self.extra = []
+        self.unreadable = []
+        self.cancelled = False
+
+    @property
+    def passed(self):
+        return not (self.cancelled or self.mismatched or self.missing or self.unreadable)
+
+    def summary(self):
+        if self.cancelled:
+            return "cancelled"
+        parts = [f"{self.ok} OK"]
+        for label, rows in (("mismatched", self.mismatched), ("missing", self.missing),
+                            ("unreadable", self.unreadable), ("extra", self.extra)):
+            if rows:
+                parts.append(f"{len(rows)} {label}")
+        return ", ".join(parts)
+
+
+def verify_manifest(manifest, root=None, algorithm=None, progress=None, cache=None, should_cancel=None):
+    """
+    Verifikasi file terhadap manifest. root default folder manifest.
+    File baru di folder yang tercantum di manifest dilaporkan sebagai extra.
+    Hanya file yang (path, size, mtime)-nya berubah sejak hash terakhir yang dibaca ulang.
+    Dibatalkan lewat should_cancel: result.cancelled = True (tanpa hasil per file).
+    """
+    root = root or os.path.dirname(os.path.abspath(manifest))
+    algorithm = algorithm or manifest_algorithm(manifest) or "sha256"
+    expected = read_manifest(manifest)
+    result = VerifyResult(root)
+
+    files = []
+    for rel in expected:
+        full_path = os.path.join(root, rel)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            result.missing.append(rel)
+            continue
+        files.append((rel, full_path, stat.st_size, stat.st_mtime))
+    digests = hash_files(files, algorithm, progress, cache, should_cancel=should_cancel)
+    if digests is None:
+        result.cancelled = True
+        return result
+
+    for rel, full_path, _, _ in files:
+        digest = digests.get(full_path)
+        if digest is None:
+            result.unreadable.append(rel)
+        elif digest != expected[rel]:
+            result.mismatched.append(rel)
+        else:
+            result.ok += 1
+
+    # Extra: file baru di bawah folder top-level yang tercantum di manifest
+    top_dirs = {rel.split(os.sep, 1)[0] for rel in expected if os.sep in rel}
+    listed = set(expected)
+    for top in sorted(top_dirs):
+        folder = os.path.join(root, top)
+        if not os.path.isdir(folder):
+            continue
+        for entry in walk_tree(folder, symlinks='skip', hardlinks=False):
+            if entry.kind == 'file':
+                rel = os.path.relpath(entry.path, root)
+                if rel not in listed:
+                    result.extra.append(rel)
+    return result
+
+
+def verify_items(result):
+    """Ubah VerifyResult menjadi items untuk list view (hanya yang bermasalah)"""
+    items = []
+    for label, rows in (("MISMATCH", result.mismatched), ("MISSING", result.missing),
+                        ("UNREADABLE", result.unreadable), ("EXTRA", result.extra)):
+        for rel in rows:
+            path = os.path.join(result.root, rel)
+            try:
+                stat = os.stat(path)
+                size = format_size(stat.st_size)
+                modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
+            except OSError:
+                size, modified = "-", "N/A"
+            items.append((f"[{label}] {rel}", False, size, modified, path))
+    return items
+
+
+def run_checksum_tool(current_path, paths, cursor_path=None):
+    """
+    Tombol checksum di TUI. Jika cursor di file manifest: verifikasi.
+    Selain itu pilih algoritma lalu buat manifest untuk paths (selection)
+    atau seluruh folder aktif. Return (manifest_written, items untuk list view atau None, message).
+    """
+    import msvcrt
+    def progress(done, total):
+        print(f"\r Hashing... {done}/{total} files (ESC: Stop)".ljust(70), end="", flush=True)
+
+    # ESC hanya terbaca sekali (getch), jadi hasilnya di-latch
+    cancelled = []
+
+    def should_cancel():
+        if not cancelled and msvcrt.kbhit() and msvcrt.getch() == b'\x1b':
+            cancelled.append(True)
+        return bool(cancelled)
+
+    clear_screen()
+    draw_header(current_path)
+
+    if cursor_path and os.path.isfile(cursor_path) and manifest_algorithm(cursor_path):
+        print(f"\n 🔐 Verifying {os.path.basename(cursor_path)}...")
+        try:
+            result = verify_manifest(cursor_path, progress=progress, should_cancel=should_cancel)
+        except (OSError, ValueError) as e:
+            return False, None, f"Verify failed: {e}"
+        if result.cancelled:
+            return False, None, "Verify cancelled"
+        if result.passed and not result.extra:
+            return False, None, f"Verify passed: {result.summary()}"
+        return False, verify_items(result), f"Verify: {result.summary()}"
+
+    algorithms = available_algorithms()
+    target = f"{len(paths)} selected items" if paths else "current folder (subtree)"
+    print(f"\n 🔐 Checksum manifest for {target}")
+    print(" " + "─" * 40)
+    for idx, algorithm in enumerate(algorithms, 1):
+        print(f"   [{idx}] {algorithm}")
+    print("\n Tip: put the cursor on a CHECKSUMS.* file to verify it")
+    print(" [ESC] Cancel")
+
+    while True:
+        key = msvcrt.getch()
+        if key == b'\x1b':
+            return False, None, "Checksum cancelled"
+        if key.isdigit() and 1 <= int(key) <= len(algorithms):
+            algorithm = algorithms[int(key) - 1]
+            break
+
+    print(f"\n Hashing with {algorithm}...")
+    try:
+        success, message, _ = create_manifest(paths or [current_path], current_path, algorithm, progress,
+                                              should_cancel=should_cancel)
+    except (OSError, ValueError) as e:
+        return False, None, f"Checksum failed: {e}"
+    return success, None, message
@@ -0,0 +1,342 @@
+"""
+CLI non-interaktif untuk script / bulk job: ls, find, cp, zip, rename, tail,
+checksum, verify, mounts, startup. Opsi global --io-limit membatasi I/O
+(sama dengan env FILE_EXPLORER_IO_LIMIT).
+Memakai fast path yang sama dengan TUI (scan_listing, sort_items, journal, sync).
+"""
+import os
+import sys
+import json
+import fnmatch
+import argparse
+from .listing import scan_listing
+from .sorting import sort_items
+from .search_filter import filter_by_extension
+
+GLOB_CHARS = "*?["
+FIND_BATCH = 1000  # Jumlah path per write ke stdout
+
+
+def _error(message):
+    print(message, file=sys.stderr)
+    return 1
+
+
+def cmd_ls(args):
+    """List isi folder (tanpa ".."), sort & filter seperti di TUI"""
+    items = scan_listing(args.path)
+    if items and not items[0][4]:
+        # scan_listing mengembalikan satu baris error (Permission Denied / Error: ...)
+        return _error(f"{args.path}: {items[0][0]}")
+
+    items = sort_items(items, args.sort, args.reverse)
+    if args.ext:
+        items = filter_by_extension(items, args.ext)
+    rows = [item for item in items if item[0] != ".."]
+
+    if args.json:
+        json.dump([{'name': name, 'is_dir': is_dir, 'size': size, 'modified': modified, 'path': full_path}
+                   for name, is_dir, size, modified, full_path in rows], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write("".join(
+            f"{'d' if is_dir else '-'}  {size or '-':>10}  {modified or '-':<16}  {name}{os.sep if is_dir else ''}\n"
+            for name, is_dir, size, modified, full_path in rows))
+    return 0
+
+
+def iter_find(root, pattern, kind=None, extension=""):
+    """
+    Walk subtree dengan os.scandir (stack, tanpa rekursi) dan yield path yang cocok.
+    pattern dengan * ? [ = glob, selain itu substring; keduanya case-insensitive.
+    kind: 'f' hanya file, 'd' hanya folder. Symlink ke folder tidak diikuti.
+    """
+    pattern = pattern.lower()
+    is_glob = any(ch in pattern for ch in GLOB_CHARS)
+    suffix = f".{extension.lower().lstrip('.')}" if extension else ""
+
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        stack.append(entry.path)
+
+                    if kind == 'f' and is_dir or kind == 'd' and not is_dir:
+                        continue
+                    name = entry.name.lower()
+                    if suffix and not name.endswith(suffix):
+                        continue
+                    if not pattern or (fnmatch.fnmatchcase(name, pattern) if is_glob else pattern in name):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def cmd_find(args):
+    """Cari file/folder di subtree, satu path per baris (streaming)"""
+    if not os.path.isdir(args.root):
+        return _error(f"Not a directory: {args.root}")
+
+    found = 0
+    batch = []
+    for path in iter_find(args.root, args.pattern, args.type, args.ext or ""):
+        batch.append(path)
+        found += 1
+        if len(batch) >= FIND_BATCH:
+            sys.stdout.write("\n".join(batch) + "\n")
+            batch = []
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
+    return 0 if found else 1
+
+
+def cmd_cp(args):
+    """Copy (journaled, bisa di-undo dari TUI) atau sync incremental ke DEST"""
+    # Module operasi di-import per subcommand supaya `ls` / `find` tetap cepat start
+    from .file_operations import copy_multiple_items
+    from .sync import plan_sync, execute_sync
+
+    missing = [source for source in args.sources if not os.path.exists(source)]
+    if missing:
+        return _error(f"Not found: {', '.join(missing)}")
+    sources = [os.path.abspath(source) for source in args.sources]
+    if args.symlinks:
+        os.environ["FILE_EXPLORER_SYMLINKS"] = args.symlinks  # Dibaca tree_walk.get_symlink_policy
+
+    if args.sync or args.dry_run:
+        plan = plan_sync(sources, args.dest, compare=args.compare, delete_extras=args.delete)
+        for error in plan.errors:
+            print(f"error: {error}", file=sys.stderr)
+        if args.dry_run:
+            for src, dst, size, reason in plan.copies:
+                print(f"copy   {dst}  ({reason})")
+            for path in plan.deletes:
+                print(f"delete {path}")
+            print(plan.summary())
+            return 0
+        os.makedirs(args.dest, exist_ok=True)
+        success, msg = execute_sync(plan)
+    else:
+        os.makedirs(args.dest, exist_ok=True)
+        success, msg = copy_multiple_items(sources, args.dest)
+
+    print(msg)
+    return 0 if success else 1
+
+
+def cmd_zip(args):
+    """Compress SRC... ke OUTPUT (.zip)"""
+    from .compression import compress_to_zip
+
+    missing = [source for source in args.sources if not os.path.exists(source)]
+    if missing:
+        return _error(f"Not found: {', '.join(missing)}")
+    success, msg = compress_to_zip(args.sources, args.output)
+    print(msg)
+    return 0 if success else 1
+
+
+def cmd_rename(args):
+    """Bulk rename SRC... dengan pattern / template (satu plan, satu transaksi journal)"""
+    from .bulk_rename import Renamer, plan_rename, execute_rename
+
+    missing = [source for source in args.sources if not os.path.lexists(source)]
+    if missing:
+        return _error(f"Not found: {', '.join(missing)}")
+    try:
+        renamer = Renamer(args.find or "", args.template, args.case, args.start, args.step)
+    except ValueError as e:
+        return _error(str(e))
+    plan = plan_rename([os.path.abspath(path) for path in args.sources], renamer)
+
+    for src, new_name, reason in plan.conflicts:
+        print(f"skip   {src} -> {new_name} ({reason})", file=sys.stderr)
+    if args.dry_run:
+        sys.stdout.write("".join(f"rename {src} -> {os.path.basename(dst)}\n" for src, dst in plan.renames))
+        print(plan.summary())
+        return 0
+    if plan.is_empty():
+        print(plan.summary())
+        return 1 if plan.conflicts else 0
+    success, msg = execute_rename(plan)
+    print(msg)
+    return 0 if success and not plan.conflicts else 1
+
+
+def cmd_tail(args):
+    """Tampilkan N baris terakhir file, dengan -f ikuti append (termasuk rotasi log)"""
+    from .tail import follow_to_stream
+
+    if not os.path.isfile(args.path):
+        return _error(f"Not a file: {args.path}")
+    follow_to_stream(args.path, max(0, args.lines), args.follow)
+    return 0
+
+
+def cmd_checksum(args):
+    """Hash SRC... (folder = seluruh subtree) dan tulis manifest CHECKSUMS.<alg> di --root"""
+    from .checksum import create_manifest
+
+    missing = [source for source in args.sources if not os.path.exists(source)]
+    if missing:
+        return _error(f"Not found: {', '.join(missing)}")
+    try:
+        success, msg, output = create_manifest([os.path.abspath(path) for path in args.sources],
+                                               os.path.abspath(args.root), args.algorithm)
+    except (OSError, ValueError) as e:
+        return _error(str(e))
+    print(f"{msg} ({output})" if output else msg)
+    return 0 if success else 1
+
+
+def cmd_verify(args):
+    """Verifikasi tree terhadap manifest, tulis file yang bermasalah (exit 1 jika ada)"""
+    from .checksum import verify_manifest
+
+    if not os.path.isfile(args.manifest):
+        return _error(f"Not a file: {args.manifest}")
+    try:
+        result = verify_manifest(args.manifest, args.root, args.algorithm)
+    except (OSError, ValueError) as e:
+        return _error(str(e))
+
+    for label, rows in (("MISMATCH", result.mismatched), ("MISSING", result.missing),
+                        ("UNREADABLE", result.unreadable), ("EXTRA", result.extra)):
+        sys.stdout.write("".join(f"{label:<10} {rel}\n" for rel in rows))
+    print(result.summary())
+    return 0 if result.passed else 1
+
+
+def cmd_mounts(args):
+    """Profil performa per mount yang sudah teramati (latency, throughput, worker AIMD)"""
+    from .file_system import format_size
+    from .io_profile import get_profile_store
+
+    profiles = get_profile_store().profiles()
+    if args.json:
+        json.dump(profiles, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    if not profiles:
+        print("No mount profiles yet (recorded during copy, sync and folder size scans)")
+        return 0
+    for mount, profile in sorted(profiles.items()):
+        latency = f"{profile['latency'] * 1000:.1f} ms" if profile.get('latency') is not None else "-"
+        throughput = f"{format_size(profile['throughput'])}/s" if profile.get('throughput') else "-"
+        workers = " ".join(f"{kind}={count}" for kind, count in sorted(profile.get('workers', {}).items())) or "-"
+        print(f"{mount:<30} {profile.get('fs', '?'):<10} latency {latency:<10} throughput {throughput:<12} workers {workers}")
+    return 0
+
+
+def cmd_startup(args):
+    """Profile cold start TUI: import time per module & waktu sampai frame pertama"""
+    from .startup import profile_startup, format_startup_report
+
+    runs = [profile_startup() for _ in range(max(1, args.runs))]
+    # Tampilkan run tercepat (paling sedikit noise dari cache disk / scheduler)
+    print(format_startup_report(min(runs, key=lambda run: run['first_render']), args.top))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="file-explorer", description="File explorer (non-interactive mode)")
+    parser.add_argument("--io-limit", metavar="RATE[,OPS]",
+                        help="Limit I/O cp / zip, mis. 20M atau 20M,500 (bytes/detik, operasi/detik)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ls = sub.add_parser("ls", help="List folder")
+    ls.add_argument("path", nargs="?", default=".")
+    ls.add_argument("--sort", choices=["name", "size", "date", "type"], default="name")
+    ls.add_argument("--reverse", action="store_true")
+    ls.add_argument("--ext", help="Filter by extension (mis. txt)")
+    ls.add_argument("--json", action="store_true", help="Output JSON")
+    ls.set_defaults(func=cmd_ls)
+
+    find = sub.add_parser("find", help="Cari file/folder di subtree")
+    find.add_argument("root")
+    find.add_argument("pattern", nargs="?", default="", help="Substring atau glob (*.log)")
+    find.add_argument("--type", choices=["f", "d"])
+    find.add_argument("--ext", help="Hanya file dengan extension ini")
+    find.set_defaults(func=cmd_find)
+
+    cp = sub.add_parser("cp", help="Copy / sync ke folder tujuan")
+    cp.add_argument("sources", nargs="+", metavar="SRC")
+    cp.add_argument("dest", metavar="DEST")
+    cp.add_argument("--sync", action="store_true", help="Hanya copy file yang baru / berubah")
+    cp.add_argument("--compare", choices=["mtime", "hash"], default="mtime")
+    cp.add_argument("--delete", action="store_true", help="Dengan --sync: pindahkan file extra di tujuan ke trash")
+    cp.add_argument("--dry-run", action="store_true", help="Tampilkan rencana sync tanpa menulis")
+    cp.add_argument("--symlinks", choices=["preserve", "follow", "skip"],
+                    help="Symlink di dalam folder: buat ulang link (default), copy isi target, atau lewati")
+    cp.set_defaults(func=cmd_cp)
+
+    zip_parser = sub.add_parser("zip", help="Compress ke ZIP")
+    zip_parser.add_argument("output")
+    zip_parser.add_argument("sources", nargs="+", metavar="SRC")
+    zip_parser.set_defaults(func=cmd_zip)
+
+    rename = sub.add_parser("rename", help="Bulk rename dengan regex / template")
+    rename.add_argument("template", help="Nama baru, field: {name} {ext} {n} {n:3} {1}")
+    rename.add_argument("sources", nargs="+", metavar="SRC")
+    rename.add_argument("--find", help="Regex; hanya bagian yang match diganti template")
+    rename.add_argument("--case", choices=["lower", "upper", "title"])
+    rename.add_argument("--start", type=int, default=1, help="Nilai awal counter {n}")
+    rename.add_argument("--step", type=int, default=1)
+    rename.add_argument("--dry-run", action="store_true", help="Tampilkan rencana tanpa rename")
+    rename.set_defaults(func=cmd_rename)
+
+    tail = sub.add_parser("tail", help="Baris terakhir file log (-f: ikuti append)")
+    tail.add_argument("path")
+    tail.add_argument("-n", "--lines", type=int, default=10)
+    tail.add_argument("-f", "--follow", action="store_true")
+    tail.set_defaults(func=cmd_tail)
+
+    checksum = sub.add_parser("checksum", help="Tulis manifest checksum (format sha256sum)")
+    checksum.add_argument("sources", nargs="+", metavar="SRC")
+    checksum.add_argument("-a", "--algorithm", default="sha256", help="sha256, blake2b atau xxh3_64 (butuh xxhash)")
+    checksum.add_argument("--root", default=".", help="Folder manifest; path di manifest relatif terhadap folder ini")
+    checksum.set_defaults(func=cmd_checksum)
+
+    verify = sub.add_parser("verify", help="Verifikasi file terhadap manifest checksum")
+    verify.add_argument("manifest")
+    verify.add_argument("--root", help="Folder dasar path di manifest (default folder manifest)")
+    verify.add_argument("-a", "--algorithm", help="Default dari extension manifest (.sha256 / .b2 / .xxh3)")
+    verify.set_defaults(func=cmd_verify)
+
+    mounts = sub.add_parser("mounts", help="Profil performa per mount (dipakai untuk tuning worker & chunk)")
+    mounts.add_argument("--json", action="store_true", help="Output JSON")
+    mounts.set_defaults(func=cmd_mounts)
+
+    startup = sub.add_parser("startup", help="Profile startup (import time & time to first render)")
+    startup.add_argument("--runs", type=int, default=3)
+    startup.add_argument("--top", type=int, default=15, help="Jumlah module terberat yang ditampilkan")
+    startup.set_defaults(func=cmd_startup)
+    return parser
+
+
+def run_cli(argv=None):
+    """Entry point CLI, return exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.io_limit:
+        from .throttle import get_throttle, parse_rate
+
+        try:
+            get_throttle().set_limits(*parse_rate(args.io_limit))
+        except ValueError as e:
+            parser.error(str(e))
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Output di-pipe ke head / less yang sudah ditutup
+        sys.stderr.close()
+        return 0
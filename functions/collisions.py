@@ -0,0 +1,136 @@
+"""
+Resolusi nama bentrok saat copy / move: name set + suffix tertinggi per nama,
+dan conflict policy (rename / skip / overwrite / newer) per batch
+"""
+import os
+import re
+
+
+CONFLICT_POLICIES = ('rename', 'skip', 'overwrite', 'newer')
+COPY_SUFFIX_RE = re.compile(r"^(.+)_copy(\d+)(\.[^.]*)?$")
+
+
+def copy_name(name, is_dir, counter):
+    """Nama ke-N untuk copy: folder -> name_copyN, file -> stem_copyN.ext"""
+    if is_dir:
+        return f"{name}_copy{counter}"
+    stem, ext = os.path.splitext(name)
+    return f"{stem}_copy{counter}{ext}"
+
+
+class NameResolver:
+    """
+    Nama yang sudah dipakai di satu folder tujuan, dari listing yang sudah ada
+    (cache session / watcher) atau satu os.listdir. Nama bebas dipilih O(1):
+    suffix _copyN tertinggi per nama dihitung sekali dari name set, jadi paste
+    ke-500 tidak perlu 500x stat. Nama pilihan tetap dicek sekali dengan
+    lexists (listing cache bisa tertinggal dari disk).
+    """
+
+    def __init__(self, dest_dir, existing=None):
+        self.dest_dir = dest_dir
+        if existing is None:
+            try:
+                existing = os.listdir(dest_dir)
+            except OSError:
+                existing = []
+        self._names = {os.path.normcase(name) for name in existing}
+        self._next = None   # normcase(nama asli) -> counter berikutnya, dihitung saat bentrok pertama
+        self._claimed = set()  # Nama yang dipakai batch ini
+
+    def _next_counters(self):
+        if self._next is None:
+            self._next = {}
+            for name in self._names:
+                match = COPY_SUFFIX_RE.match(name)
+                if match:
+                    base = match.group(1) + (match.group(3) or "")
+                    counter = int(match.group(2)) + 1
+                    if counter > self._next.get(base, 1):
+                        self._next[base] = counter
+        return self._next
+
+    def taken(self, name):
+        """True jika name sudah ada di folder tujuan (atau sudah dipakai batch ini)"""
+        key = os.path.normcase(name)
+        if key in self._names:
+            return True
+        if os.path.lexists(os.path.join(self.dest_dir, name)):
+            self._names.add(key)
+            return True
+        return False
+
+    def claimed(self, name):
+        """True jika name dipakai item lain di batch yang sama"""
+        return os.path.normcase(name) in self._claimed
+
+    def add(self, name):
+        key = os.path.normcase(name)
+        self._names.add(key)
+        self._claimed.add(key)
+
+    def claim(self, name, is_dir):
+        """Nama bebas untuk name (name sendiri jika belum dipakai), langsung dicatat sebagai terpakai"""
+        if not self.taken(name):
+            self.add(name)
+            return name
+        counters = self._next_counters()
+        base = os.path.normcase(name)
+        counter = counters.get(base, 1)
+        candidate = copy_name(name, is_dir, counter)
+        while self.taken(candidate):  # Hanya jika ada nama di luar pola _copyN (jarang)
+            counter += 1
+            candidate = copy_name(name, is_dir, counter)
+        counters[base] = counter + 1
+        self.add(candidate)
+        return candidate
+
+
+def _is_newer(source, dest):
+    try:
+        return os.stat(source).st_mtime > os.stat(dest).st_mtime
+    except OSError:
+        return False
+
+
+def plan_transfer(source_paths, dest_dir, kind, policy='rename', existing=None):
+    """
+    Rencana operasi journal untuk copy / move source_paths ke dest_dir.
+    kind: 'copy' atau 'move'. policy untuk nama yang sudah ada:
+    rename (_copyN), skip, overwrite (yang lama ke trash, bisa di-undo),
+    newer (overwrite hanya jika source lebih baru, selain itu skip).
+    existing: nama di dest_dir dari listing yang sudah ada (None = os.listdir sekali).
+    Return (ops, skipped_names).
+    """
+    if policy not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy: {policy}")
+
+    resolver = NameResolver(dest_dir, existing)
+    ops = []
+    skipped = []
+    for source_path in source_paths:
+        source_path = str(source_path)
+        name = os.path.basename(source_path)
+        dest = os.path.join(dest_dir, name)
+
+        if not resolver.taken(name):
+            resolver.add(name)
+            ops.append([kind, source_path, dest])
+            continue
+
+        same_item = os.path.normcase(os.path.abspath(dest)) == os.path.normcase(os.path.abspath(source_path))
+        if same_item and kind == 'move':
+            skipped.append(name)  # Sudah di folder tujuan
+            continue
+        # Copy ke folder yang sama atau dua item senama di batch ini selalu dapat nama baru
+        if policy == 'rename' or same_item or resolver.claimed(name):
+            is_dir = os.path.isdir(source_path) and not os.path.islink(source_path)
+            new_name = resolver.claim(name, is_dir)
+            ops.append([kind, source_path, os.path.join(dest_dir, new_name)])
+        elif policy == 'skip' or (policy == 'newer' and not _is_newer(source_path, dest)):
+            skipped.append(name)
+        else:
+            resolver.add(name)
+            ops.append(['trash', dest, None])
+            ops.append([kind, source_path, dest])
+    return ops, skipped
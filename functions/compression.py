@@ -6,6 +6,8 @@ import tarfile
 import subprocess
 from pathlib import Path
 import os
+from .tree_walk import walk_tree
+from .throttle import get_throttle
 
 
 def is_archive(filename):
@@ -16,6 +18,7 @@ def is_archive(filename):
 
 def compress_to_zip(source_paths, output_path):
     """Compress files/folders to ZIP"""
+    throttle = get_throttle()
     try:
         with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for source_path in source_paths:
@@ -23,13 +26,14 @@ def compress_to_zip(source_paths, output_path):
                 
                 if source.is_file():
                     # Add file
+                    throttle.io(source.stat().st_size)
                     zipf.write(source, source.name)
                 elif source.is_dir():
-                    # Add directory recursively
-                    for file_path in source.rglob('*'):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(source.parent)
-                            zipf.write(file_path, arcname)
+                    # Add directory recursively (symlink diikuti, loop dilewati)
+                    for entry in walk_tree(str(source), symlinks='follow', hardlinks=False):
+                        if entry.kind == 'file':
+                            throttle.io(entry.stat.st_size)
+                            zipf.write(entry.path, os.path.join(source.name, entry.rel))
         
         return True, f"Successfully compressed to {Path(output_path).name}"
     except Exception as e:
@@ -104,11 +108,42 @@ def compress_to_rar(source_paths, output_path):
         return False, f"RAR compression failed: {str(e)}"
 
 
+def list_archive(archive_path, limit=200):
+    """
+    Daftar isi archive tanpa extract: (entries, total), entry = (name, size, is_dir).
+    Hanya ZIP & TAR (termasuk .tar.gz/.bz2/.xz); format lain return None.
+    TAR dibaca sequential, jadi berhenti setelah `limit` entry (total = None).
+    """
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            infos = zipf.infolist()
+            entries = [(info.filename, info.file_size, info.is_dir()) for info in infos[:limit]]
+            return entries, len(infos)
+
+    try:
+        with tarfile.open(archive_path, 'r:*') as tarf:
+            entries = []
+            for member in tarf:
+                if len(entries) >= limit:
+                    return entries, None
+                entries.append((member.name, member.size, member.isdir()))
+            return entries, len(entries)
+    except tarfile.TarError:
+        return None
+
+
 def extract_zip(archive_path, dest_dir):
     """Extract ZIP archive"""
     try:
+        throttle = get_throttle()
         with zipfile.ZipFile(archive_path, 'r') as zipf:
-            zipf.extractall(dest_dir)
+            if throttle.enabled:
+                # Per entry supaya I/O throttle bisa menahan di antara file
+                for info in zipf.infolist():
+                    throttle.io(info.file_size)
+                    zipf.extract(info, dest_dir)
+            else:
+                zipf.extractall(dest_dir)
         
         return True, f"Successfully extracted {Path(archive_path).name}"
     except Exception as e:
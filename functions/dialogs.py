@@ -143,6 +143,22 @@ def get_filename_input(current_path, filter_ext):
     return full_filename, False
 
 
+def choose_conflict_policy(count, current_path, filter_ext):
+    """Pilih policy untuk item yang namanya sudah ada di tujuan, return policy atau None (batal)"""
+    clear_screen()
+    draw_header(current_path, filter_ext=filter_ext)
+    print(f"\n ⚠️  {count} item(s) already exist in this folder")
+    print("\n [R: Keep both (rename) | S: Skip | O: Overwrite | N: Overwrite if newer | ESC: Cancel]")
+
+    policies = {b'r': 'rename', b's': 'skip', b'o': 'overwrite', b'n': 'newer'}
+    while True:
+        key = msvcrt.getch()
+        if key == b'\x1b':
+            return None
+        if key.lower() in policies:
+            return policies[key.lower()]
+
+
 def confirm_dialog(message, current_path, filter_ext):
     """Confirmation dialog (Y/N)"""
     clear_screen()
@@ -0,0 +1,234 @@
+"""
+Directory size engine (recursive du, parallel + cached)
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .file_system import format_size
+from .io_profile import AIMDController, get_profile_store
+from .tree_walk import is_junction, link_key
+
+
+def scan_dir_entry(path):
+    """
+    Scan isi langsung satu folder (tidak rekursif).
+    Return (own_bytes, subdirs, links) dimana links = [(dev, inode, size)]
+    untuk file yang punya hard link lebih dari satu (lewat link_key, di Windows
+    file di-stat ulang karena DirEntry tidak mengisi st_nlink).
+    """
+    own_bytes = 0
+    subdirs = []
+    links = []
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                # Symlink / junction ke folder tidak diikuti (hindari loop & double count)
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_junction(entry):
+                        subdirs.append(entry.path)
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                key = link_key(entry.path, stat)
+            except OSError:
+                continue
+
+            if key is not None:
+                links.append((key[0], key[1], stat.st_size))
+            else:
+                own_bytes += stat.st_size
+
+    return own_bytes, subdirs, links
+
+
+class DirSizeEngine:
+    """
+    Hitung ukuran folder secara rekursif di background.
+
+    - Subtree di-walk paralel (os.scandir di thread pool, I/O melepas GIL)
+    - Hard link dihitung sekali per root berdasarkan (dev, inode); folder dengan
+      (dev, inode) yang sama (bind mount, junction loop) juga hanya dihitung sekali
+    - Hasil scan per folder di-cache dengan key mtime folder tersebut,
+      jadi scan ulang hanya membaca folder yang berubah
+    - Hasil sementara (partial) bisa di-poll selama scan masih berjalan
+    """
+
+    def __init__(self, max_workers=None):
+        # Tanpa max_workers: jumlah worker diatur AIMD per mount, mulai dari profil tersimpan
+        self.fixed_workers = max_workers is not None
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self._cache = {}  # path -> (mtime, own_bytes, subdirs, links)
+        self._lock = threading.Lock()
+        self._updates = {}  # root -> (bytes, complete)
+        self._generation = 0
+        self._thread = None
+        self.sizes = {}  # root -> bytes (hanya yang sudah selesai)
+
+    def _scan_cached(self, path, samples=None):
+        """
+        Scan satu folder, pakai cache jika mtime folder tidak berubah. samples: durasi scan asli.
+        Return (identity, own_bytes, subdirs, links), identity = (dev, inode) folder.
+        """
+        stat = os.stat(path)
+        identity = (stat.st_dev, stat.st_ino)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime:
+            return identity, cached[1], cached[2], cached[3]
+
+        started = time.monotonic()
+        own_bytes, subdirs, links = scan_dir_entry(path)
+        if samples is not None:
+            samples.append(time.monotonic() - started)
+        self._cache[path] = (stat.st_mtime, own_bytes, subdirs, links)
+        return identity, own_bytes, subdirs, links
+
+    def invalidate(self, path):
+        """Buang cache folder (mis. setelah ada perubahan dari luar)"""
+        self._cache.pop(str(path), None)
+
+    def _walk(self, roots, generation, publish=None):
+        """Walk beberapa root sekaligus di satu pool, return {root: bytes}"""
+        totals = {root: 0 for root in roots}
+        remaining = {root: 1 for root in roots}
+        seen_links = {root: set() for root in roots}
+        seen_dirs = {root: set() for root in roots}  # (dev, inode) folder: bind mount / junction loop dihitung sekali
+        store = get_profile_store()
+        if self.fixed_workers:
+            controller = AIMDController(self.max_workers, self.max_workers, self.max_workers)
+        else:
+            controller = store.controller(roots[0], 'scan', self.max_workers)
+        queued = [(root, root) for root in reversed(roots)]
+        samples = []
+
+        with ThreadPoolExecutor(max_workers=controller.maximum) as pool:
+            pending = {}
+
+            while pending or queued:
+                # Folder in-flight dibatasi limit AIMD, sisanya antri
+                while queued and len(pending) < controller.limit:
+                    path, root = queued.pop()
+                    pending[pool.submit(self._scan_cached, path, samples)] = root
+
+                if generation != self._generation:
+                    # Dibatalkan: buang pekerjaan yang belum jalan
+                    for future in pending:
+                        future.cancel()
+                    return None
+
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                touched = set()
+
+                for future in done:
+                    root = pending.pop(future)
+                    try:
+                        identity, own_bytes, subdirs, links = future.result()
+                    except OSError:
+                        identity, own_bytes, subdirs, links = None, 0, [], []
+                    if identity in seen_dirs[root]:
+                        own_bytes, subdirs, links = 0, [], []
+                    elif identity is not None:
+                        seen_dirs[root].add(identity)
+
+                    totals[root] += own_bytes
+                    for dev, inode, size in links:
+                        if (dev, inode) not in seen_links[root]:
+                            seen_links[root].add((dev, inode))
+                            totals[root] += size
+
+                    remaining[root] += len(subdirs) - 1
+                    queued.extend((subdir, root) for subdir in subdirs)
+                    touched.add(root)
+                controller.record(len(done))
+
+                if publish is not None:
+                    for root in touched:
+                        publish(root, totals[root], remaining[root] == 0)
+
+        if samples:
+            store.record_latency(roots[0], sum(samples) / len(samples))
+        if not self.fixed_workers:
+            store.remember(roots[0], 'scan', controller)
+        store.save()
+        return totals
+
+    def _publish(self, root, total, complete):
+        with self._lock:
+            self._updates[root] = (total, complete)
+            if complete:
+                self.sizes[root] = total
+
+    def compute(self, roots):
+        """Hitung ukuran (blocking), return {root: bytes}"""
+        return self._walk([str(root) for root in roots], self._generation)
+
+    def start(self, roots):
+        """Mulai hitung ukuran di background (membatalkan scan sebelumnya)"""
+        self.cancel()
+        roots = [str(root) for root in roots]
+        if not roots:
+            return
+
+        generation = self._generation
+        self._thread = threading.Thread(
+            target=self._walk, args=(roots, generation, self._publish), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Batalkan scan yang sedang berjalan"""
+        self._generation += 1
+        with self._lock:
+            self._updates.clear()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_busy(self):
+        """True jika scan masih jalan atau ada hasil yang belum di-poll"""
+        return self.is_running() or bool(self._updates)
+
+    def poll(self):
+        """Ambil hasil baru sejak poll terakhir: {root: (bytes, complete)}"""
+        with self._lock:
+            updates = self._updates
+            self._updates = {}
+        return updates
+
+
+_engine = None
+
+
+def get_dir_size_engine():
+    """Engine global supaya cache tetap ada saat pindah folder"""
+    global _engine
+    if _engine is None:
+        _engine = DirSizeEngine()
+    return _engine
+
+
+def list_dir_paths(items):
+    """Ambil full path semua folder di listing (tanpa "..")"""
+    if hasattr(items, 'dir_paths'):
+        return items.dir_paths()
+    return [item[4] for item in items if item[1] and item[0] != ".."]
+
+
+def apply_dir_sizes(items, updates):
+    """Masukkan hasil ukuran folder ke listing (size "+" berarti belum selesai)"""
+    if not updates:
+        return items
+
+    if hasattr(items, 'set_dir_sizes'):
+        items.set_dir_sizes(updates)
+        return items
+
+    result = []
+    for item in items:
+        name, is_dir, size, modified, full_path = item
+        if is_dir and name != ".." and full_path in updates:
+            total, complete = updates[full_path]
+            size = format_size(total) + ("" if complete else "+")
+            item = (name, is_dir, size, modified, full_path)
+        result.append(item)
+    return result
@@ -0,0 +1,186 @@
+"""
+Dual pane: dua ExplorerSession berdampingan dengan scan cache, watcher dan job queue bersama
+"""
+import os
+from .session import ExplorerSession
+from .listing import ListingCache, apply_listing_changes, listing_names
+from .watcher import DirectoryWatcher
+from .jobs import JobQueue
+from .file_operations import copy_multiple_items, move_multiple_items
+from .throttle import get_throttle
+
+
+def _sync_job(sources, dest_dir):
+    """Job sync incremental (hanya file baru / berubah) dari sources ke dest_dir"""
+    from .sync import plan_sync, execute_sync
+
+    return execute_sync(plan_sync(sources, dest_dir))
+
+
+class DualPane:
+    """
+    Dua pane (kiri & kanan), masing-masing ExplorerSession dengan path, sort,
+    filter dan selection sendiri. Yang dipakai bersama:
+    - ListingCache: folder yang dibuka di dua pane hanya di-scan sekali
+    - watcher per folder: event diterapkan sekali lalu dibagikan ke pane yang menampilkannya
+    - size engine global & JobQueue untuk copy / move / sync antar pane
+
+    poll() mengembalikan index pane yang berubah, jadi UI hanya menggambar ulang pane itu.
+    """
+
+    def __init__(self, left, right_path=None, state=None):
+        self.cache = ListingCache()
+        self.jobs = JobQueue()
+        self._watchers = {}  # path -> DirectoryWatcher
+
+        # Session yang sudah ada jadi pane kiri: watcher-nya diganti watcher bersama
+        left.set_watch(False)
+        left.cache = self.cache
+        self.cache.put(left.path, left.all_items)
+
+        right = ExplorerSession(right_path or left.path, journal=left.journal, state=state, cache=self.cache)
+        self.panes = [left, right]
+        self.active = 0
+        self.versions = [0, 0]  # Naik setiap kali isi pane berubah dari background (cache render)
+        self._sync_watchers()
+
+    @property
+    def session(self):
+        """Session pane aktif"""
+        return self.panes[self.active]
+
+    @property
+    def other(self):
+        """Session pane yang tidak aktif (tujuan copy / move / sync)"""
+        return self.panes[1 - self.active]
+
+    def switch(self):
+        self.active = 1 - self.active
+        return True, f"Active pane: {'left' if self.active == 0 else 'right'}"
+
+    def _sync_watchers(self):
+        """Satu watcher per folder yang sedang ditampilkan (dipanggil setelah navigasi)"""
+        paths = {pane.path for pane in self.panes}
+        for path in list(self._watchers):
+            if path not in paths:
+                self._watchers.pop(path).stop()
+        for path in paths:
+            if path not in self._watchers:
+                watcher = DirectoryWatcher()
+                watcher.watch(path)
+                self._watchers[path] = watcher
+
+    # --- Cross-pane operations ---------------------------------------------
+
+    def transfer(self, paths, mode='copy', policy=None):
+        """
+        Copy / move / sync paths dari pane aktif ke folder pane lain lewat job queue.
+        policy: conflict policy copy / move (lihat collisions.plan_transfer).
+        Return (success, message) langsung; hasil job muncul di poll().
+        """
+        if not paths:
+            return False, "No items selected"
+        source_dir = self.session.path
+        dest_dir = self.other.path
+        if dest_dir == source_dir:
+            return False, "Both panes show the same folder"
+        if any(dest_dir == path or dest_dir.startswith(path + os.sep) for path in paths):
+            return False, "Cannot transfer a folder into itself"
+
+        # Nama di tujuan dari listing pane lain: tanpa scan ulang untuk cek nama bentrok
+        existing = listing_names(self.other.all_items) if self.other.all_items is not None else None
+        if mode == 'copy':
+            self.jobs.submit("Copy", copy_multiple_items, list(paths), dest_dir, policy or 'rename', existing,
+                             affects=[dest_dir])
+        elif mode == 'move':
+            self.jobs.submit("Move", move_multiple_items, list(paths), dest_dir, policy or 'skip', existing,
+                             affects=[source_dir, dest_dir])
+        elif mode == 'sync':
+            self.jobs.submit("Sync", _sync_job, list(paths), dest_dir, affects=[dest_dir])
+        else:
+            return False, f"Unknown transfer mode: {mode}"
+
+        self.session.selection.clear()
+        pending = self.jobs.pending
+        return True, f"{mode.title()} {len(paths)} items to {os.path.basename(dest_dir) or dest_dir} queued ({pending} job{'s' if pending > 1 else ''})"
+
+    def job_status(self):
+        """Status line job background & I/O limit ("" jika tidak ada job dan limit off)"""
+        throttle = get_throttle()
+        pending = self.jobs.pending
+        if not pending and not throttle.enabled:
+            return ""
+        parts = []
+        if pending:
+            parts.append(f"⏳ {self.jobs.running or 'Queued'} ({pending} job{'s' if pending > 1 else ''})")
+        parts.append(throttle.describe())
+        return " | ".join(parts) + "  [+/-: Adjust limit]"
+
+    # --- Background --------------------------------------------------------
+
+    @property
+    def busy(self):
+        return True  # Watcher bersama selalu aktif
+
+    def poll(self):
+        """
+        Ambil hasil background (watcher bersama, ukuran folder, reconcile, job queue).
+        Return (changed_panes, message): set index pane yang perlu digambar ulang.
+        """
+        self._sync_watchers()
+        changed = set()
+        message = None
+
+        # Event watcher diterapkan sekali per folder, hasilnya dibagi ke pane yang menampilkannya
+        for path, watcher in self._watchers.items():
+            changes = watcher.drain()
+            if changes == {}:
+                continue
+            base = self.cache.get(path)
+            listing = apply_listing_changes(base, changes, path) if base is not None else None
+            if listing is not None:
+                self.cache.put(path, listing)
+            for idx, pane in enumerate(self.panes):
+                if pane.path == path:
+                    message = pane.apply_changes(changes, listing)
+                    changed.add(idx)
+
+        for idx, pane in enumerate(self.panes):
+            if pane.poll_reconcile():
+                changed.add(idx)
+
+        updates = self.panes[0].size_engine.poll()
+        if updates:
+            for idx, pane in enumerate(self.panes):
+                if any(os.path.dirname(root) == pane.path for root in updates):
+                    message = pane.apply_sizes(updates) or message
+                    changed.add(idx)
+
+        # Job selesai: refresh hanya pane yang folder-nya terpengaruh (satu scan per folder)
+        finished = self.jobs.poll()
+        if finished:
+            message = "; ".join(job.message for job in finished)
+        for job in finished:
+            for path in job.affects:
+                self.cache.invalidate(path)
+            for idx, pane in enumerate(self.panes):
+                if pane.path in job.affects:
+                    pane.refresh(fresh=False)  # Pane kedua di folder yang sama memakai hasil scan pertama
+                    pane.selection.retain(pane.path, pane.all_items)
+                    changed.add(idx)
+
+        for idx in changed:
+            self.versions[idx] += 1
+        return changed, message
+
+    def close(self):
+        """Tutup dual pane, return session pane aktif (kembali jadi single pane dengan watcher sendiri)"""
+        for watcher in self._watchers.values():
+            watcher.stop()
+        self._watchers = {}
+
+        # Pane lain cukup dilepas: size engine global & journal tetap dipakai session aktif
+        session = self.session
+        session.cache = None
+        session.set_watch(True)
+        return session
@@ -0,0 +1,213 @@
+"""
+Duplicate file finder (size -> partial hash -> full hash)
+"""
+import os
+import msvcrt
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .ui import clear_screen, draw_header
+from .file_system import format_size
+from .hashing import HashCache, PARTIAL_CHUNK, hash_partial, _hash_full_worker
+
+
+FULL_HASH_KIND = "full:blake2b"
+
+
+def _walk_files(root, should_cancel=None):
+    """Yield (path, size, mtime) semua file di subtree (symlink tidak diikuti)"""
+    stack = [root]
+    seen_links = set()
+    visited = 0
+
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if stat.st_nlink > 1:
+                    # Hard link ke inode yang sama bukan duplikat, itu file yang sama
+                    key = (stat.st_dev, stat.st_ino)
+                    if key in seen_links:
+                        continue
+                    seen_links.add(key)
+
+                yield entry.path, stat.st_size, stat.st_mtime
+
+                visited += 1
+                if should_cancel is not None and visited % 5000 == 0 and should_cancel():
+                    return
+
+
+def _regroup(groups, digests):
+    """Pecah setiap group berdasarkan digest, buang yang tinggal satu file"""
+    result = []
+    for group in groups:
+        buckets = {}
+        for entry in group:
+            digest = digests.get(entry[0])
+            if digest is not None:
+                buckets.setdefault(digest, []).append(entry)
+        result.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+    return result
+
+
+def find_duplicates(root, min_size=1, progress=None, should_cancel=None, cache=None, max_workers=None):
+    """
+    Cari file duplikat di subtree `root`.
+
+    Stage 1: kelompokkan berdasarkan ukuran (tanpa membaca isi file)
+    Stage 2: partial hash (beberapa KB awal & akhir) untuk kandidat
+    Stage 3: full hash di process pool, hanya untuk kandidat yang tersisa
+    Hash disimpan di HashCache dengan key (path, size, mtime).
+
+    Return list of (size, [path, ...]) diurutkan dari ruang terbuang terbesar,
+    list kosong jika dibatalkan lewat should_cancel.
+    """
+    def report(stage, detail):
+        if progress is not None:
+            progress(stage, detail)
+
+    # should_cancel (ESC) hanya True sekali (key sudah dibaca), jadi hasilnya di-latch
+    cancelled = False
+
+    def cancel_requested():
+        nonlocal cancelled
+        if not cancelled and should_cancel is not None and should_cancel():
+            cancelled = True
+        return cancelled
+
+    own_cache = cache is None
+    if own_cache:
+        cache = HashCache()
+
+    try:
+        # Stage 1: bucket by size
+        by_size = {}
+        scanned = 0
+        for path, size, mtime in _walk_files(str(root), cancel_requested):
+            if size >= min_size:
+                by_size.setdefault(size, []).append((path, size, mtime))
+            scanned += 1
+            if scanned % 5000 == 0:
+                report("Scanning", f"{scanned} files")
+        if cancelled:
+            return []
+        groups = [group for group in by_size.values() if len(group) > 1]
+        by_size = None
+
+        # Stage 2: partial hash (baca kecil, cukup pakai thread pool)
+        candidates = [entry for group in groups for entry in group]
+        report("Partial hash", f"{len(candidates)} candidates")
+        digests = {}
+        missing = []
+        for path, size, mtime in candidates:
+            digest = cache.get(path, "partial", size, mtime)
+            if digest is None:
+                missing.append((path, size, mtime))
+            else:
+                digests[path] = digest
+
+        def partial_worker(entry):
+            try:
+                return entry, hash_partial(entry[0], entry[1])
+            except OSError:
+                return entry, None
+
+        with ThreadPoolExecutor(max_workers=max_workers or min(16, (os.cpu_count() or 1) * 2)) as pool:
+            for (path, size, mtime), digest in pool.map(partial_worker, missing):
+                if digest is not None:
+                    digests[path] = digest
+                    cache.put(path, "partial", size, mtime, digest)
+        groups = _regroup(groups, digests)
+
+        if cancel_requested():
+            return []
+
+        # Stage 3: full hash untuk file yang lebih besar dari area partial hash
+        digests = {}
+        missing = []
+        for group in groups:
+            for path, size, mtime in group:
+                if size <= PARTIAL_CHUNK * 2:
+                    # Partial hash sudah mencakup seluruh isi file
+                    digests[path] = "partial"
+                    continue
+                digest = cache.get(path, FULL_HASH_KIND, size, mtime)
+                if digest is None:
+                    missing.append((path, size, mtime))
+                else:
+                    digests[path] = digest
+
+        report("Full hash", f"{len(missing)} files")
+        if missing:
+            stats = {path: (size, mtime) for path, size, mtime in missing}
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                jobs = ((path, "blake2b") for path, _, _ in missing)
+                for done, (path, digest) in enumerate(pool.map(_hash_full_worker, jobs, chunksize=8), 1):
+                    if digest is not None:
+                        digests[path] = digest
+                        size, mtime = stats[path]
+                        cache.put(path, FULL_HASH_KIND, size, mtime, digest)
+                    if done % 100 == 0:
+                        report("Full hash", f"{done}/{len(missing)} files")
+                        if cancel_requested():
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            return []
+        groups = _regroup(groups, digests)
+    finally:
+        cache.flush()
+        if own_cache:
+            cache.close()
+
+    result = [(group[0][1], sorted(path for path, _, _ in group)) for group in groups]
+    result.sort(key=lambda group: (-(group[0] * (len(group[1]) - 1)), group[1][0]))
+    return result
+
+
+def duplicate_items(groups, root):
+    """
+    Ubah hasil find_duplicates menjadi items untuk list view.
+    Return (items, extra_paths): file pertama tiap group dianggap asli,
+    sisanya (extra) di-select supaya bisa langsung dihapus.
+    """
+    items = []
+    extras = []
+    for group_no, (size, paths) in enumerate(groups, 1):
+        for position, path in enumerate(paths):
+            try:
+                modified = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M')
+            except OSError:
+                modified = "N/A"
+            name = f"[{group_no}] {os.path.relpath(path, root)}"
+            if position > 0:
+                extras.append(path)
+            items.append((name, False, format_size(size), modified, path))
+    return items, extras
+
+
+def run_duplicate_finder(current_path):
+    """Jalankan duplicate finder dengan progress di layar, return list group"""
+    clear_screen()
+    draw_header(current_path)
+    print("\n 🔎 Finding duplicate files... (ESC: Stop)")
+
+    def progress(stage, detail):
+        print(f"\r {stage}: {detail}".ljust(70), end="", flush=True)
+
+    def should_cancel():
+        return msvcrt.kbhit() and msvcrt.getch() == b'\x1b'
+
+    return find_duplicates(current_path, progress=progress, should_cancel=should_cancel)
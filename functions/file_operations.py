@@ -1,124 +1,122 @@
 """
 File operations (copy, move, delete, rename, create)
 """
-import shutil
 from pathlib import Path
+from .journal import get_journal, NOT_REPLACED
+from .collisions import plan_transfer
+from .metrics import timed
+
+
+def _transfer(kind, source_paths, dest_dir, policy, existing):
+    """
+    Copy / move source_paths ke dest_dir sebagai satu transaksi journal.
+    Return (jumlah berhasil, nama yang gagal, nama yang di-skip, ops).
+    Overwrite yang trash-nya gagal dilaporkan dengan alasannya (item lama tetap utuh).
+    """
+    ops, skipped = plan_transfer(source_paths, dest_dir, kind, policy, existing)
+    failed = get_journal().run(kind, ops) if ops else {}
+    trash_errors = {ops[idx][1]: failed[idx] for idx in failed if ops[idx][0] == 'trash'}
+    failed_items = []
+    for idx in sorted(failed):
+        op = ops[idx]
+        if op[0] != kind:
+            continue
+        name = Path(op[1]).name
+        if failed[idx] == NOT_REPLACED:
+            name += f" ({NOT_REPLACED.lower()}: {trash_errors.get(op[2], 'unknown error')})"
+        failed_items.append(name)
+    success_count = sum(1 for op in ops if op[0] == kind) - len(failed_items)
+    return success_count, failed_items, skipped, ops
+
+
+def _transfer_message(verb, success_count, failed_items, skipped):
+    message = f"{verb} {success_count} items"
+    if skipped:
+        message += f". Skipped (exists): {len(skipped)}"
+    if failed_items:
+        message += f". Failed: {', '.join(failed_items)}"
+    return message
 
 
-def copy_item(source_path, dest_dir):
-    """Copy file atau folder ke directory tujuan"""
+@timed
+def copy_item(source_path, dest_dir, policy='rename', existing=None):
+    """Copy file atau folder ke directory tujuan (nama bentrok diselesaikan sesuai policy)"""
     try:
-        source = Path(source_path)
-        dest = Path(dest_dir) / source.name
-        
-        # Cek jika sudah ada
-        if dest.exists():
-            # Generate nama baru dengan suffix
-            counter = 1
-            while dest.exists():
-                if source.is_dir():
-                    dest = Path(dest_dir) / f"{source.name}_copy{counter}"
-                else:
-                    stem = source.stem
-                    suffix = source.suffix
-                    dest = Path(dest_dir) / f"{stem}_copy{counter}{suffix}"
-                counter += 1
-        
-        if source.is_dir():
-            shutil.copytree(source, dest)
-        else:
-            shutil.copy2(source, dest)
-        
-        return True, f"Copied to {dest.name}"
+        # File besar di-copy per chunk (resumable, rename atomic setelah selesai)
+        success_count, failed_items, skipped, ops = _transfer('copy', [source_path], dest_dir, policy, existing)
+        if skipped:
+            return False, f"Skipped, already exists: {skipped[0]}"
+        if failed_items:
+            return False, f"Copy failed: {failed_items[0]}"
+        return True, f"Copied to {Path(ops[-1][2]).name}"
     except Exception as e:
         return False, f"Copy failed: {str(e)}"
 
 
-def copy_multiple_items(source_paths, dest_dir):
-    """Copy multiple files/folders ke directory tujuan"""
-    success_count = 0
-    failed_items = []
-    
-    for source_path in source_paths:
-        success, msg = copy_item(source_path, dest_dir)
-        if success:
-            success_count += 1
-        else:
-            failed_items.append(Path(source_path).name)
-    
-    if failed_items:
-        return True, f"Copied {success_count} items. Failed: {', '.join(failed_items)}"
-    else:
-        return True, f"Successfully copied {success_count} items"
+@timed
+def copy_multiple_items(source_paths, dest_dir, policy='rename', existing=None):
+    """
+    Copy multiple files/folders ke directory tujuan (satu transaksi journal).
+    policy (rename / skip / overwrite / newer) berlaku untuk seluruh batch,
+    existing: nama di dest_dir dari listing cache (lihat collisions.plan_transfer).
+    """
+    success_count, failed_items, skipped, _ = _transfer('copy', source_paths, dest_dir, policy, existing)
+    if failed_items or skipped:
+        return True, _transfer_message("Copied", success_count, failed_items, skipped)
+    return True, f"Successfully copied {success_count} items"
 
 
-def move_item(source_path, dest_dir):
-    """Move file atau folder ke directory tujuan"""
+@timed
+def move_item(source_path, dest_dir, policy='skip', existing=None):
+    """Move file atau folder ke directory tujuan (default: gagal jika nama sudah ada)"""
     try:
-        source = Path(source_path)
-        dest = Path(dest_dir) / source.name
-        
-        # Cek jika sudah ada
-        if dest.exists():
-            return False, f"Item already exists: {dest.name}"
-        
-        shutil.move(source, dest)
-        return True, f"Moved to {dest.name}"
+        success_count, failed_items, skipped, ops = _transfer('move', [source_path], dest_dir, policy, existing)
+        if skipped:
+            return False, f"Item already exists: {skipped[0]}"
+        if failed_items:
+            return False, f"Move failed: {failed_items[0]}"
+        return True, f"Moved to {Path(ops[-1][2]).name}"
     except Exception as e:
         return False, f"Move failed: {str(e)}"
 
 
-def move_multiple_items(source_paths, dest_dir):
-    """Move multiple files/folders ke directory tujuan"""
-    success_count = 0
-    failed_items = []
-    
-    for source_path in source_paths:
-        success, msg = move_item(source_path, dest_dir)
-        if success:
-            success_count += 1
-        else:
-            failed_items.append(Path(source_path).name)
-    
-    if failed_items:
-        return True, f"Moved {success_count} items. Failed: {', '.join(failed_items)}"
-    else:
-        return True, f"Successfully moved {success_count} items"
+@timed
+def move_multiple_items(source_paths, dest_dir, policy='skip', existing=None):
+    """Move multiple files/folders ke directory tujuan (satu transaksi journal, policy per batch)"""
+    success_count, failed_items, skipped, _ = _transfer('move', source_paths, dest_dir, policy, existing)
+    if failed_items or skipped:
+        return True, _transfer_message("Moved", success_count, failed_items, skipped)
+    return True, f"Successfully moved {success_count} items"
 
 
+@timed
 def delete_item(path):
-    """Delete file atau folder"""
+    """Delete file atau folder (dipindah ke trash, bisa di-undo)"""
     try:
-        path_obj = Path(path)
-        
-        if path_obj.is_dir():
-            shutil.rmtree(path)
-        else:
-            path_obj.unlink()
+        failed = get_journal().run('delete', [['trash', str(path), None]])
+        if failed:
+            return False, f"Delete failed: {failed[0]}"
         
-        return True, "Deleted successfully"
+        return True, "Moved to trash"
     except Exception as e:
         return False, f"Delete failed: {str(e)}"
 
 
+@timed
 def delete_multiple_items(paths):
-    """Delete multiple files/folders"""
-    success_count = 0
-    failed_items = []
-    
-    for path in paths:
-        success, msg = delete_item(path)
-        if success:
-            success_count += 1
-        else:
-            failed_items.append(Path(path).name)
+    """Delete multiple files/folders (satu transaksi journal, ke trash)"""
+    ops = [['trash', str(path), None] for path in paths]
+    failed = get_journal().run('delete', ops)
+    failed_items = [Path(ops[idx][1]).name for idx in sorted(failed)]
+    success_count = len(ops) - len(failed_items)
     
     if failed_items:
         return True, f"Deleted {success_count} items. Failed: {', '.join(failed_items)}"
     else:
-        return True, f"Successfully deleted {success_count} items"
+        return True, f"Successfully moved {success_count} items to trash"
 
 
+@timed
 def rename_item(old_path, new_name):
     """Rename file atau folder"""
     try:
@@ -128,12 +126,15 @@ def rename_item(old_path, new_name):
         if new_path.exists():
             return False, f"Name already exists: {new_name}"
         
-        old_path_obj.rename(new_path)
+        failed = get_journal().run('rename', [['move', str(old_path_obj), str(new_path)]])
+        if failed:
+            return False, f"Rename failed: {failed[0]}"
         return True, f"Renamed to {new_name}"
     except Exception as e:
         return False, f"Rename failed: {str(e)}"
 
 
+@timed
 def create_folder(parent_dir, folder_name):
     """Create folder baru"""
     try:
@@ -142,12 +143,15 @@ def create_folder(parent_dir, folder_name):
         if new_folder.exists():
             return False, f"Folder already exists: {folder_name}"
         
-        new_folder.mkdir(parents=True)
+        failed = get_journal().run('mkdir', [['mkdir', None, str(new_folder)]])
+        if failed:
+            return False, f"Create folder failed: {failed[0]}"
         return True, f"Created folder: {folder_name}"
     except Exception as e:
         return False, f"Create folder failed: {str(e)}"
 
 
+@timed
 def create_file(parent_dir, filename):
     """Create file baru (kosong)"""
     try:
@@ -157,7 +161,9 @@ def create_file(parent_dir, filename):
             return False, f"File already exists: {filename}"
         
         # Buat file kosong
-        new_file.touch()
+        failed = get_journal().run('touch', [['touch', None, str(new_file)]])
+        if failed:
+            return False, f"Create file failed: {failed[0]}"
         return True, f"Created file: {filename}"
     except Exception as e:
         return False, f"Create file failed: {str(e)}"
\ No newline at end of file
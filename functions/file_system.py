@@ -4,6 +4,14 @@ File system operations
 import os
 from pathlib import Path
 from datetime import datetime
+from .metrics import timed
+
+
+def get_app_dir():
+    """Folder data aplikasi (cache, journal, state), bisa diganti via FILE_EXPLORER_HOME"""
+    app_dir = os.environ.get("FILE_EXPLORER_HOME") or os.path.join(os.path.expanduser("~"), ".file_explorer")
+    os.makedirs(app_dir, exist_ok=True)
+    return app_dir
 
 
 def format_size(size_bytes):
@@ -26,6 +34,7 @@ def get_file_info(path):
         return "N/A", "N/A"
 
 
+@timed(entries=True)
 def scan_directory(path):
     """
     Scan directory dan return list items dengan format:
@@ -78,10 +87,12 @@ def open_file(filepath):
 
 def change_directory(new_path):
     """Pindah ke directory baru dan return items"""
+    from .listing import scan_listing
+    
     try:
         # Validasi path exists
         if os.path.exists(new_path) and os.path.isdir(new_path):
-            return new_path, scan_directory(new_path)
+            return new_path, scan_listing(new_path)
         else:
             return None, []
     except:
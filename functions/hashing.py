@@ -0,0 +1,114 @@
+"""
+File hashing helpers dan persistent hash cache
+"""
+import os
+import sqlite3
+import hashlib
+import threading
+from .file_system import get_app_dir
+
+
+PARTIAL_CHUNK = 4096  # Bytes yang dibaca dari awal & akhir file untuk partial hash
+READ_CHUNK = 1024 * 1024
+
+
+def hash_partial(path, size, chunk=PARTIAL_CHUNK):
+    """Hash dari beberapa KB pertama & terakhir file (plus ukuran file)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, 'little'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(chunk))
+        if size > chunk * 2:
+            f.seek(size - chunk)
+            digest.update(f.read(chunk))
+        elif size > chunk:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def available_algorithms():
+    """Algoritma hash yang bisa dipakai (xxhash hanya jika package-nya terinstall)"""
+    import importlib.util
+    algorithms = ['sha256', 'blake2b']
+    if importlib.util.find_spec('xxhash') is not None:
+        algorithms.append('xxh3_64')
+    return algorithms
+
+
+def new_hasher(algorithm):
+    """Object hash (update / hexdigest) untuk algorithm hashlib atau xxhash (xxh3_64, xxh64, xxh128)"""
+    if algorithm.startswith('xxh'):
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(f"{algorithm} requires the xxhash package")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def hash_full(path, algorithm="blake2b", chunk=READ_CHUNK):
+    """Hash seluruh isi file, dibaca per chunk"""
+    digest = new_hasher(algorithm)
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _hash_full_worker(args):
+    """Worker untuk process pool (harus top-level supaya bisa di-pickle)"""
+    path, algorithm = args
+    try:
+        return path, hash_full(path, algorithm)
+    except OSError:
+        return path, None
+
+
+class HashCache:
+    """
+    Cache hash persistent (SQLite) dengan key (path, kind) dan validasi (size, mtime).
+    kind membedakan jenis hash, mis. "partial" atau "full:blake2b".
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(get_app_dir(), "hash_cache.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT, kind TEXT, size INTEGER, mtime REAL, digest TEXT, "
+            "PRIMARY KEY (path, kind))")
+        self._pending = []
+
+    def get(self, path, kind, size, mtime):
+        """Return digest dari cache, atau None jika tidak ada / file sudah berubah"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, digest FROM hashes WHERE path = ? AND kind = ?",
+                (path, kind)).fetchone()
+        if row and row[0] == size and row[1] == mtime:
+            return row[2]
+        return None
+
+    def put(self, path, kind, size, mtime, digest):
+        """Simpan hash (ditulis per batch saat flush)"""
+        self._pending.append((path, kind, size, mtime, digest))
+        if len(self._pending) >= 1000:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes (path, kind, size, mtime, digest) VALUES (?, ?, ?, ?, ?)",
+                self._pending)
+            self._conn.commit()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._conn.close()
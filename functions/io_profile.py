@@ -0,0 +1,211 @@
+"""
+Profil performa per mount (latency & throughput yang teramati, disimpan antar launch)
+dan controller AIMD untuk jumlah worker & ukuran chunk file operation
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+from .file_system import get_app_dir
+from .mounts import find_mount
+
+
+MAX_PROFILES = 64            # Mount yang diingat, yang paling lama tidak dipakai dibuang
+EWMA_ALPHA = 0.3             # Bobot sample baru untuk latency / throughput
+MIN_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+CHUNK_SECONDS = 0.25         # Target durasi satu chunk copy (chunk = throughput x durasi)
+
+WINDOW_SECONDS = 0.5         # Durasi satu window pengukuran AIMD
+IMPROVE_RATIO = 1.05         # Throughput harus naik > 5% supaya dianggap membaik
+BACKOFF = 0.7                # Faktor multiplicative decrease
+
+
+class AIMDController:
+    """
+    Jumlah worker adaptif: additive increase, multiplicative decrease.
+
+    Throughput (byte / item per detik) diukur per window. Selama throughput
+    membaik, limit naik 1 per window; jika penambahan worker tidak membuat
+    throughput naik (disk / share sudah jenuh), limit dikali BACKOFF lalu
+    probing naik lagi dari sana. Pemanggil menjaga item in-flight <= limit.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=32, window=WINDOW_SECONDS):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = max(minimum, min(self.maximum, initial))
+        self.window = window
+        self.best_limit = self.limit
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._amount = 0
+        self._last_rate = None
+        self._best_rate = 0.0
+        self._last_action = None
+
+    def record(self, amount):
+        """Catat pekerjaan yang selesai (bytes / item); limit disesuaikan tiap window"""
+        with self._lock:
+            self._amount += amount
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed < self.window:
+                return
+            rate = self._amount / elapsed
+            self._amount = 0
+            self._window_start = now
+            self._adjust(rate)
+
+    def _adjust(self, rate):
+        if rate > self._best_rate:
+            self._best_rate = rate
+            self.best_limit = self.limit
+
+        previous = self._last_rate
+        self._last_rate = rate
+        if previous is None or rate > previous * IMPROVE_RATIO or self._last_action == 'decrease':
+            # Masih membaik (atau baru mundur): probing naik satu worker
+            self.limit = min(self.maximum, self.limit + 1)
+            self._last_action = 'increase'
+        else:
+            # Worker tambahan tidak menambah throughput: mundur
+            self.limit = max(self.minimum, int(self.limit * BACKOFF))
+            self._last_action = 'decrease'
+
+
+def _read_profiles(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class ProfileStore:
+    """
+    Profil per mount point di io_profiles.json (app dir):
+    {mount: {'fs', 'latency' (detik per scan folder), 'throughput' (byte/detik),
+    'workers': {kind: limit terbaik terakhir}, 'used'}}.
+    Update di memori, save() menulis file hanya jika ada perubahan.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_app_dir(), "io_profiles.json")
+        self._lock = threading.Lock()
+        self._profiles = _read_profiles(self.path)
+        self._dirty = False
+        self._version = 0  # Naik setiap update, untuk save() paralel
+        self._save_lock = threading.Lock()  # Urutan tulis = urutan snapshot (file tidak mundur ke data lama)
+
+    def _profile(self, path):
+        mount, fs_type = find_mount(path)
+        profile = self._profiles.get(mount)
+        if profile is None:
+            profile = self._profiles[mount] = {'fs': fs_type, 'workers': {}}
+        profile['used'] = time.time()
+        return profile
+
+    def get(self, path):
+        """Salinan profil mount tempat path berada"""
+        with self._lock:
+            return dict(self._profile(path))
+
+    def profiles(self):
+        with self._lock:
+            return {mount: dict(profile) for mount, profile in self._profiles.items()}
+
+    def _ewma(self, path, key, value):
+        with self._lock:
+            profile = self._profile(path)
+            old = profile.get(key)
+            profile[key] = value if old is None else old + EWMA_ALPHA * (value - old)
+            self._dirty = True
+            self._version += 1
+
+    def record_latency(self, path, seconds):
+        """Sample latency operasi metadata (mis. satu scandir + stat)"""
+        self._ewma(path, 'latency', seconds)
+
+    def record_transfer(self, path, nbytes, seconds):
+        """Sample throughput baca / tulis (copy satu file besar, satu batch copy)"""
+        if nbytes > 0 and seconds > 0:
+            self._ewma(path, 'throughput', nbytes / seconds)
+
+    def workers(self, path, kind, default):
+        """Jumlah worker terakhir yang terbaik untuk operasi kind di mount ini"""
+        with self._lock:
+            return self._profile(path)['workers'].get(kind, default)
+
+    def controller(self, path, kind, default, maximum=32):
+        """AIMDController yang mulai dari jumlah worker tersimpan untuk mount ini"""
+        return AIMDController(self.workers(path, kind, default), maximum=maximum)
+
+    def remember(self, path, kind, controller):
+        """Simpan limit terbaik controller sebagai titik awal operasi berikutnya"""
+        with self._lock:
+            self._profile(path)['workers'][kind] = controller.best_limit
+            self._dirty = True
+            self._version += 1
+
+    def chunk_size(self, path):
+        """Ukuran chunk copy dari throughput teramati (pangkat 2, 1-64 MB), None jika belum ada data"""
+        with self._lock:
+            throughput = self._profile(path).get('throughput')
+        if not throughput:
+            return None
+        target = int(throughput * CHUNK_SECONDS)
+        chunk = MIN_CHUNK_SIZE
+        while chunk * 2 <= min(target, MAX_CHUNK_SIZE):
+            chunk *= 2
+        return chunk
+
+    def save(self):
+        """
+        Tulis profil (atomic). Bisa dipanggil paralel dari worker copy: penulisan
+        berurutan lewat _save_lock, file temp unik per pemanggil (mkstemp), dan
+        _dirty baru di-reset setelah replace berhasil dan hanya jika tidak ada
+        update baru selama menulis.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                profiles = sorted(self._profiles.items(), key=lambda item: item[1].get('used', 0))
+                self._profiles = dict(profiles[-MAX_PROFILES:])
+                data = json.dumps(self._profiles, separators=(',', ':'))
+                version = self._version
+            try:
+                fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp",
+                                                  dir=os.path.dirname(self.path))
+            except OSError:
+                return False
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return False
+            with self._lock:
+                if self._version == version:
+                    self._dirty = False
+            return True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store():
+    """ProfileStore global (dibaca sekali per proses)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore()
+        return _store
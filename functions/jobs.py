@@ -0,0 +1,88 @@
+"""
+Background job queue: operasi file panjang (copy / move / sync antar pane) tanpa memblok UI
+"""
+import threading
+from collections import deque
+from .throttle import get_throttle
+
+
+class Job:
+    """Satu job di queue. func harus return (success, message) seperti file_operations"""
+
+    __slots__ = ('name', 'func', 'args', 'affects', 'success', 'message')
+
+    def __init__(self, name, func, args, affects):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.affects = frozenset(affects)  # Folder yang listing-nya berubah setelah job selesai
+        self.success = None
+        self.message = ""
+
+
+class JobQueue:
+    """
+    Antrian FIFO dengan satu worker thread: job dijalankan berurutan
+    (copy lalu move ke folder yang sama tetap deterministik), hasilnya
+    diambil UI lewat poll() seperti DirSizeEngine. Worker berhenti saat
+    antrian kosong dan dibuat lagi oleh submit() berikutnya.
+    """
+
+    def __init__(self):
+        self._pending = deque()
+        self._done = []
+        self._lock = threading.Lock()
+        self._running = None
+        self._thread = None
+
+    def submit(self, name, func, *args, affects=()):
+        """Tambahkan job ke antrian, return Job"""
+        job = Job(name, func, args, affects)
+        with self._lock:
+            self._pending.append(job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+        return job
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                job = self._pending.popleft()
+                self._running = job
+            try:
+                # Prioritas rendah: I/O job menunggu scan foreground (navigasi) selesai
+                with get_throttle().background():
+                    job.success, job.message = job.func(*job.args)
+            except Exception as e:
+                job.success, job.message = False, f"{job.name} failed: {e}"
+            with self._lock:
+                self._running = None
+                self._done.append(job)
+
+    @property
+    def running(self):
+        """Nama job yang sedang jalan, None jika idle"""
+        with self._lock:
+            return self._running.name if self._running is not None else None
+
+    @property
+    def pending(self):
+        """Jumlah job yang belum selesai (termasuk yang sedang jalan)"""
+        with self._lock:
+            return len(self._pending) + (1 if self._running is not None else 0)
+
+    def is_busy(self):
+        """True jika masih ada job jalan / antri atau hasil yang belum di-poll"""
+        with self._lock:
+            return bool(self._pending or self._running is not None or self._done)
+
+    def poll(self):
+        """Ambil job yang sudah selesai sejak poll terakhir"""
+        with self._lock:
+            done = self._done
+            self._done = []
+        return done
@@ -0,0 +1,458 @@
+"""
+Operation journal (append-only, crash-safe) dengan undo/redo dan trash
+"""
+import os
+import json
+import errno
+import shutil
+import threading
+from datetime import datetime, timedelta
+from .file_system import get_app_dir
+from .mounts import find_mount
+from .transfer import copy_file
+from .tree_walk import copy_tree, walk_tree, dest_in_source
+from .throttle import get_throttle
+
+
+MAX_HISTORY = 100         # Jumlah transaksi yang bisa di-undo
+COMPACT_RECORDS = 2000    # Journal di-compact saat load jika lebih dari ini
+COMPACT_BYTES = 16 * 1024 * 1024
+TRASH_DAYS = 30           # Isi trash yang lebih tua dari ini dihapus permanen
+VOLUME_TRASH = ".file_explorer_trash"  # Folder trash di root volume selain volume app dir
+NOT_REPLACED = "Existing item could not be moved to trash"  # Op yang dilewati karena trash sebelumnya gagal
+
+
+def _apply(op, resume=False):
+    """
+    Jalankan satu operasi [kind, src, dst].
+    move/trash = rename (fallback copy + hapus hanya untuk EXDEV / antar drive),
+    copy = copy file/folder, mkdir/touch = buat folder/file kosong.
+    Folder tidak bisa di-move / copy ke dalam dirinya sendiri.
+    Setiap operasi lewat I/O throttle (copy dihitung per file / chunk di copy_file).
+    trash tidak pernah fallback ke copy antar volume (folder trash selalu di volume yang sama).
+    """
+    kind, src, dst = op
+    if kind != 'copy':
+        get_throttle().io()
+    if kind in ('move', 'copy') and os.path.isdir(src) and not os.path.islink(src) and dest_in_source(src, dst):
+        raise OSError(errno.EINVAL, f"Cannot {kind} a folder into itself", src)
+    if kind == 'trash' and dst is None:
+        raise OSError(errno.EXDEV, "No writable trash on this volume, item not deleted", src)
+    if kind in ('move', 'trash'):
+        if os.path.lexists(dst):
+            raise FileExistsError(f"Item already exists: {os.path.basename(dst)}")
+        parent = os.path.dirname(dst)
+        if not os.path.isdir(parent):  # Satu stat, bukan mkdir yang gagal per item (rename batch besar)
+            os.makedirs(parent, exist_ok=True)
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            if not os.path.lexists(src) or e.errno != errno.EXDEV:
+                raise
+            if kind == 'trash':
+                # Jangan copy seluruh folder ke volume lain hanya untuk dibuang
+                raise OSError(errno.EXDEV, "Trash is on another volume, item not deleted", src)
+            if os.path.isdir(src) and not os.path.islink(src):
+                # Beda drive: copy dengan hard link / symlink tetap utuh, lalu hapus source
+                # (rmtree tidak mengikuti symlink / junction, jadi tidak perlu walk_tree)
+                copy_tree(src, dst, symlinks='preserve')
+                shutil.rmtree(src)
+            else:
+                shutil.move(src, dst)
+    elif kind == 'copy':
+        if os.path.isdir(src) and not os.path.islink(src):
+            copy_tree(src, dst, resume=resume)
+        else:
+            copy_file(src, dst)
+    elif kind == 'mkdir':
+        os.makedirs(dst, exist_ok=resume)
+    elif kind == 'touch':
+        with open(dst, 'x' if not resume else 'a'):
+            pass
+    else:
+        raise ValueError(f"Unknown operation: {kind}")
+
+
+def _remove_tree(path):
+    """
+    Hapus folder permanen. Tanpa I/O throttle: shutil.rmtree (tidak mengikuti
+    symlink, junction di Windows dihapus sebagai link). Dengan throttle: satu
+    operasi per item lewat walk_tree, symlink / junction di-unlink tanpa dimasuki.
+    """
+    throttle = get_throttle()
+    if not throttle.enabled:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    folders = [path]
+    for entry in walk_tree(path, symlinks='preserve', hardlinks=False):
+        if entry.kind == 'dir':
+            folders.append(entry.path)
+            continue
+        throttle.io()
+        try:
+            if entry.kind == 'loop':
+                os.rmdir(entry.path)  # Link ke folder induk (bind mount tidak bisa dihapus di sini)
+            else:
+                os.unlink(entry.path)  # File, hard link, symlink / junction
+        except OSError:
+            pass
+    # Folder di-yield sebelum isinya, jadi dihapus dengan urutan terbalik
+    for folder in reversed(folders):
+        throttle.io()
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+
+
+def _item_count(ops):
+    """
+    Jumlah item logis di ops: op yang src-nya hasil op sebelumnya di batch yang
+    sama (mis. rename two-phase lewat nama temp) tidak dihitung lagi.
+    """
+    produced = set()
+    count = 0
+    for _, src, dst in ops:
+        if src is None or src not in produced:
+            count += 1
+        produced.add(dst)
+    return count
+
+
+def _is_done(op):
+    """Tebak apakah operasi sudah selesai sebelum crash (dari state di disk)"""
+    kind, src, dst = op
+    if kind in ('move', 'trash'):
+        return dst is not None and os.path.lexists(dst) and not os.path.lexists(src)
+    return False  # copy/mkdir/touch di-replay (idempotent dengan resume=True)
+
+
+class OperationJournal:
+    """
+    Journal append-only (JSON lines) untuk semua mutasi dari file_operations.
+
+    Satu batch = satu transaksi dengan dua record: "begin" (berisi semua operasi)
+    yang di-fsync sebelum file disentuh, dan "commit" (index operasi yang gagal)
+    setelah selesai. Jadi 10k item tetap hanya 2x fsync.
+    Transaksi yang punya begin tanpa commit = crash di tengah jalan, di-replay
+    oleh recover(). Lock hanya dipegang saat menulis record begin / commit,
+    jadi batch panjang (job background) tidak memblokir undo / rename / delete.
+
+    Trash per volume: item di volume app dir ke trash_dir, item di volume lain
+    ke `<mount>/.file_explorer_trash`, supaya delete selalu rename. Jika root
+    volume tidak bisa ditulis, delete di volume itu gagal (item tidak disentuh).
+    """
+
+    def __init__(self, path=None, trash_dir=None):
+        app_dir = get_app_dir()
+        self.path = path or os.path.join(app_dir, "operations.jsonl")
+        self.trash_dir = trash_dir or os.path.join(app_dir, "trash")
+        self._roots_path = os.path.join(os.path.dirname(self.path), "trash_roots.json")
+        self._trash_roots = {}  # st_dev -> folder trash di volume itu
+        self._lock = threading.Lock()
+        self._next_txn = 1
+        self._undo = []   # Entry: {'txn', 'kind', 'ops'}
+        self._redo = []
+        self._incomplete = {}
+        self._load()
+
+    # --- Persistence -------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        begins = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Record terakhir bisa terpotong saat crash
+
+            kind = record.get('t')
+            if kind == 'snapshot':
+                self._undo = record['undo']
+                self._redo = record['redo']
+                self._next_txn = max(self._next_txn, record['next'])
+            elif kind == 'begin':
+                begins[record['txn']] = record
+                self._next_txn = max(self._next_txn, record['txn'] + 1)
+            elif kind == 'commit':
+                begin = begins.pop(record['txn'], None)
+                if begin is not None:
+                    failed = set(record.get('failed', []))
+                    done = [op for idx, op in enumerate(begin['ops']) if idx not in failed]
+                    self._record(begin['txn'], begin['kind'], begin.get('of'), done)
+
+        self._incomplete = begins
+        oversized = len(lines) > COMPACT_RECORDS or sum(len(line) for line in lines) > COMPACT_BYTES
+        if oversized and not begins:
+            self._compact()
+
+    def _append(self, records):
+        """Append record lalu fsync sekali untuk seluruh batch"""
+        data = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self):
+        """Tulis ulang journal sebagai satu snapshot undo/redo (atomic replace)"""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'t': 'snapshot', 'undo': self._undo, 'redo': self._redo, 'next': self._next_txn}, f)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _record(self, txn, kind, of, done):
+        """Update stack undo/redo setelah transaksi selesai"""
+        # 'kind' di entry undo/redo tetap jenis operasi asli (move, delete, ...)
+        if kind == 'undo':
+            if self._undo and self._undo[-1]['txn'] == of:
+                kind = self._undo.pop()['kind']
+            self._redo.append({'txn': txn, 'kind': kind, 'ops': done})
+        elif kind == 'redo':
+            if self._redo and self._redo[-1]['txn'] == of:
+                kind = self._redo.pop()['kind']
+            self._undo.append({'txn': txn, 'kind': kind, 'ops': done})
+        elif done:
+            self._undo.append({'txn': txn, 'kind': kind, 'ops': done})
+            self._redo = []
+        del self._undo[:-MAX_HISTORY]
+
+    # --- Running operations ------------------------------------------------
+
+    def _volume_trash_roots(self):
+        """Folder trash di volume lain yang pernah dipakai (untuk purge_trash)"""
+        try:
+            with open(self._roots_path, 'r', encoding='utf-8') as f:
+                roots = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [root for root in roots if isinstance(root, str)] if isinstance(roots, list) else []
+
+    def _register_trash_root(self, root):
+        roots = self._volume_trash_roots()
+        if root in roots:
+            return
+        temp_path = self._roots_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(roots + [root], f)
+            os.replace(temp_path, self._roots_path)
+        except OSError:
+            pass
+
+    def _trash_root(self, src):
+        """
+        Folder trash di volume yang sama dengan src (dicek lewat st_dev, di-cache
+        per volume), None jika tidak ada folder trash yang bisa dipakai di volume itu.
+        """
+        try:
+            device = os.lstat(src).st_dev
+        except OSError:
+            return self.trash_dir  # Source hilang: operasi gagal juga, path trash tidak penting
+        root = self._trash_roots.get(device)
+        if root is not None:
+            return root
+
+        mount = find_mount(src)[0]
+        candidates = [
+            self.trash_dir,
+            os.path.join(mount if mount.endswith(os.sep) else mount + os.sep, VOLUME_TRASH),
+        ]
+        for candidate in candidates:
+            created = not os.path.isdir(candidate)
+            try:
+                os.makedirs(candidate, exist_ok=True)
+                same_volume = os.stat(candidate).st_dev == device
+            except OSError:
+                continue
+            if same_volume:
+                if candidate != self.trash_dir:
+                    self._register_trash_root(candidate)
+                self._trash_roots[device] = candidate
+                return candidate
+            if created:
+                try:
+                    os.rmdir(candidate)
+                except OSError:
+                    pass
+        return None
+
+    def _trash_path(self, txn, index, src):
+        """Path tujuan op trash, None jika volume src tidak punya folder trash (op gagal di _apply)"""
+        root = self._trash_root(src)
+        if root is None:
+            return None
+        folder = f"{datetime.now().strftime('%Y%m%d')}-{txn}"
+        return os.path.join(root, folder, f"{index}_{os.path.basename(src)}")
+
+    def run(self, kind, ops, of=None, atomic=False):
+        """
+        Jalankan satu batch operasi [[op, src, dst], ...] sebagai satu transaksi.
+        Untuk op 'trash', dst boleh None (diisi path di folder trash).
+        atomic=True (batch move / rename): berhenti di operasi pertama yang gagal dan kembalikan
+        operasi yang sudah jalan (urutan terbalik), jadi batch jalan semua atau tidak sama sekali.
+        Tanpa atomic, op yang menulis ke path yang gagal di-trash (overwrite) tidak dijalankan.
+        Return dict index -> pesan error untuk operasi yang gagal.
+        """
+        with self._lock:
+            txn = self._next_txn
+            self._next_txn += 1
+            ops = [[op, src, dst if dst is not None or op != 'trash' else self._trash_path(txn, idx, src)]
+                   for idx, (op, src, dst) in enumerate(ops)]
+
+            begin = {'t': 'begin', 'txn': txn, 'kind': kind, 'ops': ops}
+            if of is not None:
+                begin['of'] = of
+            self._append([begin])
+
+        # Operasi jalan tanpa lock: transaksi lain (undo, rename dari TUI) tidak menunggu batch ini
+        failed = {}
+        kept = set()  # Path yang gagal di-trash: isi lama masih di sana
+        for idx, op in enumerate(ops):
+            if op[2] in kept:
+                failed[idx] = NOT_REPLACED
+                continue
+            try:
+                _apply(op)
+            except (OSError, shutil.Error, ValueError) as e:
+                failed[idx] = str(e)
+                if op[0] == 'trash':
+                    kept.add(op[1])
+                if atomic:
+                    self._rollback(ops, idx, failed)
+                    break
+
+        with self._lock:
+            self._append([{'t': 'commit', 'txn': txn, 'failed': sorted(failed)}])
+            self._record(txn, kind, of, [op for idx, op in enumerate(ops) if idx not in failed])
+        return failed
+
+    def _rollback(self, ops, failed_idx, failed):
+        """Batalkan ops[:failed_idx] (mode atomic); op yang tidak bisa dikembalikan tetap tercatat done"""
+        for idx in range(len(ops) - 1, failed_idx, -1):
+            failed[idx] = "Not run"
+        for idx in range(failed_idx - 1, -1, -1):
+            try:
+                _apply(self._inverse([ops[idx]])[0])
+                failed[idx] = "Rolled back"
+            except (OSError, shutil.Error, ValueError):
+                pass
+
+    @staticmethod
+    def _inverse(txn_ops):
+        """Operasi kebalikan (urutan dibalik): move <-> move, copy/mkdir/touch -> trash"""
+        inverse = []
+        for kind, src, dst in reversed(txn_ops):
+            if kind in ('move', 'trash'):
+                inverse.append(['move', dst, src])
+            else:
+                inverse.append(['trash', dst, None])
+        return inverse
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Undo transaksi terakhir, return (success, message)"""
+        if not self._undo:
+            return False, "Nothing to undo"
+        entry = self._undo[-1]
+        ops = self._inverse(entry['ops'])
+        failed = self.run('undo', ops, of=entry['txn'])
+        count = _item_count([op for idx, op in enumerate(ops) if idx not in failed])
+        if failed:
+            failed_count = _item_count([ops[idx] for idx in failed])
+            return True, f"Undo: {count} items reverted. Failed: {failed_count} ({next(iter(failed.values()))})"
+        return True, f"Undo {entry['kind']}: {count} items reverted"
+
+    def redo(self):
+        """Redo transaksi yang terakhir di-undo, return (success, message)"""
+        if not self._redo:
+            return False, "Nothing to redo"
+        entry = self._redo[-1]
+        ops = self._inverse(entry['ops'])
+        failed = self.run('redo', ops, of=entry['txn'])
+        count = _item_count([op for idx, op in enumerate(ops) if idx not in failed])
+        if failed:
+            failed_count = _item_count([ops[idx] for idx in failed])
+            return True, f"Redo {entry['kind']}: {count} items. Failed: {failed_count} ({next(iter(failed.values()))})"
+        return True, f"Redo {entry['kind']}: {count} items"
+
+    # --- Recovery ----------------------------------------------------------
+
+    def recover(self):
+        """
+        Replay transaksi yang terputus (crash di tengah batch): operasi yang
+        belum selesai dijalankan ulang, lalu transaksi di-commit.
+        Return (jumlah transaksi yang di-recover, message).
+        """
+        if not self._incomplete:
+            return 0, ""
+
+        with self._lock:
+            replayed = 0
+            for txn, begin in sorted(self._incomplete.items()):
+                failed = []
+                kept = set()
+                for idx, op in enumerate(begin['ops']):
+                    if _is_done(op):
+                        continue
+                    if op[2] in kept:
+                        failed.append(idx)  # Trash untuk overwrite gagal, jangan timpa yang lama
+                        continue
+                    if op[0] in ('move', 'trash') and not os.path.lexists(op[1]):
+                        failed.append(idx)  # Source hilang, tidak bisa dilanjutkan
+                        continue
+                    try:
+                        _apply(op, resume=True)
+                        replayed += 1
+                    except (OSError, shutil.Error, ValueError):
+                        failed.append(idx)
+                        if op[0] == 'trash':
+                            kept.add(op[1])
+
+                self._append([{'t': 'commit', 'txn': txn, 'failed': failed, 'recovered': True}])
+                done = [op for idx, op in enumerate(begin['ops']) if idx not in failed]
+                self._record(txn, begin['kind'], begin.get('of'), done)
+
+            count = len(self._incomplete)
+            self._incomplete = {}
+        return count, f"Recovered {count} interrupted operation(s), {replayed} items replayed"
+
+    def purge_trash(self, days=TRASH_DAYS):
+        """Hapus permanen isi trash (semua volume) yang lebih tua dari `days` hari"""
+        cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+        removed = 0
+        for trash_dir in [self.trash_dir] + self._volume_trash_roots():
+            try:
+                folders = os.listdir(trash_dir)
+            except OSError:
+                continue
+            for folder in folders:
+                if folder.split("-", 1)[0] < cutoff:
+                    _remove_tree(os.path.join(trash_dir, folder))
+                    removed += 1
+        return removed
+
+
+_journal = None
+
+
+def get_journal():
+    """Journal global (dipakai semua fungsi di file_operations)"""
+    global _journal
+    if _journal is None:
+        _journal = OperationJournal()
+    return _journal
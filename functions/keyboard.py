@@ -1,11 +1,22 @@
 """
 Keyboard input handling
 """
+import time
 import msvcrt
 
 
-def get_key():
-    """Fungsi untuk menangkap input keyboard"""
+def get_key(timeout=None):
+    """
+    Fungsi untuk menangkap input keyboard.
+    timeout (detik): return None jika tidak ada key, None = tunggu terus
+    """
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.02)
+    
     key = msvcrt.getch()
     
     # Arrow keys di Windows return 2 bytes
@@ -25,6 +36,14 @@ def get_key():
             return 'PAGE_UP'
         elif key == b'Q':  # Page Down
             return 'PAGE_DOWN'
+    elif key == b'\x00':  # Function keys
+        key = msvcrt.getch()
+        if key == b'?':    # F5: Copy ke pane lain
+            return 'F5'
+        elif key == b'@':  # F6: Move ke pane lain
+            return 'F6'
+    elif key == b'\t':     # Tab: pindah pane (dual pane)
+        return 'TAB'
     elif key == b'\r':     # Enter
         return 'ENTER'
     elif key == b'\x08':   # Backspace
@@ -57,6 +76,36 @@ def get_key():
         return 'EXTRACT'
     elif key == b'l' or key == b'L':  # Layout/Column menu
         return 'LAYOUT'
+    elif key == b'g' or key == b'G':  # Hitung ukuran folder
+        return 'DIR_SIZES'
+    elif key == b'u' or key == b'U':  # Disk usage analyzer
+        return 'ANALYZE'
+    elif key == b'\x04':  # Ctrl+D: Duplicate finder
+        return 'DUPLICATES'
+    elif key == b'\x14':  # Ctrl+T: Tail / follow file log
+        return 'TAIL'
+    elif key == b'\x0b':  # Ctrl+K: Checksum manifest / verify
+        return 'CHECKSUM'
+    elif key == b'\x13':  # Ctrl+S: Sync clipboard ke folder aktif
+        return 'SYNC'
+    elif key == b'\x1a':  # Ctrl+Z: Undo
+        return 'UNDO'
+    elif key == b'\x19':  # Ctrl+Y: Redo
+        return 'REDO'
+    elif key == b'p' or key == b'P':  # Preview pane on/off
+        return 'PREVIEW'
+    elif key == b'o' or key == b'O':  # Dual pane on/off
+        return 'DUAL_PANE'
+    elif key == b'b' or key == b'B':  # Bookmark folder aktif
+        return 'BOOKMARK'
+    elif key == b'\x02':  # Ctrl+B: Daftar bookmark
+        return 'BOOKMARKS'
+    elif key == b'`':  # Toggle overlay metrics
+        return 'METRICS'
+    elif key in (b'+', b'='):  # I/O limit lebih longgar
+        return 'THROTTLE_UP'
+    elif key == b'-':  # I/O limit lebih ketat
+        return 'THROTTLE_DOWN'
     elif key == b'q' or key == b'Q':  # Quit
         return 'QUIT'
     elif key == b'\x1b':   # ESC
@@ -65,6 +114,10 @@ def get_key():
         return 'SPACE'
     elif key == b'a' or key == b'A':  # Select all
         return 'SELECT_ALL'
+    elif key == b'm' or key == b'M':  # Select range (anchor sampai cursor)
+        return 'SELECT_RANGE'
+    elif key == b'i' or key == b'I':  # Invert selection
+        return 'INVERT_SELECTION'
     elif key == b'1':      # Sort shortcuts
         return 'SORT_NAME'
     elif key == b'2':
@@ -0,0 +1,528 @@
+"""
+Columnar listing model (optional NumPy backend)
+"""
+import os
+import re
+import math
+import stat as stat_module
+from pathlib import Path
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy tidak wajib, fallback ke list of tuples
+    np = None
+
+from .file_system import format_size, get_file_info, scan_directory
+from .metrics import timed
+from .mounts import is_remote_path
+from .throttle import get_throttle
+
+
+def has_numpy():
+    """Check apakah backend NumPy tersedia"""
+    return np is not None
+
+
+def get_extension(name):
+    """Ambil extension (lowercase) dengan aturan yang sama seperti Path.suffix"""
+    idx = name.rfind('.')
+    if 0 < idx < len(name) - 1:
+        return name[idx:].lower()
+    return ""
+
+
+class ColumnarListing:
+    """
+    Listing directory yang disimpan per kolom (names, sizes, mtimes, is_dir, ext_ids).
+
+    Bertingkah seperti list of (name, is_dir, size, modified, full_path) sehingga
+    sisa aplikasi tidak perlu tahu bedanya, tapi tuple hanya dibuat untuk row
+    yang benar-benar diakses (halaman yang sedang terlihat).
+    Sort/filter/search menghasilkan view baru yang berbagi kolom yang sama.
+    """
+
+    def __init__(self, base_path, parent_path, columns, order):
+        self.base_path = base_path
+        self.parent_path = parent_path
+        self._cols = columns
+        self.order = order
+
+    @classmethod
+    def from_entries(cls, base_path, parent_path, names, is_dir, sizes, mtimes):
+        """Buat listing dari kolom mentah hasil scan"""
+        lower = [name.lower() for name in names]
+        exts = [get_extension(name) for name in names]
+
+        # Extension id mengikuti urutan alfabet supaya sort by type cukup pakai id
+        extensions = sorted(set(exts) | {""})
+        ext_index = {ext: i for i, ext in enumerate(extensions)}
+
+        count = len(names)
+        is_dir_arr = np.array(is_dir, dtype=bool)
+        ext_ids = np.fromiter((ext_index[ext] for ext in exts), dtype=np.int32, count=count)
+        # Folder selalu masuk bucket extension "" (sama seperti sort_items)
+        ext_ids[is_dir_arr] = ext_index[""]
+
+        # Rank nama (case-insensitive) dihitung sekali per scan
+        name_order = np.array(sorted(range(count), key=lower.__getitem__), dtype=np.intp)
+        name_rank = np.empty(count, dtype=np.int64)
+        name_rank[name_order] = np.arange(count)
+
+        columns = {
+            'names': names,
+            'lower': lower,
+            'is_dir': is_dir_arr,
+            'sizes': np.array(sizes, dtype=np.int64),
+            'mtimes': np.array(mtimes, dtype=np.float64),
+            'ext_ids': ext_ids,
+            'extensions': extensions,
+            'ext_index': ext_index,
+            'name_rank': name_rank,
+            'dir_state': np.zeros(count, dtype=np.int8),  # 0 = size belum ada, 1 = partial, 2 = selesai
+            'row_index': None,
+            'blob': None,
+        }
+        return cls(base_path, parent_path, columns, np.arange(count, dtype=np.intp))
+
+    def _view(self, order, keep_parent=True):
+        """Buat view baru dengan urutan row berbeda"""
+        parent = self.parent_path if keep_parent else None
+        return ColumnarListing(self.base_path, parent, self._cols, order)
+
+    # --- Sequence protocol -------------------------------------------------
+
+    def __len__(self):
+        return len(self.order) + (1 if self.parent_path is not None else 0)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            return [self[idx] for idx in range(start, stop, step)]
+
+        total = len(self)
+        if key < 0:
+            key += total
+        if key < 0 or key >= total:
+            raise IndexError("listing index out of range")
+
+        if self.parent_path is not None:
+            if key == 0:
+                return ("..", True, "", "", self.parent_path)
+            key -= 1
+
+        return self._make_row(int(self.order[key]))
+
+    def _make_row(self, row):
+        """Ubah satu row kolom menjadi tuple display"""
+        cols = self._cols
+        name = cols['names'][row]
+        full_path = os.path.join(self.base_path, name)
+
+        if cols['is_dir'][row]:
+            state = cols['dir_state'][row]
+            if state == 0:
+                return (name, True, "", "", full_path)
+            size = format_size(int(cols['sizes'][row])) + ("+" if state == 1 else "")
+            return (name, True, size, "", full_path)
+
+        size_bytes = int(cols['sizes'][row])
+        size = format_size(size_bytes) if size_bytes >= 0 else "N/A"
+        mtime = cols['mtimes'][row]
+        if math.isnan(mtime):
+            modified = "N/A"
+        else:
+            modified = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+        return (name, False, size, modified, full_path)
+
+    # --- Folder sizes -----------------------------------------------------
+
+    def dir_paths(self):
+        """Full path semua folder di view ini"""
+        cols = self._cols
+        rows = self.order[cols['is_dir'][self.order]]
+        names = cols['names']
+        return [os.path.join(self.base_path, names[row]) for row in rows]
+
+    # --- Selection helpers ------------------------------------------------
+
+    def paths(self):
+        """Full path semua item di view ini (tanpa ".."), sesuai urutan view"""
+        names = self._cols['names']
+        return [os.path.join(self.base_path, names[row]) for row in self.order.tolist()]
+
+    def names(self):
+        """Nama semua item di view ini (tanpa "..")"""
+        names = self._cols['names']
+        return [names[row] for row in self.order.tolist()]
+
+    def index_of(self, path):
+        """Index item dengan full path `path` di view ini, atau None"""
+        if self.parent_path is not None and path == self.parent_path:
+            return 0
+        if os.path.dirname(path) != self.base_path:
+            return None
+
+        cols = self._cols
+        if cols['row_index'] is None:
+            cols['row_index'] = {name: row for row, name in enumerate(cols['names'])}
+        row = cols['row_index'].get(os.path.basename(path))
+        if row is None:
+            return None
+        positions = np.nonzero(self.order == row)[0]
+        if len(positions) == 0:
+            return None
+        return int(positions[0]) + (1 if self.parent_path is not None else 0)
+
+    def set_dir_sizes(self, updates):
+        """Update ukuran folder: updates = {full_path: (bytes, complete)}"""
+        cols = self._cols
+        if cols['row_index'] is None:
+            cols['row_index'] = {name: row for row, name in enumerate(cols['names'])}
+
+        for path, (total, complete) in updates.items():
+            if os.path.dirname(path) != self.base_path:
+                continue
+            row = cols['row_index'].get(os.path.basename(path))
+            if row is None or not cols['is_dir'][row]:
+                continue
+            cols['sizes'][row] = total
+            cols['dir_state'][row] = 2 if complete else 1
+
+    # --- Incremental update -----------------------------------------------
+
+    def with_changes(self, changes):
+        """
+        Listing baru setelah perubahan dari watcher (dict name -> action).
+        Hanya entry yang berubah yang di-stat ulang, sisanya diambil dari kolom lama.
+        Ukuran folder yang sudah dihitung tetap dipertahankan.
+        """
+        cols = self._cols
+        count = len(cols['names'])
+        keep = np.ones(count, dtype=bool)
+        if cols['row_index'] is None:
+            cols['row_index'] = {name: row for row, name in enumerate(cols['names'])}
+        for name in changes:
+            row = cols['row_index'].get(name)
+            if row is not None:
+                keep[row] = False
+
+        kept_rows = np.nonzero(keep)[0]
+        names = [cols['names'][row] for row in kept_rows]
+        is_dir = cols['is_dir'][kept_rows].tolist()
+        sizes = cols['sizes'][kept_rows].tolist()
+        mtimes = cols['mtimes'][kept_rows].tolist()
+        dir_state = cols['dir_state'][kept_rows]
+
+        # Stat semua entry yang berubah sekaligus (paralel di network file system)
+        from .async_io import stat_paths
+        changed = [name for name, action in changes.items() if action != 'removed']
+        stats = stat_paths([os.path.join(self.base_path, name) for name in changed])
+        for name, stat in zip(changed, stats):
+            if stat is None:
+                continue
+            entry_is_dir = stat_module.S_ISDIR(stat.st_mode)
+            names.append(name)
+            is_dir.append(entry_is_dir)
+            sizes.append(-1 if entry_is_dir else stat.st_size)
+            mtimes.append(math.nan if entry_is_dir else stat.st_mtime)
+
+        listing = ColumnarListing.from_entries(self.base_path, self.parent_path, names, is_dir, sizes, mtimes)
+        listing._cols['dir_state'][:len(dir_state)] = dir_state
+        return listing
+
+    # --- Sort / filter / search -------------------------------------------
+
+    def sorted_by(self, sort_mode="name", reverse=False):
+        """Sort dengan np.lexsort (key terakhir = key utama)"""
+        cols = self._cols
+        rows = self.order
+        is_dir = cols['is_dir'][rows]
+        rank = cols['name_rank'][rows]
+
+        if sort_mode == "size":
+            # Folder yang belum dihitung ukurannya -1 (paling depan), file tanpa size dianggap 0
+            unknown = is_dir & (cols['dir_state'][rows] == 0)
+            primary = np.where(unknown, -1, np.maximum(cols['sizes'][rows], 0))
+        elif sort_mode == "date":
+            # Folder & file tanpa mtime selalu di depan, arah sort apapun
+            edge = np.inf if reverse else -np.inf
+            mtimes = cols['mtimes'][rows]
+            primary = np.where(is_dir | np.isnan(mtimes), edge, mtimes)
+        elif sort_mode == "type":
+            primary = cols['ext_ids'][rows]
+        else:
+            primary = ~is_dir
+
+        idx = np.lexsort((rank, primary))
+        if reverse:
+            idx = idx[::-1]
+        return self._view(rows[idx])
+
+    def filtered_by_extension(self, extension):
+        """Filter dengan boolean mask (folders selalu ikut)"""
+        if not extension:
+            return self
+
+        cols = self._cols
+        rows = self.order
+        ext = "." + extension.lower().lstrip('.')
+
+        if ext.count('.') == 1:
+            ext_id = cols['ext_index'].get(ext, -1)
+            mask = cols['ext_ids'][rows] == ext_id
+        else:
+            # Extension bertingkat (mis. tar.gz) tidak punya id sendiri
+            lower = cols['lower']
+            mask = np.fromiter((lower[row].endswith(ext) for row in rows), dtype=bool, count=len(rows))
+
+        mask |= cols['is_dir'][rows]
+        return self._view(rows[mask])
+
+    def searched(self, query):
+        """Search substring di semua nama sekaligus (satu pass di atas blob)"""
+        if not query:
+            return self
+
+        cols = self._cols
+        if cols['blob'] is None:
+            # Semua nama digabung dengan separator \0, offsets = posisi awal tiap nama
+            lengths = np.fromiter((len(name) + 1 for name in cols['lower']), dtype=np.int64, count=len(cols['lower']))
+            offsets = np.zeros(len(lengths), dtype=np.int64)
+            if len(lengths):
+                np.cumsum(lengths[:-1], out=offsets[1:])
+            cols['blob'] = ("\0".join(cols['lower']), offsets)
+
+        blob, offsets = cols['blob']
+        hit = np.zeros(len(offsets), dtype=bool)
+        positions = [m.start() for m in re.finditer(re.escape(query.lower().replace("\0", "")), blob)]
+        if positions:
+            hit[np.searchsorted(offsets, positions, side='right') - 1] = True
+
+        rows = self.order
+        return self._view(rows[hit[rows]])
+
+
+def scan_error_row(error):
+    """Baris listing untuk folder yang gagal di-scan (sama seperti scan_directory)"""
+    if isinstance(error, PermissionError):
+        return [("Permission Denied", False, "", "", "")]
+    return [(f"Error: {str(error)}", False, "", "", "")]
+
+
+def build_listing(path, rows):
+    """
+    Listing dari rows (name, is_dir, size, mtime) hasil scan lain (mis. AsyncFS.scan),
+    sorted by name seperti scan_listing. Tanpa NumPy: list of tuple seperti scan_directory.
+    """
+    path_obj = Path(path)
+    base_path = str(path_obj)
+    parent_path = str(path_obj.parent) if path_obj.parent != path_obj else None
+
+    if np is not None:
+        names = [row[0] for row in rows]
+        is_dir = [row[1] for row in rows]
+        sizes = [row[2] for row in rows]
+        mtimes = [row[3] for row in rows]
+        return ColumnarListing.from_entries(base_path, parent_path, names, is_dir, sizes, mtimes).sorted_by("name")
+
+    items = []
+    for name, entry_is_dir, size, mtime in rows:
+        full_path = os.path.join(base_path, name)
+        if entry_is_dir:
+            items.append((name, True, "", "", full_path))
+        else:
+            modified = "N/A" if math.isnan(mtime) else datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            items.append((name, False, format_size(size) if size >= 0 else "N/A", modified, full_path))
+    items.sort(key=lambda item: (not item[1], item[0].lower()))
+    if parent_path is not None:
+        items.insert(0, ("..", True, "", "", parent_path))
+    return items
+
+
+@timed(entries=True)
+def scan_listing(path):
+    """
+    Scan directory ke ColumnarListing (os.scandir, tanpa format string per item).
+    Di network file system (SMB / NFS) stat per file jalan paralel lewat AsyncFS.
+    Tanpa NumPy, fallback ke scan_directory biasa.
+    Selama scan, job background (copy / move antar pane) menahan I/O-nya.
+    """
+    with get_throttle().foreground():
+        return _scan_listing(path)
+
+
+def _scan_listing(path):
+    if is_remote_path(path):
+        from .async_io import get_async_fs, scan_listing_async
+        return get_async_fs().run(scan_listing_async(path))
+    if np is None:
+        return scan_directory(path)
+
+    names = []
+    is_dir = []
+    sizes = []
+    mtimes = []
+
+    try:
+        path_obj = Path(path)
+        base_path = str(path_obj)
+        parent_path = str(path_obj.parent) if path_obj.parent != path_obj else None
+
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                try:
+                    entry_is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                size = -1
+                mtime = math.nan
+                if not entry_is_dir:
+                    try:
+                        stat = entry.stat()
+                        size = stat.st_size
+                        mtime = stat.st_mtime
+                    except OSError:
+                        pass
+
+                names.append(entry.name)
+                is_dir.append(entry_is_dir)
+                sizes.append(size)
+                mtimes.append(mtime)
+    except Exception as e:
+        return scan_error_row(e)
+
+    listing = ColumnarListing.from_entries(base_path, parent_path, names, is_dir, sizes, mtimes)
+    return listing.sorted_by("name")
+
+
+def listing_names(items):
+    """Nama item di listing (tanpa ".."), untuk NameResolver tanpa scan ulang"""
+    if hasattr(items, 'names'):
+        return items.names()
+    return [item[0] for item in items if item[0] != ".." and item[4]]
+
+
+class ListingCache:
+    """
+    Listing per folder yang dipakai bersama beberapa session (mis. dua pane).
+    Folder yang sama hanya di-scan sekali; session men-sort view-nya sendiri
+    dari listing yang sama. Entry paling lama tidak dipakai dibuang duluan.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._listings = {}
+
+    def get(self, path):
+        items = self._listings.pop(path, None)
+        if items is not None:
+            self._listings[path] = items
+        return items
+
+    def put(self, path, items):
+        self._listings.pop(path, None)
+        self._listings[path] = items
+        while len(self._listings) > self.max_entries:
+            del self._listings[next(iter(self._listings))]
+
+    def invalidate(self, path):
+        self._listings.pop(path, None)
+
+    def scan(self, path, fresh=False):
+        """Listing dari cache, atau scan (dan simpan) jika belum ada / fresh=True"""
+        items = None if fresh else self.get(path)
+        if items is None:
+            items = scan_listing(path)
+            self.put(path, items)
+        return items
+
+
+def snapshot_listing(items):
+    """
+    Data listing yang bisa disimpan ke JSON (untuk warm start), None jika items
+    bukan listing folder (error / hasil search).
+    Columnar: kolom mentah per entry, ukuran folder tidak disimpan (bisa basi).
+    List of tuple: row yang sudah diformat, tanpa full path.
+    """
+    if isinstance(items, ColumnarListing):
+        cols = items._cols
+        rows = [int(row) for row in items.order]
+        is_dir = cols['is_dir'][rows].tolist()
+        return {
+            'names': [cols['names'][row] for row in rows],
+            'is_dir': is_dir,
+            'sizes': [-1 if entry_is_dir else size for entry_is_dir, size in zip(is_dir, cols['sizes'][rows].tolist())],
+            'mtimes': [None if math.isnan(mtime) else mtime for mtime in cols['mtimes'][rows].tolist()],
+        }
+
+    if any(not item[4] for item in items):
+        return None  # Baris "Permission Denied" / "Error: ..."
+    return {'rows': [list(item[:4]) for item in items if item[0] != ".."]}
+
+
+def restore_listing(path, snapshot):
+    """Bangun listing dari hasil snapshot_listing (sorted by name seperti scan_listing)"""
+    path_obj = Path(path)
+    base_path = str(path_obj)
+    parent_path = str(path_obj.parent) if path_obj.parent != path_obj else None
+
+    if 'names' in snapshot:
+        mtimes = [math.nan if mtime is None else mtime for mtime in snapshot['mtimes']]
+        if np is not None:
+            listing = ColumnarListing.from_entries(base_path, parent_path, snapshot['names'], snapshot['is_dir'],
+                                                   snapshot['sizes'], mtimes)
+            return listing.sorted_by("name")
+        rows = []
+        for name, entry_is_dir, size, mtime in zip(snapshot['names'], snapshot['is_dir'], snapshot['sizes'], mtimes):
+            if entry_is_dir:
+                rows.append((name, True, "", ""))
+            else:
+                modified = "N/A" if math.isnan(mtime) else datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+                rows.append((name, False, format_size(size) if size >= 0 else "N/A", modified))
+    else:
+        rows = [tuple(row) for row in snapshot['rows']]
+
+    items = [(name, entry_is_dir, size, modified, os.path.join(base_path, name))
+             for name, entry_is_dir, size, modified in rows]
+    items.sort(key=lambda item: (not item[1], item[0].lower()))
+    if parent_path is not None:
+        items.insert(0, ("..", True, "", "", parent_path))
+    return items
+
+
+def apply_listing_changes(items, changes, base_path):
+    """
+    Terapkan perubahan watcher (dict name -> action) ke listing.
+    Return listing baru (belum di-sort), atau hasil scan ulang jika changes None.
+    """
+    if changes is None:
+        return scan_listing(base_path)
+    if not changes:
+        return items
+
+    if isinstance(items, ColumnarListing):
+        return items.with_changes(changes)
+
+    result = [item for item in items if item[0] == ".." or item[0] not in changes]
+    for name, action in changes.items():
+        if action == 'removed':
+            continue
+        path = Path(base_path) / name
+        try:
+            if path.is_dir():
+                result.append((name, True, "", "", str(path)))
+            elif path.exists():
+                size, modified = get_file_info(path)
+                result.append((name, False, size, modified, str(path)))
+        except OSError:
+            continue
+    return result
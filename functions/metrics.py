@@ -0,0 +1,235 @@
+"""
+Metrics ringan: timer per operasi, hitungan I/O call, overlay & export JSON lines
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+from collections import deque
+
+
+ENV_VAR = "FILE_EXPLORER_METRICS"            # "1" = aktif sejak start
+EXPORT_ENV_VAR = "FILE_EXPLORER_METRICS_FILE"
+MAX_SAMPLES = 1000                            # Sample per operasi untuk avg / p95
+EXPORT_BATCH = 200
+
+# Audit event (PEP 578) yang dihitung sebagai I/O call
+IO_EVENTS = frozenset({
+    "open", "os.scandir", "os.listdir", "os.rename", "os.remove", "os.rmdir", "os.mkdir",
+    "os.truncate", "os.utime", "os.chmod", "shutil.copyfile", "shutil.copytree",
+    "shutil.rmtree", "shutil.move",
+})
+
+
+class OperationStats:
+    """Statistik satu operasi"""
+
+    __slots__ = ('count', 'total', 'samples', 'last', 'entries', 'calls', 'bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.last = 0.0
+        self.entries = 0
+        self.calls = 0
+        self.bytes = 0
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    @property
+    def entries_per_second(self):
+        return self.entries / self.total if self.total > 0 else 0.0
+
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+_pending = []
+_hook_installed = False
+_original_stdout = None
+
+
+class _CountingStream:
+    """Wrapper stdout yang menghitung bytes yang ditulis ke terminal"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, data):
+        _add_counter('bytes', len(data.encode('utf-8', 'replace')))
+        return self._stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _current_stats():
+    """Stats operasi yang sedang berjalan di thread ini (paling dalam)"""
+    stack = getattr(_local, 'stack', None)
+    name = stack[-1] if stack else "(idle)"
+    stats = _stats.get(name)
+    if stats is None:
+        with _lock:
+            stats = _stats.setdefault(name, OperationStats())
+    return stats
+
+
+def _add_counter(field, amount):
+    if _enabled:
+        stats = _current_stats()
+        setattr(stats, field, getattr(stats, field) + amount)
+
+
+def _audit_hook(event, args):
+    # Audit hook tidak bisa dilepas, jadi saat nonaktif cukup satu cek flag
+    if _enabled and event in IO_EVENTS:
+        _add_counter('calls', 1)
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(flag):
+    """Aktif/nonaktifkan metrics (stdout counter & audit hook dipasang saat aktif)"""
+    global _enabled, _hook_installed, _original_stdout
+    _enabled = bool(flag)
+
+    if _enabled:
+        if not _hook_installed:
+            sys.addaudithook(_audit_hook)
+            _hook_installed = True
+        if _original_stdout is None:
+            _original_stdout = sys.stdout
+            sys.stdout = _CountingStream(sys.stdout)
+    else:
+        if _original_stdout is not None:
+            sys.stdout = _original_stdout
+            _original_stdout = None
+        flush_export()
+    return _enabled
+
+
+def toggle():
+    return set_enabled(not _enabled)
+
+
+def record(name, seconds, entries=0):
+    """Catat satu sample (dipanggil oleh @timed, bisa juga manual)"""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = OperationStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.last = seconds
+        stats.samples.append(seconds)
+        stats.entries += entries
+        _pending.append({'ts': round(time.time(), 3), 'op': name,
+                         'ms': round(seconds * 1000, 3), 'entries': entries})
+        should_flush = len(_pending) >= EXPORT_BATCH
+    if should_flush:
+        flush_export()
+
+
+def timed(func=None, entries=False):
+    """
+    Decorator timer. entries=True: len(result) dicatat sebagai jumlah entry
+    (untuk entries/sec). Saat metrics nonaktif overhead-nya hanya satu cek flag.
+    """
+    def decorate(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            stack = getattr(_local, 'stack', None)
+            if stack is None:
+                stack = _local.stack = []
+            stack.append(name)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+            count = 0
+            if entries:
+                try:
+                    count = len(result)
+                except TypeError:
+                    pass
+            record(name, elapsed, count)
+            return result
+
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+def snapshot():
+    """Copy statistik semua operasi: dict name -> OperationStats"""
+    with _lock:
+        return dict(_stats)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def format_overlay(width=80):
+    """Baris-baris overlay statistik (untuk ditampilkan di bawah listing)"""
+    stats = snapshot()
+    lines = [" 📊 Metrics (` to hide)".ljust(width)[:width],
+             f" {'operation':<18}{'n':>6}{'last ms':>9}{'avg ms':>9}{'p95 ms':>9}{'entries/s':>11}{'io':>7}{'term KB':>9}"[:width]]
+    for name, item in sorted(stats.items(), key=lambda pair: -pair[1].total):
+        lines.append(
+            f" {name[:17]:<18}{item.count:>6}{item.last * 1000:>9.2f}{item.average * 1000:>9.2f}"
+            f"{item.p95 * 1000:>9.2f}{item.entries_per_second:>11.0f}{item.calls:>7}{item.bytes / 1024:>9.1f}"[:width])
+    return lines
+
+
+def get_export_path():
+    if os.environ.get(EXPORT_ENV_VAR):
+        return os.environ[EXPORT_ENV_VAR]
+    from .file_system import get_app_dir
+    return os.path.join(get_app_dir(), "metrics.jsonl")
+
+
+def flush_export():
+    """Tulis sample yang tertunda ke file JSON lines"""
+    global _pending
+    with _lock:
+        pending = _pending
+        _pending = []
+    if not pending:
+        return
+    try:
+        with open(get_export_path(), 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(sample) + "\n" for sample in pending))
+    except OSError:
+        pass
+
+
+atexit.register(flush_export)
+if _enabled:
+    set_enabled(True)
@@ -0,0 +1,72 @@
+"""
+Mount / drive tempat sebuah path berada, dan deteksi network file system (SMB / NFS)
+"""
+import os
+
+
+REMOTE_FS_TYPES = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'afs', 'ceph', 'glusterfs',
+    'fuse.sshfs', 'fuse.rclone', 'davfs', 'fuse.davfs2',
+}
+DRIVE_REMOTE = 4  # GetDriveTypeW: mapped network drive
+
+_mount_table = None
+_drive_types = {}  # Windows: drive -> 'remote' / 'local'
+
+
+def _unescape_mount(field):
+    # /proc/mounts menulis spasi / tab / backslash di path sebagai \040 \011 \134
+    return field.replace("\\040", " ").replace("\\011", "\t").replace("\\134", "\\")
+
+
+def mount_table():
+    """List of (mount_point, fs_type), mount point terpanjang duluan (dibaca sekali per proses)"""
+    global _mount_table
+    if _mount_table is None:
+        table = []
+        try:
+            with open("/proc/mounts", 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3:
+                        table.append((_unescape_mount(fields[1]), fields[2]))
+        except OSError:
+            pass
+        table.sort(key=lambda mount: len(mount[0]), reverse=True)
+        _mount_table = table
+    return _mount_table
+
+
+def find_mount(path):
+    """
+    (mount_point, fs_type) untuk path. Windows: drive / share UNC sebagai
+    mount point, fs_type 'remote' untuk network drive atau 'local'.
+    """
+    path = os.path.abspath(path)
+    if os.name == 'nt':
+        drive = os.path.splitdrive(path)[0]
+        if drive.startswith("\\\\"):
+            return drive, 'remote'
+        fs_type = _drive_types.get(drive.upper())
+        if fs_type is None:
+            import ctypes
+            remote = ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+            fs_type = _drive_types[drive.upper()] = 'remote' if remote else 'local'
+        return drive, fs_type
+
+    for mount_point, fs_type in mount_table():
+        if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+            return mount_point, fs_type
+    return '/', 'unknown'
+
+
+def is_remote_path(path):
+    """
+    True jika path ada di network file system (share UNC, mapped drive, NFS / SMB mount).
+    Bisa dipaksa lewat env FILE_EXPLORER_ASYNC_IO (1 = selalu, 0 = tidak pernah).
+    """
+    forced = os.environ.get("FILE_EXPLORER_ASYNC_IO", "").strip()
+    if forced in ("0", "1"):
+        return forced == "1"
+    _, fs_type = find_mount(path)
+    return fs_type == 'remote' or fs_type in REMOTE_FS_TYPES
@@ -0,0 +1,229 @@
+"""
+Preview file (text / hex / isi archive / isi folder) dengan read terbatas, mmap dan LRU cache
+"""
+import os
+import mmap
+import codecs
+import threading
+from collections import OrderedDict
+from .file_system import format_size
+
+
+MAX_PREVIEW_BYTES = 64 * 1024  # Maksimal byte yang dibaca per preview
+MAX_LINES = 200
+HEX_WIDTH = 16                 # Byte per baris hex dump
+MAX_HEX_BYTES = 4096
+MAX_LIST_ENTRIES = 200         # Entry archive / folder yang ditampilkan
+CACHE_SIZE = 128               # Jumlah preview di LRU cache
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+
+class Preview:
+    """Hasil preview: kind = text / hex / archive / folder / empty / error, lines = baris siap tampil"""
+
+    __slots__ = ('path', 'kind', 'title', 'lines', 'truncated')
+
+    def __init__(self, path, kind, title, lines, truncated=False):
+        self.path = path
+        self.kind = kind
+        self.title = title
+        self.lines = lines
+        self.truncated = truncated
+
+
+def read_head(path, size, limit=MAX_PREVIEW_BYTES):
+    """Baca maksimal `limit` byte pertama lewat mmap (tanpa copy seluruh file ke memori)"""
+    if size == 0:
+        return b""
+    with open(path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:limit]
+        except (OSError, ValueError):
+            # File khusus (pipe, device, file yang berubah ukuran) tidak bisa di-mmap
+            return f.read(limit)
+
+
+def sniff_encoding(data):
+    """
+    Tebak encoding dari sample: BOM, lalu UTF-8, lalu cp1252.
+    Return (encoding, data tanpa BOM), encoding None berarti binary.
+    """
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding, data[len(bom):]
+
+    if b"\x00" in data:
+        return None, data
+
+    # Decoder incremental: karakter multi-byte yang terpotong di akhir sample bukan error
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+        return 'utf-8', data
+    except UnicodeDecodeError:
+        pass
+
+    control = sum(1 for byte in data if byte < 32 and byte not in (9, 10, 12, 13, 27))
+    if control <= len(data) // 100:
+        return 'cp1252', data
+    return None, data
+
+
+def text_lines(data, encoding, max_lines=MAX_LINES):
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(data, final=False)
+    lines = text.splitlines()[:max_lines]
+    return [line.expandtabs(4) for line in lines]
+
+
+def hex_lines(data, max_bytes=MAX_HEX_BYTES):
+    """Hex dump: offset, 16 byte hex, kolom ASCII"""
+    lines = []
+    for offset in range(0, min(len(data), max_bytes), HEX_WIDTH):
+        chunk = data[offset:offset + HEX_WIDTH]
+        hex_part = " ".join(f"{byte:02x}" for byte in chunk)
+        ascii_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset:08x}  {hex_part:<{HEX_WIDTH * 3 - 1}}  |{ascii_part}|")
+    return lines
+
+
+def build_preview(path, max_lines=MAX_LINES):
+    """Buat Preview untuk path (blocking, dipanggil dari worker PreviewEngine)"""
+    name = os.path.basename(path) or path
+    try:
+        if os.path.isdir(path):
+            entries = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    if len(entries) >= MAX_LIST_ENTRIES:
+                        break
+                    entries.append(entry.name + (os.sep if entry.is_dir() else ""))
+            entries.sort(key=lambda entry: (not entry.endswith(os.sep), entry.lower()))
+            truncated = len(entries) >= MAX_LIST_ENTRIES
+            return Preview(path, 'folder', f"{name}{os.sep}  ({len(entries)}{'+' if truncated else ''} items)", entries, truncated)
+
+        size = os.path.getsize(path)
+        if size == 0:
+            return Preview(path, 'empty', f"{name}  (empty)", [])
+
+        from .compression import is_archive
+        if is_archive(name):
+            from .compression import list_archive
+            listing = list_archive(path, MAX_LIST_ENTRIES)
+            if listing is not None:
+                entries, total = listing
+                lines = [f"{format_size(entry_size) if not is_dir else '<DIR>':>10}  {entry_name}"
+                         for entry_name, entry_size, is_dir in entries]
+                count = f"{total} entries" if total is not None else f"{len(entries)}+ entries"
+                return Preview(path, 'archive', f"{name}  ({format_size(size)}, {count})", lines,
+                               total is None or total > len(entries))
+
+        data = read_head(path, size)
+        truncated = size > len(data)
+        encoding, data = sniff_encoding(data)
+        if encoding is None:
+            return Preview(path, 'hex', f"{name}  ({format_size(size)}, binary)", hex_lines(data), size > MAX_HEX_BYTES)
+        lines = text_lines(data, encoding, max_lines)
+        return Preview(path, 'text', f"{name}  ({format_size(size)}, {encoding})", lines, truncated or len(lines) >= max_lines)
+    except Exception as e:
+        return Preview(path, 'error', name, [f"Cannot preview: {e}"])
+
+
+def _cache_key(path):
+    """(path, mtime, size): preview otomatis basi jika file berubah"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+class PreviewEngine:
+    """
+    Preview async dengan LRU cache.
+    Hanya request terakhir yang dikerjakan: scroll cepat melewati 1000 file
+    tidak mengantri 1000 job, request lama dibuang sebelum sempat dibaca.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE, max_lines=MAX_LINES):
+        self.cache_size = cache_size
+        self.max_lines = max_lines
+        self._cache = OrderedDict()  # (path, mtime, size) -> Preview
+        self._lock = threading.Lock()
+        self._wanted = None          # (generation, path, key) yang harus dikerjakan worker
+        self._generation = 0
+        self._result = None          # Preview terbaru yang belum di-poll
+        self._thread = None
+
+    def _cached(self, key):
+        with self._lock:
+            preview = self._cache.get(key)
+            if preview is not None:
+                self._cache.move_to_end(key)
+            return preview
+
+    def _store(self, key, preview):
+        with self._lock:
+            self._cache[key] = preview
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def request(self, path):
+        """
+        Minta preview untuk path. Return Preview langsung jika ada di cache,
+        kalau tidak None (hasil menyusul lewat poll()).
+        """
+        key = _cache_key(path)
+        with self._lock:
+            self._generation += 1  # Request lama otomatis basi
+            self._result = None
+        if key is not None:
+            preview = self._cached(key)
+            if preview is not None:
+                return preview
+
+        with self._lock:
+            self._wanted = (self._generation, path, key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+        return None
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+            self._wanted = None
+            self._result = None
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                wanted = self._wanted
+                self._wanted = None
+                if wanted is None:
+                    self._thread = None
+                    return
+            generation, path, key = wanted
+            preview = build_preview(path, self.max_lines)
+            if key is not None:
+                self._store(key, preview)
+            with self._lock:
+                if generation == self._generation:
+                    self._result = preview
+
+    def is_busy(self):
+        with self._lock:
+            return self._wanted is not None or self._result is not None or (
+                self._thread is not None and self._thread.is_alive())
+
+    def poll(self):
+        """Preview untuk request terakhir jika sudah selesai (sekali saja), selain itu None"""
+        with self._lock:
+            result = self._result
+            self._result = None
+            return result
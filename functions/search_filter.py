@@ -1,16 +1,21 @@
 """
 Search and filter functions
 """
-import msvcrt
 from pathlib import Path
 from .ui import render_ui
+from .listing import ColumnarListing
+from .metrics import timed
 
 
+@timed(entries=True)
 def search_items(items, query):
     """Filter items berdasarkan search query"""
     if not query:
         return items
     
+    if isinstance(items, ColumnarListing):
+        return items.searched(query)
+    
     query_lower = query.lower()
     filtered = []
     
@@ -27,11 +32,15 @@ def search_items(items, query):
     return filtered
 
 
+@timed(entries=True)
 def filter_by_extension(items, extension):
     """Filter items berdasarkan extension"""
     if not extension:
         return items
     
+    if isinstance(items, ColumnarListing):
+        return items.filtered_by_extension(extension)
+    
     ext_lower = extension.lower().lstrip('.')
     filtered = []
     
@@ -48,6 +57,7 @@ def filter_by_extension(items, extension):
 
 def search_mode_input(current_path, all_items, filter_ext):
     """Handle search mode dengan live update"""
+    import msvcrt
     query = ""
     
     # Render awal dengan input box kosong
@@ -87,6 +97,7 @@ def search_mode_input(current_path, all_items, filter_ext):
 
 def filter_mode_input(current_path, all_items, current_filter):
     """Handle filter mode dengan live update"""
+    import msvcrt
     extension = current_filter if current_filter else ""
     
     # Render awal dengan input box
@@ -0,0 +1,114 @@
+"""
+Selection model (berdasarkan path, bukan index list)
+"""
+import os
+
+
+def all_paths(items):
+    """Full path semua item di listing (tanpa "..")"""
+    if hasattr(items, 'paths'):
+        return items.paths()
+    return [item[4] for item in items if item[0] != ".."]
+
+
+def find_index(items, path):
+    """Cari index item berdasarkan path, return None jika tidak ada"""
+    if hasattr(items, 'index_of'):
+        return items.index_of(path)
+    for idx, item in enumerate(items):
+        if item[4] == path:
+            return idx
+    return None
+
+
+class Selection:
+    """
+    Kumpulan item yang di-select, disimpan sebagai set of full path.
+
+    Karena key-nya path, selection tetap benar setelah re-sort, filter,
+    search, atau update incremental dari watcher. Toggle O(1), select all /
+    invert O(n) dengan operasi set (aman untuk jutaan entry).
+    """
+
+    def __init__(self):
+        self._paths = set()
+        self.anchor = None  # Path terakhir yang di-toggle (awal range select)
+        self.version = 0    # Naik setiap kali selection berubah (cache render pane)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __bool__(self):
+        return bool(self._paths)
+
+    def __contains__(self, path):
+        return path in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def toggle(self, path):
+        """Toggle satu path, return True jika sekarang ter-select"""
+        self.version += 1
+        self.anchor = path
+        if path in self._paths:
+            self._paths.discard(path)
+            return False
+        self._paths.add(path)
+        return True
+
+    def update(self, paths):
+        self.version += 1
+        self._paths.update(paths)
+
+    def discard(self, path):
+        self.version += 1
+        self._paths.discard(path)
+
+    def clear(self):
+        self.version += 1
+        self._paths.clear()
+        self.anchor = None
+
+    def paths(self):
+        """List path yang di-select (urutan stabil)"""
+        return sorted(self._paths)
+
+    def select_all(self, items):
+        self.version += 1
+        self._paths.update(all_paths(items))
+
+    def invert(self, items):
+        """Balik selection untuk item di listing ini (selection di luar listing tetap)"""
+        self.version += 1
+        self._paths.symmetric_difference_update(all_paths(items))
+
+    def select_range(self, items, index):
+        """Select semua item dari anchor sampai index (inklusif), return jumlah item"""
+        start = find_index(items, self.anchor) if self.anchor is not None else None
+        if start is None:
+            start = index
+        low, high = min(start, index), max(start, index)
+        paths = [item[4] for item in items[low:high + 1] if item[0] != ".."]
+        self.version += 1
+        self._paths.update(paths)
+        return len(paths)
+
+    def prune(self, removed_paths):
+        """Buang path yang sudah tidak ada (dihapus / dipindah)"""
+        self.version += 1
+        self._paths.difference_update(removed_paths)
+        if self.anchor in removed_paths:
+            self.anchor = None
+
+    def retain(self, folder, items):
+        """
+        Buang path di `folder` yang tidak ada lagi di listing items (setelah
+        delete / undo / rescan). Hanya operasi set, tanpa stat per path.
+        """
+        if not self._paths:
+            return
+        present = set(all_paths(items))
+        removed = {path for path in self._paths if path not in present and os.path.dirname(path) == folder}
+        if removed:
+            self.prune(removed)
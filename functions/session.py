@@ -0,0 +1,565 @@
+"""
+ExplorerSession: state & command API explorer tanpa UI (dipakai TUI dan CLI)
+"""
+import os
+import threading
+from pathlib import Path
+from concurrent.futures import Future
+from .file_system import open_file, change_directory
+from .file_operations import (
+    copy_item, move_item, delete_item, rename_item, create_folder, create_file,
+    copy_multiple_items, move_multiple_items, delete_multiple_items
+)
+from .sorting import sort_items
+from .search_filter import search_items, filter_by_extension
+from .listing import scan_listing, apply_listing_changes, snapshot_listing, restore_listing, listing_names
+from .dir_size import get_dir_size_engine, list_dir_paths, apply_dir_sizes
+from .watcher import DirectoryWatcher
+from .selection import Selection, all_paths
+from .journal import get_journal
+from .collisions import NameResolver
+from .mounts import is_remote_path
+
+
+class ExplorerSession:
+    """
+    Satu sesi explorer: path aktif, listing (all_items & items yang terlihat),
+    sort, filter/search, selection, clipboard, dan job background
+    (ukuran folder, watcher & reconcile warm start).
+
+    Dengan `state` (SessionState), preferensi sort per folder dipakai ulang dan
+    listing awal diambil dari snapshot launch sebelumnya: frame pertama tidak
+    menunggu scan, scan asli berjalan di background lalu menggantikan snapshot.
+
+    Semua command return (success, message) seperti fungsi di file_operations,
+    jadi bisa dipanggil dari TUI, CLI, atau script job runner.
+    """
+
+    def __init__(self, path=None, watch=False, journal=None, state=None, cache=None):
+        self.path = os.path.abspath(path or os.getcwd())
+        self.sort_mode = "name"  # name, size, date, type
+        self.sort_reverse = False
+        self.filter_ext = ""
+        self.search_query = ""
+
+        self.selection = Selection()
+        self.clipboard_items = []
+        self.clipboard_mode = None  # 'copy' atau 'cut'
+
+        self.size_engine = get_dir_size_engine()
+        self.watcher = DirectoryWatcher() if watch else None
+        self.journal = journal or get_journal()
+        self.state = state
+        self.cache = cache  # ListingCache bersama (dual pane), None = selalu scan
+        self._reconcile = None  # (path, future) scan background setelah warm start
+
+        # pinned = items bukan turunan all_items (hasil search / duplicate finder)
+        self.pinned = False
+        # Listing dari cache bersama (pane lain) lebih baru dari snapshot launch sebelumnya
+        cached = cache.get(self.path) if cache is not None else None
+        snapshot = state.get_snapshot(self.path) if state is not None and cached is None else None
+        if snapshot is not None:
+            self.all_items = restore_listing(self.path, snapshot)
+            self._start_reconcile()
+        else:
+            self.all_items = self._scan(self.path)
+        self.items = self.all_items
+        self._apply_prefs()
+        self._apply_view()
+        if self.sort_mode == "size":
+            self.size_engine.start(list_dir_paths(self.all_items))
+        if self.watcher is not None:
+            self.watcher.watch(self.path)
+
+    # --- Listing -----------------------------------------------------------
+
+    def _apply_view(self):
+        """Sort ulang all_items lalu terapkan filter (kecuali items sedang di-pin)"""
+        self.all_items = sort_items(self.all_items, self.sort_mode, self.sort_reverse)
+        if not self.pinned:
+            self.items = filter_by_extension(self.all_items, self.filter_ext) if self.filter_ext else self.all_items
+
+    def _apply_prefs(self):
+        """Pakai sort tersimpan untuk folder aktif (jika ada)"""
+        if self.state is None:
+            return
+        prefs = self.state.get_prefs(self.path)
+        self.sort_mode = prefs.get('sort', self.sort_mode)
+        self.sort_reverse = prefs.get('reverse', self.sort_reverse)
+
+    @property
+    def prefs(self):
+        """Preferensi tersimpan folder aktif (sort, reverse, view, columns)"""
+        return self.state.get_prefs(self.path) if self.state is not None else {}
+
+    def remember_prefs(self, **prefs):
+        """Simpan preferensi tampilan (mis. view, columns) untuk folder aktif"""
+        if self.state is not None:
+            self.state.set_prefs(self.path, **prefs)
+
+    def _remember_listing(self):
+        """Snapshot listing folder aktif untuk warm start launch berikutnya"""
+        if self.state is not None and self._reconcile is None:
+            self.state.save_snapshot(self.path, snapshot_listing(self.all_items))
+
+    def _scan(self, path, fresh=False):
+        """Listing folder, lewat cache bersama jika ada"""
+        if self.cache is None:
+            return scan_listing(path)
+        return self.cache.scan(path, fresh)
+
+    def _start_reconcile(self):
+        """Scan folder aktif di background, hasilnya diambil poll()"""
+        path = self.path
+        if is_remote_path(path):
+            # Network file system: scan di AsyncFS (stat paralel), poll() cukup cek future.done()
+            from .async_io import get_async_fs, scan_listing_async
+            future = get_async_fs().submit(scan_listing_async(path))
+        else:
+            future = Future()
+            threading.Thread(target=lambda: future.set_result(scan_listing(path)), daemon=True).start()
+        self._reconcile = (path, future)
+
+    def refresh(self, fresh=True):
+        """Scan ulang folder aktif (setelah operasi file). fresh=False: pakai cache bersama jika masih ada"""
+        self._reconcile = None  # Scan ini lebih baru dari reconcile yang masih jalan
+        self.all_items = self._scan(self.path, fresh)
+        self.pinned = False
+        self._apply_view()
+        return True, f"Refreshed: {len(self.items)} items"
+
+    def _load(self, path, items):
+        self._remember_listing()
+        self._reconcile = None
+        self.path = path
+        self.all_items = items
+        self.pinned = False
+        self.search_query = ""
+        self.selection.clear()  # Clear selection saat pindah directory
+        self._apply_prefs()
+        self._apply_view()
+        if self.watcher is not None:
+            self.watcher.watch(path)
+        if self.sort_mode == "size":
+            self.size_engine.start(list_dir_paths(self.all_items))
+        else:
+            self.size_engine.cancel()
+
+    def _change_directory(self, path):
+        """
+        change_directory, tapi lewat cache bersama jika ada. Return (path, items, warm):
+        warm=True berarti items dari snapshot (folder di network file system),
+        scan asli menyusul di background.
+        """
+        cached = self.cache.get(path) if self.cache is not None else None
+        if cached is None and self.state is not None and is_remote_path(path):
+            snapshot = self.state.get_snapshot(path)
+            if snapshot is not None and os.path.isdir(path):
+                return path, restore_listing(path, snapshot), True
+        if self.cache is None:
+            return change_directory(path) + (False,)
+        if not os.path.isdir(path):
+            return None, [], False
+        return path, self.cache.scan(path), False
+
+    def _open_directory(self, path):
+        new_path, new_items, warm = self._change_directory(path)
+        if not new_path:
+            return False
+        self._load(new_path, new_items)
+        if warm:
+            self._start_reconcile()
+        return True
+
+    def open(self, path):
+        """Pindah ke folder `path`"""
+        if not self._open_directory(os.path.abspath(path)):
+            return False, f"Cannot access: {path}"
+        return True, f"Opened: {Path(self.path).name}"
+
+    def go_up(self):
+        """Naik ke parent directory"""
+        parent_path = str(Path(self.path).parent)
+        if parent_path == self.path:
+            return False, "Already at root directory"
+        if not self._open_directory(parent_path):
+            return False, "Already at root directory"
+        return True, "Moved to parent directory"
+
+    def enter(self, index):
+        """Buka item di index: folder dimasuki, file dibuka dengan aplikasi default"""
+        if not self.items or index >= len(self.items):
+            return False, "No item selected"
+        name, is_dir, size, modified, full_path = self.items[index]
+        if name == "..":
+            success, msg = self.open(full_path)
+            return success, "Moved to parent directory" if success else msg
+        if is_dir:
+            success, msg = self.open(full_path)
+            return success, f"Opened: {name}" if success else f"Cannot access: {name}"
+        if open_file(full_path):
+            return True, f"Opening: {name}"
+        return False, f"Cannot open: {name}"
+
+    def set_sort(self, mode=None, reverse=None):
+        """Ganti mode sort (name/size/date/type) dan/atau arah sort"""
+        if mode is not None:
+            if mode not in ("name", "size", "date", "type"):
+                return False, f"Unknown sort mode: {mode}"
+            self.sort_mode = mode
+            if mode == "size":
+                # Sort by size butuh ukuran folder: hitung di background
+                self.size_engine.start(list_dir_paths(self.all_items))
+        if reverse is not None:
+            self.sort_reverse = reverse
+        self.remember_prefs(sort=self.sort_mode, reverse=self.sort_reverse)
+        self.pinned = False
+        self._apply_view()
+        if mode is None and reverse is not None:
+            return True, f"Sort order reversed: {'Descending' if self.sort_reverse else 'Ascending'}"
+        return True, f"Sorted by: {self.sort_mode.title()}"
+
+    def set_filter(self, extension):
+        """Filter berdasarkan extension ("" = hapus filter)"""
+        self.filter_ext = extension.lstrip('.') if extension else ""
+        self.pinned = False
+        self.search_query = ""
+        self._apply_view()
+        if self.filter_ext:
+            return True, f"Filtered by *.{self.filter_ext}: {len(self.items)} items"
+        return True, "Filter cleared"
+
+    def search(self, query):
+        """Tampilkan hasil search di folder aktif"""
+        if not query:
+            return self.set_filter(self.filter_ext)
+        self.search_query = query
+        self.filter_ext = ""
+        self.items = search_items(self.all_items, query)
+        self.pinned = True
+        return True, f"Search results: {len(self.items)} items found for '{query}'"
+
+    def show_items(self, items):
+        """Tampilkan list items custom (mis. hasil duplicate finder) sampai refresh / pindah folder"""
+        self.items = items
+        self.pinned = True
+        return True, f"{len(items)} items"
+
+    # --- Selection & clipboard ---------------------------------------------
+
+    def target_paths(self, index=None):
+        """Path yang jadi target operasi: selection jika ada, kalau tidak item di index"""
+        if self.selection:
+            return self.selection.paths()
+        if index is not None and self.items and index < len(self.items):
+            name, _, _, _, full_path = self.items[index]
+            if name != "..":
+                return [full_path]
+        return []
+
+    @property
+    def clipboard_info(self):
+        if not self.clipboard_items:
+            return ""
+        mode_text = "Copy" if self.clipboard_mode == 'copy' else "Cut"
+        if len(self.clipboard_items) == 1:
+            return f"{mode_text}: {Path(self.clipboard_items[0]).name}"
+        return f"{mode_text}: {len(self.clipboard_items)} items"
+
+    def _set_clipboard(self, paths, mode):
+        if not paths:
+            return False, "Nothing to copy"
+        self.clipboard_items = list(paths)
+        self.clipboard_mode = mode
+        verb = "Copied" if mode == 'copy' else "Cut"
+        if len(paths) == 1:
+            return True, f"{verb} to clipboard: {Path(paths[0]).name}"
+        return True, f"{verb} {len(paths)} items to clipboard"
+
+    def copy(self, paths):
+        return self._set_clipboard(paths, 'copy')
+
+    def cut(self, paths):
+        return self._set_clipboard(paths, 'cut')
+
+    def _dest_names(self, dest_dir):
+        """Nama di dest_dir dari listing yang sudah ada (None = belum ada, scan saat paste)"""
+        if dest_dir == self.path and self.all_items is not None:
+            return listing_names(self.all_items)
+        if self.cache is not None:
+            items = self.cache.get(dest_dir)
+            if items is not None:
+                return listing_names(items)
+        return None
+
+    def paste_conflicts(self, dest_dir=None):
+        """Jumlah item clipboard yang namanya sudah ada di tujuan (untuk memilih policy)"""
+        dest_dir = dest_dir or self.path
+        names = self._dest_names(dest_dir)
+        resolver = NameResolver(dest_dir, names)
+        return sum(1 for path in self.clipboard_items if resolver.taken(os.path.basename(path)))
+
+    def paste(self, dest_dir=None, policy=None):
+        """
+        Paste clipboard ke folder aktif (atau dest_dir).
+        policy untuk nama yang sudah ada: rename / skip / overwrite / newer
+        (default: copy = rename, move = skip).
+        """
+        if not self.clipboard_items:
+            return False, "Clipboard is empty"
+        dest_dir = dest_dir or self.path
+        items = self.clipboard_items
+        existing = self._dest_names(dest_dir)
+
+        if self.clipboard_mode == 'copy':
+            policy = policy or 'rename'
+            if len(items) == 1:
+                success, msg = copy_item(items[0], dest_dir, policy, existing)
+            else:
+                success, msg = copy_multiple_items(items, dest_dir, policy, existing)
+        else:
+            policy = policy or 'skip'
+            if len(items) == 1:
+                success, msg = move_item(items[0], dest_dir, policy, existing)
+            else:
+                success, msg = move_multiple_items(items, dest_dir, policy, existing)
+            if success:
+                self.clipboard_items = []
+                self.clipboard_mode = None
+
+        self.refresh()
+        self.selection.clear()
+        return success, msg
+
+    # --- File operations ---------------------------------------------------
+
+    def delete(self, paths):
+        """Pindahkan paths ke trash (bisa di-undo)"""
+        if not paths:
+            return False, "Nothing to delete"
+        if len(paths) == 1:
+            success, msg = delete_item(paths[0])
+        else:
+            success, msg = delete_multiple_items(paths)
+        self.refresh()
+        self.selection.retain(self.path, self.all_items)
+        return success, msg
+
+    def rename(self, path, new_name):
+        success, msg = rename_item(path, new_name)
+        self.refresh()
+        return success, msg
+
+    def bulk_rename(self, paths, pattern="", template="{name}{ext}", case=None, start=1):
+        """Rename banyak item sekaligus (lihat bulk_rename.Renamer), konflik dilewati"""
+        from .bulk_rename import Renamer, plan_rename, execute_rename
+        try:
+            plan = plan_rename(paths, Renamer(pattern, template, case, start))
+        except ValueError as e:
+            return False, str(e)
+        success, msg = execute_rename(plan)
+        if success:
+            self.selection.clear()
+        self.refresh()
+        return success, msg
+
+    def ordered_targets(self, index=None):
+        """target_paths dengan urutan seperti di listing (urutan counter bulk rename)"""
+        paths = self.target_paths(index)
+        if len(paths) < 2:
+            return paths
+        wanted = set(paths)
+        ordered = [path for path in all_paths(self.items) if path in wanted]
+        seen = set(ordered)
+        return ordered + [path for path in paths if path not in seen]
+
+    def mkdir(self, name):
+        success, msg = create_folder(self.path, name)
+        self.refresh()
+        return success, msg
+
+    def touch(self, name):
+        success, msg = create_file(self.path, name)
+        self.refresh()
+        return success, msg
+
+    def compress(self, paths, output_path, format_type='zip'):
+        """Compress paths ke archive (zip / 7z / rar)"""
+        # Lazy: zipfile / tarfile / subprocess baru dimuat saat compress pertama
+        from .compression import compress_to_zip, compress_to_7z, compress_to_rar
+        compressors = {'zip': compress_to_zip, '7z': compress_to_7z, 'rar': compress_to_rar}
+        if format_type not in compressors:
+            return False, f"Unknown archive format: {format_type}"
+        if not paths:
+            return False, "No items to compress"
+        success, msg = compressors[format_type](paths, os.path.join(self.path, output_path))
+        self.refresh()
+        self.selection.clear()
+        return success, msg
+
+    def extract(self, archive_path, folder_name):
+        """Extract archive ke subfolder di folder aktif"""
+        from .compression import extract_archive
+        extract_path = os.path.join(self.path, folder_name)
+        try:
+            os.makedirs(extract_path, exist_ok=True)
+        except OSError as e:
+            return False, f"Extraction failed: {str(e)}"
+        success, msg = extract_archive(archive_path, extract_path)
+        self.refresh()
+        return success, msg
+
+    def toggle_bookmark(self):
+        """Bookmark / un-bookmark folder aktif"""
+        if self.state is None:
+            return False, "Bookmarks are not available in this session"
+        if self.state.toggle_bookmark(self.path):
+            return True, f"Bookmarked: {self.path}"
+        return True, f"Bookmark removed: {self.path}"
+
+    def undo(self):
+        success, msg = self.journal.undo()
+        if success:
+            self.refresh()
+            self.selection.retain(self.path, self.all_items)
+        return success, msg
+
+    def redo(self):
+        success, msg = self.journal.redo()
+        if success:
+            self.refresh()
+            self.selection.retain(self.path, self.all_items)
+        return success, msg
+
+    # --- Background jobs ---------------------------------------------------
+
+    def start_dir_sizes(self):
+        """Hitung ukuran semua folder di listing (background)"""
+        dir_paths = list_dir_paths(self.all_items)
+        if not dir_paths:
+            return False, "No folders in this directory"
+        self.size_engine.start(dir_paths)
+        return True, f"Calculating size of {len(dir_paths)} folders..."
+
+    def set_watch(self, enabled):
+        """Nyalakan / matikan watcher milik session (dual pane memakai watcher bersama)"""
+        if enabled and self.watcher is None:
+            self.watcher = DirectoryWatcher()
+            self.watcher.watch(self.path)
+        elif not enabled and self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    @property
+    def busy(self):
+        """True jika ada job background yang perlu di-poll"""
+        return (self.size_engine.is_busy() or self._reconcile is not None
+                or (self.watcher is not None and self.watcher.active))
+
+    def apply_changes(self, changes, listing=None):
+        """
+        Terapkan perubahan watcher (dict name -> action, None = rescan penuh).
+        listing: hasil apply_listing_changes yang sudah dihitung (watcher bersama), opsional.
+        Return message untuk status bar.
+        """
+        self.size_engine.invalidate(self.path)
+        for name in changes or []:
+            self.size_engine.invalidate(os.path.join(self.path, name))
+        if listing is None:
+            listing = apply_listing_changes(self.all_items, changes, self.path)
+        self.all_items = listing
+        if changes is None:
+            self.selection.retain(self.path, self.all_items)
+        else:
+            self.selection.prune([os.path.join(self.path, name) for name, action in changes.items() if action == 'removed'])
+        self._apply_view()
+        return "Directory changed, rescanned" if changes is None else f"{len(changes)} external changes applied"
+
+    def apply_sizes(self, updates):
+        """Masukkan ukuran folder dari size engine, return message (None = tidak ada yang baru)"""
+        self.all_items = apply_dir_sizes(self.all_items, updates)
+        self.items = apply_dir_sizes(self.items, updates)
+        if self.size_engine.is_busy():
+            return None
+        if self.sort_mode == "size":
+            # Urutkan ulang setelah semua ukuran folder selesai
+            self._apply_view()
+        return "Folder sizes calculated"
+
+    def poll_reconcile(self):
+        """Ambil hasil scan asli setelah warm start dari snapshot, return True jika listing diganti"""
+        if self._reconcile is None or not self._reconcile[1].done():
+            return False
+        path, future = self._reconcile
+        self._reconcile = None
+        if path != self.path or future.exception() is not None:
+            return False
+        self.all_items = future.result()
+        if self.cache is not None:
+            self.cache.put(path, self.all_items)
+        self.selection.retain(self.path, self.all_items)
+        self._apply_view()
+        return True
+
+    def poll(self):
+        """
+        Ambil hasil job background (perubahan dari watcher, ukuran folder).
+        Return (changed, message): changed=True berarti listing berubah (perlu redraw),
+        message None berarti message lama tetap ditampilkan.
+        """
+        changed = False
+        message = None
+
+        # Perubahan dari luar: update incremental, satu repaint per burst event
+        changes = self.watcher.drain() if self.watcher is not None else {}
+        if changes != {}:
+            message = self.apply_changes(changes)
+            changed = True
+
+        if self.poll_reconcile():
+            changed = True
+
+        updates = self.size_engine.poll()
+        if updates:
+            message = self.apply_sizes(updates) or message
+            changed = True
+        return changed, message
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.size_engine.cancel()
+        if self.state is not None:
+            # Snapshot lama dipertahankan jika reconcile belum selesai
+            self._remember_listing()
+            self.state.set_last_path(self.path)
+            self.state.save()
+
+    # --- Command API -------------------------------------------------------
+
+    COMMANDS = {
+        'cd': 'open', 'up': 'go_up', 'refresh': 'refresh',
+        'sort': 'set_sort', 'filter': 'set_filter', 'search': 'search',
+        'copy': 'copy', 'cut': 'cut', 'paste': 'paste',
+        'delete': 'delete', 'rename': 'rename', 'bulk_rename': 'bulk_rename', 'mkdir': 'mkdir', 'touch': 'touch',
+        'zip': 'compress', 'extract': 'extract', 'undo': 'undo', 'redo': 'redo',
+        'sizes': 'start_dir_sizes', 'bookmark': 'toggle_bookmark',
+    }
+
+    def execute(self, command, *args, **kwargs):
+        """
+        Jalankan command berdasarkan nama (untuk script / job runner), mis.
+        session.execute('cd', 'D:/data'); session.execute('copy', paths); session.execute('paste')
+        """
+        import inspect  # Hanya dipakai script, tidak perlu di startup
+
+        method = self.COMMANDS.get(command)
+        if method is None:
+            return False, f"Unknown command: {command}"
+        func = getattr(self, method)
+        # Argumen salah dilaporkan ke pemanggil, TypeError dari dalam command tetap di-raise
+        try:
+            inspect.signature(func).bind(*args, **kwargs)
+        except TypeError as e:
+            return False, f"{command}: {e}"
+        return func(*args, **kwargs)
@@ -1,17 +1,23 @@
 """
 Sorting and view mode functions
 """
-import msvcrt
 from pathlib import Path
 from datetime import datetime
 from .ui import clear_screen, draw_header, get_terminal_size
+from .listing import ColumnarListing
+from .metrics import timed
 
 
+@timed(entries=True)
 def sort_items(items, sort_mode="name", reverse=False):
     """
     Sort items berdasarkan mode yang dipilih
     Modes: name, size, date, type
     """
+    # Columnar listing: sort vectorized tanpa bikin tuple
+    if isinstance(items, ColumnarListing):
+        return items.sorted_by(sort_mode, reverse)
+    
     # Pisahkan ".." dari items lain
     parent_item = None
     regular_items = []
@@ -28,18 +34,18 @@ def sort_items(items, sort_mode="name", reverse=False):
         regular_items.sort(key=lambda x: (not x[1], x[0].lower()), reverse=reverse)
     
     elif sort_mode == "size":
-        # Sort by size (folders always first, then files by size)
+        # Sort by size (folders tanpa ukuran first, then by size)
         def get_size_value(item):
-            if item[1]:  # folder
+            if item[1] and not item[2]:  # folder yang ukurannya belum dihitung
                 return (-1, item[0].lower())  # Folders first, then alphabetically
-            else:  # file
+            else:  # file, atau folder dengan ukuran dari dir_size
                 size_str = item[2]
                 if size_str == "N/A" or not size_str:
                     return (0, item[0].lower())
                 
-                # Parse size string to bytes for proper sorting
+                # Parse size string to bytes for proper sorting ("+" = ukuran partial)
                 try:
-                    value, unit = size_str.split()
+                    value, unit = size_str.rstrip('+').split()
                     value = float(value)
                     multipliers = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
                     return (value * multipliers.get(unit, 1), item[0].lower())
@@ -97,7 +103,7 @@ def format_item_display_detailed(item, max_width):
         display = f"{icon} {name}/"
         padding = max_width - len(display) - 20
         if padding > 0:
-            display += " " * padding + f"<DIR>".rjust(15)
+            display += " " * padding + (size or "<DIR>").rjust(15)
     else:
         display = f"{icon} {name}"
         padding = max_width - len(display) - len(size) - 4
@@ -115,6 +121,10 @@ def format_item_display_compact(item, max_width):
     
     if is_dir:
         display = f"{icon} {name}/"
+        if size:
+            padding = max_width - len(display) - len(size) - 4
+            if padding > 0:
+                display += " " * padding + size
     else:
         display = f"{icon} {name}"
         if size and size != "N/A":
@@ -149,6 +159,7 @@ def format_item_display(item, max_width, view_mode="detailed"):
 
 def show_sort_menu(current_path, current_sort, filter_ext):
     """Show sort options menu"""
+    import msvcrt
     clear_screen()
     cols, _ = get_terminal_size()
     
@@ -193,6 +204,7 @@ def show_sort_menu(current_path, current_sort, filter_ext):
 
 def show_view_menu(current_path, current_view, filter_ext, sort_mode):
     """Show view options menu"""
+    import msvcrt
     clear_screen()
     cols, _ = get_terminal_size()
     
@@ -0,0 +1,109 @@
+"""
+Startup profile: breakdown import time (python -X importtime) dan waktu sampai frame pertama.
+Module ini sengaja ringan karena di-import main.py sebelum render pertama.
+"""
+import os
+import sys
+import time
+
+
+ENV_VAR = "FILE_EXPLORER_STARTUP_PROFILE"  # "1" = keluar setelah render pertama & laporkan
+MARKER = "startup-profile:"
+
+# Module berat yang seharusnya belum dimuat saat frame pertama digambar
+DEFERRED_MODULES = ('zipfile', 'tarfile', 'sqlite3', 'multiprocessing', 'argparse')
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def is_profiling():
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+def report_first_render(start):
+    """Dipanggil main.py setelah render pertama: tulis waktu & module yang sudah dimuat ke stderr"""
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    loaded = ",".join(name for name in DEFERRED_MODULES if name in sys.modules)
+    sys.stderr.write(f"{MARKER} first_render_ms={elapsed_ms:.3f} loaded={loaded}\n")
+    sys.stderr.flush()
+
+
+def parse_importtime(output):
+    """
+    Parse stderr `python -X importtime`.
+    Return list of (module, self_us, cumulative_us, depth) sesuai urutan import.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Baris header
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), self_us, cumulative_us, depth))
+    return imports
+
+
+def profile_startup(command=None, env=None, cwd=None):
+    """
+    Jalankan explorer di subprocess dengan -X importtime sampai render pertama.
+    command: argumen setelah `python -X importtime` (default: main.py).
+    cwd: folder awal explorer (default: cwd proses ini).
+    Return dict: wall (detik), first_render (detik, dari baris pertama main.py),
+    loaded (module DEFERRED_MODULES yang sudah dimuat), imports (lihat parse_importtime).
+    """
+    import subprocess
+
+    child_env = dict(os.environ if env is None else env)
+    child_env[ENV_VAR] = "1"
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + list(command or [MAIN_SCRIPT]),
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env=child_env, cwd=cwd, text=True, errors="replace"
+    )
+    wall = time.perf_counter() - start
+
+    first_render = None
+    loaded = []
+    for line in result.stderr.splitlines():
+        if line.startswith(MARKER):
+            fields = dict(field.split("=", 1) for field in line[len(MARKER):].split())
+            first_render = float(fields['first_render_ms']) / 1000
+            loaded = [name for name in fields.get('loaded', "").split(",") if name]
+
+    if first_render is None:
+        tail = result.stderr.strip().splitlines()[-5:]
+        raise RuntimeError("Explorer exited before first render:\n" + "\n".join(tail))
+
+    return {
+        'wall': wall,
+        'first_render': first_render,
+        'loaded': loaded,
+        'imports': parse_importtime(result.stderr),
+    }
+
+
+def format_startup_report(profile, top=15):
+    """Format hasil profile_startup untuk ditampilkan di terminal"""
+    imports = profile['imports']
+    total_us = sum(self_us for _, self_us, _, _ in imports)
+    lines = [
+        f"Process wall time  : {profile['wall'] * 1000:8.1f} ms",
+        f"Time to first frame: {profile['first_render'] * 1000:8.1f} ms (from main.py)",
+        f"Imports            : {total_us / 1000:8.1f} ms in {len(imports)} modules",
+        f"Deferred modules loaded before first frame: {', '.join(profile['loaded']) or 'none'}",
+        "",
+        f"  {'self ms':>8}  {'cumul ms':>8}  module",
+    ]
+    # Top-level import (depth 0/1) diurutkan berdasarkan waktu kumulatif
+    heaviest = sorted((entry for entry in imports if entry[3] <= 1), key=lambda entry: entry[2], reverse=True)
+    for name, self_us, cumulative_us, depth in heaviest[:top]:
+        lines.append(f"  {self_us / 1000:>8.2f}  {cumulative_us / 1000:>8.2f}  {'  ' * depth}{name}")
+    return "\n".join(lines)
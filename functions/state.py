@@ -0,0 +1,163 @@
+"""
+Session state: path terakhir, preferensi per folder, bookmark, dan snapshot listing (warm start)
+"""
+import os
+import json
+import time
+import msvcrt
+from .ui import clear_screen, draw_header
+from .file_system import get_app_dir
+
+
+MAX_PREFS = 500              # Folder dengan preferensi sort/view/kolom yang diingat
+MAX_BOOKMARKS = 9            # Bookmark dipilih dengan tombol 1-9
+MAX_SNAPSHOTS = 8            # Listing terakhir yang disimpan untuk warm start
+MAX_SNAPSHOT_ENTRIES = 20000  # Folder lebih besar dari ini tidak di-snapshot
+
+
+def _write_json(path, data):
+    """Tulis JSON compact secara atomic (file temp lalu os.replace)"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class SessionState:
+    """
+    State yang bertahan antar launch, disimpan di dua file di app dir:
+    session.json (kecil: path terakhir, prefs, bookmarks) dan snapshots.json
+    (listing N folder terakhir, dibaca sekali saat start untuk render instan).
+    Semua perubahan di memori; save() hanya menulis file yang berubah.
+    """
+
+    def __init__(self, path=None, snapshot_path=None):
+        app_dir = get_app_dir()
+        self.path = path or os.path.join(app_dir, "session.json")
+        self.snapshot_path = snapshot_path or os.path.join(app_dir, "snapshots.json")
+
+        data = _read_json(self.path)
+        self.last_path = data.get('last_path')
+        self.bookmarks = list(data.get('bookmarks', []))[:MAX_BOOKMARKS]
+        self._prefs = dict(data.get('prefs', {}))  # path -> {'sort', 'reverse', 'view', 'columns'}
+        self._snapshots = _read_json(self.snapshot_path)  # path -> {'saved', 'listing'}
+        self._dirty = False
+        self._snapshots_dirty = False
+
+    # --- Preferences -------------------------------------------------------
+
+    def get_prefs(self, path):
+        """Preferensi tersimpan untuk folder (dict kosong jika belum ada)"""
+        return dict(self._prefs.get(path, {}))
+
+    def set_prefs(self, path, **prefs):
+        entry = self._prefs.pop(path, {})
+        entry.update(prefs)
+        self._prefs[path] = entry  # Paling baru dipakai pindah ke akhir
+        while len(self._prefs) > MAX_PREFS:
+            del self._prefs[next(iter(self._prefs))]
+        self._dirty = True
+
+    def set_last_path(self, path):
+        if path != self.last_path:
+            self.last_path = path
+            self._dirty = True
+
+    # --- Bookmarks ---------------------------------------------------------
+
+    def toggle_bookmark(self, path):
+        """Tambah / hapus bookmark, return True jika sekarang ter-bookmark"""
+        self._dirty = True
+        if path in self.bookmarks:
+            self.bookmarks.remove(path)
+            return False
+        self.bookmarks.append(path)
+        del self.bookmarks[:-MAX_BOOKMARKS]
+        return True
+
+    # --- Listing snapshots -------------------------------------------------
+
+    def get_snapshot(self, path):
+        """Snapshot listing folder (lihat listing.snapshot_listing), None jika tidak ada"""
+        entry = self._snapshots.get(path)
+        return entry.get('listing') if isinstance(entry, dict) else None
+
+    def save_snapshot(self, path, listing):
+        """Simpan snapshot listing (hasil listing.snapshot_listing) untuk path"""
+        if listing is None:
+            self.discard_snapshot(path)
+            return
+        count = len(listing.get('names', listing.get('rows', [])))
+        if count > MAX_SNAPSHOT_ENTRIES:
+            self.discard_snapshot(path)
+            return
+        self._snapshots.pop(path, None)
+        self._snapshots[path] = {'saved': time.time(), 'listing': listing}
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            del self._snapshots[next(iter(self._snapshots))]
+        self._snapshots_dirty = True
+
+    def discard_snapshot(self, path):
+        if self._snapshots.pop(path, None) is not None:
+            self._snapshots_dirty = True
+
+    # --- Persistence -------------------------------------------------------
+
+    def save(self):
+        """Tulis file yang berubah sejak save terakhir"""
+        try:
+            if self._dirty:
+                _write_json(self.path, {'last_path': self.last_path, 'bookmarks': self.bookmarks, 'prefs': self._prefs})
+                self._dirty = False
+            if self._snapshots_dirty:
+                _write_json(self.snapshot_path, self._snapshots)
+                self._snapshots_dirty = False
+        except OSError:
+            return False
+        return True
+
+
+_state = None
+
+
+def get_session_state():
+    """State global (dibaca sekali per proses)"""
+    global _state
+    if _state is None:
+        _state = SessionState()
+    return _state
+
+
+def show_bookmark_menu(current_path, bookmarks, filter_ext="", sort_mode="name"):
+    """Menu pilih bookmark (1-9), return path terpilih atau None"""
+    clear_screen()
+    draw_header(current_path, filter_ext=filter_ext, sort_mode=sort_mode)
+
+    print("\n 🔖 Bookmarks")
+    print(" " + "─" * 40)
+
+    if not bookmarks:
+        print("   No bookmarks yet (press B to bookmark current folder)")
+    for idx, path in enumerate(bookmarks, 1):
+        marker = ">" if path == current_path else " "
+        print(f" {marker} [{idx}] {path}")
+
+    print("\n " + "─" * 40)
+    print(" [ESC] Cancel")
+
+    while True:
+        key = msvcrt.getch()
+
+        if key == b'\x1b':  # ESC
+            return None
+        if key.isdigit() and 1 <= int(key) <= len(bookmarks):
+            return bookmarks[int(key) - 1]
@@ -0,0 +1,356 @@
+"""
+Incremental sync / mirror (rsync-style) dari clipboard ke folder aktif
+"""
+import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .ui import clear_screen, draw_header, get_terminal_size
+from .file_system import format_size
+from .hashing import HashCache, hash_full
+from .transfer import copy_file
+from .io_profile import AIMDController, get_profile_store
+from .journal import get_journal
+
+
+# Selisih mtime yang masih dianggap sama (FAT/exFAT hanya punya resolusi 2 detik)
+MTIME_WINDOW = 2.0
+SYNC_HASH_KIND = "full:blake2b"
+COPY_OVERHEAD_BYTES = 64 * 1024  # Biaya metadata per file (create, copystat) dihitung setara byte ini
+
+
+class SyncPlan:
+    """
+    Hasil perbandingan source vs tujuan (belum ada yang ditulis).
+    mkdirs: folder yang perlu dibuat, copies: (src, dst, size, reason),
+    deletes: path di tujuan yang tidak ada di source.
+    """
+
+    def __init__(self):
+        self.mkdirs = []
+        self.copies = []
+        self.deletes = []
+        self.unchanged = 0
+        self.errors = []
+        self.cancelled = False
+
+    @property
+    def copy_bytes(self):
+        return sum(size for _, _, size, _ in self.copies)
+
+    def is_empty(self):
+        return not (self.mkdirs or self.copies or self.deletes)
+
+    def summary(self):
+        return (f"{len(self.copies)} files to copy ({format_size(self.copy_bytes)}), "
+                f"{len(self.mkdirs)} folders to create, {len(self.deletes)} to delete, "
+                f"{self.unchanged} unchanged")
+
+
+def _scan(path):
+    """Return dict name -> (is_dir, size, mtime) untuk satu folder (symlink tidak diikuti)"""
+    result = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                stat = entry.stat(follow_symlinks=False)
+                result[entry.name] = (entry.is_dir(follow_symlinks=False), stat.st_size, stat.st_mtime)
+            except OSError:
+                continue
+    return result
+
+
+def _same_content(src, dst, src_info, dst_info, cache):
+    """Bandingkan isi file via hash (dengan HashCache supaya sync berikutnya cepat)"""
+    digests = []
+    for path, (_, size, mtime) in ((src, src_info), (dst, dst_info)):
+        digest = cache.get(path, SYNC_HASH_KIND, size, mtime)
+        if digest is None:
+            digest = hash_full(path)
+            cache.put(path, SYNC_HASH_KIND, size, mtime, digest)
+        digests.append(digest)
+    return digests[0] == digests[1]
+
+
+def _needs_copy(src, dst, src_info, dst_info, compare, cache):
+    """Return alasan copy ('new' / 'size' / 'mtime' / 'content') atau None jika sama"""
+    if dst_info is None:
+        return 'new'
+    if src_info[1] != dst_info[1]:
+        return 'size'
+    if compare == 'hash':
+        try:
+            return None if _same_content(src, dst, src_info, dst_info, cache) else 'content'
+        except OSError:
+            return 'content'
+    if abs(src_info[2] - dst_info[2]) > MTIME_WINDOW:
+        return 'mtime'
+    return None
+
+
+def plan_sync(sources, dest_dir, compare='mtime', delete_extras=False, should_cancel=None, cache=None):
+    """
+    Bandingkan setiap source dengan pasangannya di dest_dir (dest_dir/<nama source>).
+
+    compare='mtime' : file dianggap sama jika size dan mtime sama (cepat, tanpa baca isi)
+    compare='hash'  : file dengan size sama dibandingkan isinya (blake2b, di-cache)
+    delete_extras   : hapus file/folder di tujuan yang tidak ada di source (mirror)
+    """
+    plan = SyncPlan()
+    dest_dir = os.path.abspath(dest_dir)
+
+    own_cache = cache is None and compare == 'hash'
+    if own_cache:
+        cache = HashCache()
+
+    try:
+        # Stack of (src_folder, dst_folder, dst_exists)
+        stack = []
+        for source in sources:
+            source = os.path.abspath(source)
+            name = os.path.basename(source)
+            dest = os.path.join(dest_dir, name)
+
+            if source == dest:
+                plan.errors.append(f"{name}: source and destination are the same")
+                continue
+            if os.path.isdir(source) and (dest_dir + os.sep).startswith(source + os.sep):
+                plan.errors.append(f"{name}: cannot sync a folder into itself")
+                continue
+
+            try:
+                stat = os.stat(source, follow_symlinks=False)
+            except OSError as e:
+                plan.errors.append(f"{name}: {e}")
+                continue
+
+            src_info = (os.path.isdir(source) and not os.path.islink(source), stat.st_size, stat.st_mtime)
+            try:
+                dst_stat = os.stat(dest, follow_symlinks=False)
+                dst_info = (os.path.isdir(dest) and not os.path.islink(dest), dst_stat.st_size, dst_stat.st_mtime)
+            except OSError:
+                dst_info = None
+
+            if dst_info is not None and dst_info[0] != src_info[0]:
+                # Tipe berbeda (file vs folder): ganti seluruhnya
+                plan.deletes.append(dest)
+                dst_info = None
+
+            if src_info[0]:
+                if dst_info is None:
+                    plan.mkdirs.append(dest)
+                stack.append((source, dest, dst_info is not None))
+            else:
+                reason = _needs_copy(source, dest, src_info, dst_info, compare, cache)
+                if reason:
+                    plan.copies.append((source, dest, src_info[1], reason))
+                else:
+                    plan.unchanged += 1
+
+        visited = 0
+        while stack:
+            src_dir, dst_dir, dst_exists = stack.pop()
+            visited += 1
+            if should_cancel is not None and visited % 200 == 0 and should_cancel():
+                plan.cancelled = True
+                break
+
+            try:
+                src_entries = _scan(src_dir)
+            except OSError as e:
+                plan.errors.append(f"{src_dir}: {e}")
+                continue
+            try:
+                dst_entries = _scan(dst_dir) if dst_exists else {}
+            except OSError as e:
+                plan.errors.append(f"{dst_dir}: {e}")
+                dst_entries = {}
+
+            for name, src_info in src_entries.items():
+                src = os.path.join(src_dir, name)
+                dst = os.path.join(dst_dir, name)
+                dst_info = dst_entries.get(name)
+
+                if dst_info is not None and dst_info[0] != src_info[0]:
+                    plan.deletes.append(dst)
+                    dst_info = None
+
+                if src_info[0]:
+                    if dst_info is None:
+                        plan.mkdirs.append(dst)
+                    stack.append((src, dst, dst_info is not None))
+                    continue
+
+                reason = _needs_copy(src, dst, src_info, dst_info, compare, cache)
+                if reason:
+                    plan.copies.append((src, dst, src_info[1], reason))
+                else:
+                    plan.unchanged += 1
+
+            if delete_extras:
+                for name in dst_entries.keys() - src_entries.keys():
+                    plan.deletes.append(os.path.join(dst_dir, name))
+    finally:
+        if cache is not None:
+            cache.flush()
+            if own_cache:
+                cache.close()
+
+    return plan
+
+
+def _copy_one(src, dst):
+    """Copy satu file (metadata ikut, supaya mtime sama untuk sync berikutnya)"""
+    if os.path.islink(dst):
+        os.unlink(dst)
+    copy_file(src, dst)
+
+
+def execute_sync(plan, max_workers=None, progress=None, should_cancel=None):
+    """
+    Jalankan SyncPlan: pindahkan entry yang tipenya berubah / extra ke trash, buat folder,
+    lalu copy file secara paralel (thread pool, I/O bound).
+    """
+    if plan.is_empty():
+        return True, "Already in sync, nothing to do"
+
+    failed = []
+
+    # Delete dulu (paling dalam dulu) supaya folder yang tipenya berubah bisa dibuat ulang.
+    # Lewat journal ke trash (satu transaksi), jadi --sync --delete yang salah bisa di-undo
+    deletes = [['trash', path, None] for path in sorted(plan.deletes, key=len, reverse=True)]
+    delete_failed = get_journal().run('delete', deletes) if deletes else {}
+    failed.extend(Path(deletes[idx][1]).name for idx in sorted(delete_failed))
+
+    for path in plan.mkdirs:
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError:
+            failed.append(Path(path).name)
+
+    copied = 0
+    copied_bytes = 0
+    total = len(plan.copies)
+    # Jumlah copy in-flight diatur AIMD per mount tujuan (NVMe naik, HDD / share lambat mundur)
+    dest_dir = os.path.dirname(plan.copies[0][1]) if plan.copies else None
+    store = get_profile_store()
+    if dest_dir and not max_workers:
+        controller = store.controller(dest_dir, 'copy', min(8, (os.cpu_count() or 1) * 2))
+    else:
+        workers = max_workers or 1  # Tanpa copy: pool tidak dipakai
+        controller = AIMDController(workers, workers, workers)
+    queue = list(reversed(plan.copies))
+    futures = {}
+    with ThreadPoolExecutor(max_workers=controller.maximum) as pool:
+        while queue or futures:
+            while queue and len(futures) < controller.limit:
+                src, dst, size, _ = queue.pop()
+                futures[pool.submit(_copy_one, src, dst)] = (src, size)
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                src, size = futures.pop(future)
+                try:
+                    future.result()
+                    copied += 1
+                    copied_bytes += size
+                    controller.record(size + COPY_OVERHEAD_BYTES)
+                except OSError:
+                    failed.append(Path(src).name)
+
+                if progress is not None:
+                    progress(copied + len(failed), total, copied_bytes)
+            if should_cancel is not None and should_cancel():
+                queue.clear()  # Copy yang sedang jalan diselesaikan, sisanya batal
+    if dest_dir and not max_workers:
+        store.remember(dest_dir, 'copy', controller)
+        store.save()
+
+    deleted = len(deletes) - len(delete_failed)
+    message = f"Synced: {copied} files copied ({format_size(copied_bytes)}), {deleted} moved to trash"
+    if failed:
+        return True, f"{message}. Failed: {', '.join(failed[:5])}" + (" ..." if len(failed) > 5 else "")
+    return True, message
+
+
+def _render_sync(current_path, sources, compare, delete_extras, plan):
+    clear_screen()
+    cols, lines = get_terminal_size()
+    draw_header(current_path)
+
+    print("\n 🔄 Sync clipboard → current folder")
+    print(" " + "─" * (cols - 2))
+    print(f"   Source: {len(sources)} item(s) from {os.path.dirname(sources[0])}")
+    print("   [1] Compare: size + mtime" + (" ✓" if compare == 'mtime' else ""))
+    print("   [2] Compare: content hash" + (" ✓" if compare == 'hash' else ""))
+    print(f"   [D] Delete extras in destination: {'ON' if delete_extras else 'OFF'}")
+
+    if plan is not None:
+        print(" " + "─" * (cols - 2))
+        print(f"   Dry run: {plan.summary()}")
+        if plan.cancelled:
+            print("   ⚠️  Preview cancelled, plan is partial")
+        rows = ([f"   - {os.path.relpath(path, current_path)}" for path in plan.deletes] +
+                [f"   + {os.path.relpath(path, current_path)}/" for path in plan.mkdirs] +
+                [f"   > {os.path.relpath(dst, current_path)} ({reason}, {format_size(size)})"
+                 for _, dst, size, reason in plan.copies] +
+                [f"   ! {error}" for error in plan.errors])
+        limit = max(3, lines - 18)
+        for row in rows[:limit]:
+            print(row[:cols - 1])
+        if len(rows) > limit:
+            print(f"   ... and {len(rows) - limit} more")
+
+    print("\n " + "─" * (cols - 2))
+    print(" [P: Preview (dry run) | Enter: Sync | ESC: Cancel]")
+
+
+def show_sync_menu(current_path, sources):
+    """
+    Menu sync: pilih mode compare, toggle delete extras, preview, lalu jalankan.
+    Return (success, message).
+    """
+    import msvcrt
+    compare = 'mtime'
+    delete_extras = False
+    plan = None
+
+    def should_cancel():
+        return msvcrt.kbhit() and msvcrt.getch() == b'\x1b'
+
+    def build_plan():
+        clear_screen()
+        draw_header(current_path)
+        print("\n 🔄 Comparing... (ESC: Stop)")
+        return plan_sync(sources, current_path, compare, delete_extras, should_cancel)
+
+    while True:
+        _render_sync(current_path, sources, compare, delete_extras, plan)
+        key = msvcrt.getch()
+
+        if key == b'\xe0':
+            msvcrt.getch()
+            continue
+        elif key in (b'1', b'2'):
+            compare = 'mtime' if key == b'1' else 'hash'
+            plan = None
+        elif key in (b'd', b'D'):
+            delete_extras = not delete_extras
+            plan = None
+        elif key in (b'p', b'P'):
+            plan = build_plan()
+        elif key == b'\r':
+            if plan is None:
+                plan = build_plan()
+            if plan.cancelled:
+                continue
+            if plan.errors and plan.is_empty():
+                return False, f"Sync failed: {plan.errors[0]}"
+
+            def progress(done, total, done_bytes):
+                print(f"\r Copying... {done}/{total} files ({format_size(done_bytes)})".ljust(70), end="", flush=True)
+
+            clear_screen()
+            draw_header(current_path)
+            print(f"\n 🔄 Syncing: {plan.summary()} (ESC: Stop)")
+            return execute_sync(plan, progress=progress, should_cancel=should_cancel)
+        elif key == b'\x1b':
+            return False, "Sync cancelled"
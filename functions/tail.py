@@ -0,0 +1,323 @@
+"""
+Tail / follow viewer untuk file log: buka di akhir file, ikuti append (termasuk rotasi),
+dan scroll mundur lewat index offset baris. Isi file tidak pernah dimuat seluruhnya ke memori.
+"""
+import os
+import sys
+import time
+from .ui import clear_screen, get_terminal_size
+from .file_system import format_size
+
+
+CHUNK_SIZE = 64 * 1024         # Byte per read saat index mundur / maju
+MAX_LINE_BYTES = 16 * 1024     # Byte yang dibaca per baris untuk ditampilkan (baris lebih panjang dipotong)
+MAX_FOLLOW_BYTES = 8 * 1024 * 1024  # Append lebih besar dari ini: index ulang dari ekor file
+MAX_INDEX_LINES = 200000       # Offset baris yang disimpan, yang paling jauh dari layar dibuang
+POLL_INTERVAL = 0.5            # Detik antar cek size / inode saat follow
+
+# CreateFileW: baca dengan FILE_SHARE_DELETE supaya writer tetap bisa rename / hapus file (rotasi log)
+GENERIC_READ = 0x80000000
+FILE_SHARE_ALL = 0x1 | 0x2 | 0x4  # READ | WRITE | DELETE
+OPEN_EXISTING = 3
+FILE_ATTRIBUTE_NORMAL = 0x80
+
+
+def _open_shared(path):
+    """open(path, 'rb'); di Windows lewat CreateFileW dengan FILE_SHARE_DELETE"""
+    if os.name != 'nt':
+        return open(path, 'rb')
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    create_file = ctypes.WinDLL('kernel32', use_last_error=True).CreateFileW
+    create_file.restype = wintypes.HANDLE
+    create_file.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                            wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    handle = create_file(path, GENERIC_READ, FILE_SHARE_ALL, None, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, None)
+    if handle is None or handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return os.fdopen(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), 'rb')
+
+
+class TailReader:
+    """
+    Reader file yang hanya menyimpan offset awal baris (starts), bukan isinya.
+    Index dibangun dari ekor file: membuka file 50 GB cukup membaca 64 KB terakhir.
+    extend_back() menambah index ke arah awal file per chunk, poll() mengikuti
+    append dan mendeteksi rotasi (inode berubah) atau truncate (size mengecil).
+
+    starts[-1] boleh sama dengan size (baris berikut belum ditulis), jadi
+    jumlah baris = line_count, bukan len(starts).
+    Di Windows file dibuka dengan FILE_SHARE_DELETE: writer tetap bisa
+    rotasi (rename) selama viewer terbuka, poll() lalu membuka path baru.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._identity = None
+        self.size = 0
+        self.starts = []
+        self._open()
+
+    def _open(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = _open_shared(self.path)
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        self.size = stat.st_size
+        self._index_tail()
+
+    def _read_at(self, offset, size):
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def _index_tail(self):
+        """Index baris di chunk terakhir file (baris pertama chunk yang terpotong dibuang)"""
+        lo = max(0, self.size - CHUNK_SIZE)
+        data = self._read_at(lo, self.size - lo)
+        starts = [0] if lo == 0 and data else []
+        pos = data.find(b"\n")
+        while pos != -1:
+            starts.append(lo + pos + 1)
+            pos = data.find(b"\n", pos + 1)
+        if lo > 0 and (not starts or starts[0] == self.size):
+            starts.insert(0, lo)  # Satu baris lebih panjang dari chunk
+        self.starts = starts
+
+    @property
+    def line_count(self):
+        if self.starts and self.starts[-1] >= self.size:
+            return len(self.starts) - 1
+        return len(self.starts)
+
+    @property
+    def at_start(self):
+        """True jika index sudah mencapai awal file"""
+        return not self.starts or self.starts[0] == 0
+
+    def extend_back(self):
+        """Index satu chunk ke arah awal file, return jumlah baris yang ditambahkan di depan"""
+        if self.at_start:
+            return 0
+        first = self.starts[0]
+        lo = max(0, first - CHUNK_SIZE)
+        data = self._read_at(lo, first - lo)
+
+        new = [0] if lo == 0 else []
+        pos = data.find(b"\n")
+        while pos != -1:
+            if lo + pos + 1 < first:
+                new.append(lo + pos + 1)
+            pos = data.find(b"\n", pos + 1)
+        if not new:
+            new = [lo]  # Baris lebih panjang dari chunk dipecah di batas chunk
+        self.starts = new + self.starts
+        return len(new)
+
+    def _index_forward(self, new_size):
+        offset = self.size
+        if not self.starts:
+            self.starts.append(offset)  # File sebelumnya kosong
+        while offset < new_size:
+            data = self._read_at(offset, min(CHUNK_SIZE, new_size - offset))
+            if not data:
+                break
+            pos = data.find(b"\n")
+            while pos != -1:
+                self.starts.append(offset + pos + 1)
+                pos = data.find(b"\n", pos + 1)
+            offset += len(data)
+        self.size = offset
+
+    def trim(self, keep_from):
+        """Buang offset sebelum baris keep_from (batas memori index), return jumlah yang dibuang"""
+        drop = max(0, min(keep_from, len(self.starts) - MAX_INDEX_LINES))
+        if drop:
+            del self.starts[:drop]
+        return drop
+
+    def poll(self):
+        """
+        Cek perubahan file. Return None (tidak berubah), 'grew' (baris baru di akhir),
+        'rotated' (path sekarang file lain), 'truncated' atau 'reset' (append terlalu
+        besar, index dibangun ulang dari ekor). Selain 'grew', index baris berubah total.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None  # Sedang dirotasi: file baru belum dibuat
+
+        if stat.st_ino and (stat.st_dev, stat.st_ino) != self._identity:
+            self._open()
+            return 'rotated'
+        if stat.st_size < self.size:
+            self._open()
+            return 'truncated'
+        if stat.st_size > self.size:
+            if stat.st_size - self.size > MAX_FOLLOW_BYTES:
+                self.size = stat.st_size
+                self._index_tail()
+                return 'reset'
+            self._index_forward(stat.st_size)
+            return 'grew'
+        return None
+
+    def read_lines(self, first, count):
+        """Isi baris [first, first + count) sebagai str (decode UTF-8, baris panjang dipotong)"""
+        lines = []
+        last = min(first + count, self.line_count)
+        for idx in range(max(0, first), last):
+            start = self.starts[idx]
+            end = self.starts[idx + 1] if idx + 1 < len(self.starts) else self.size
+            data = self._read_at(start, min(end - start, MAX_LINE_BYTES))
+            lines.append(data.decode('utf-8', 'replace').rstrip("\r\n"))
+        return lines
+
+    def tail_lines(self, count):
+        """count baris terakhir (index mundur seperlunya)"""
+        while self.line_count < count and self.extend_back():
+            pass
+        return self.read_lines(self.line_count - count, count)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _render_tail(reader, top, rows, follow, message):
+    cols, _ = get_terminal_size()
+    clear_screen()
+
+    state = "FOLLOW" if follow else "PAUSED"
+    info = f" {os.path.basename(reader.path)}  |  {format_size(reader.size)}  |  {state} "
+    print("┌" + "─" * (cols - 2) + "┐")
+    print("│" + info[:cols - 2].ljust(cols - 2) + "│")
+    print("└" + "─" * (cols - 2) + "┘")
+
+    for line in reader.read_lines(top, rows):
+        print(" " + line.expandtabs(4)[:cols - 2])
+    for _ in range(rows - max(0, min(rows, reader.line_count - top))):
+        print(" ~")
+
+    print(f" ⓘ {message}" if message else "")
+    print(" [↑↓:Scroll PgUp/PgDn:Page Home:Start End:End F:Follow ESC:Close]")
+
+
+def show_tail_viewer(path):
+    """
+    Viewer tail -f: mulai di akhir file dan mengikuti append. Scroll ke atas
+    menghentikan follow; End / F melanjutkan. Return (success, message).
+    """
+    import msvcrt
+    try:
+        reader = TailReader(path)
+    except OSError as e:
+        return False, f"Cannot open {os.path.basename(path)}: {e}"
+
+    follow = True
+    message = ""
+    top = 0
+    rows = 5
+    redraw = True
+    try:
+        while True:
+            # Gambar ulang hanya jika file berubah atau ada key (clear_screen = spawn proses)
+            if redraw:
+                _, lines = get_terminal_size()
+                rows = max(5, lines - 6)
+
+                # Pastikan index cukup untuk satu layar di atas baris teratas
+                while top < rows and not reader.at_start:
+                    top += reader.extend_back()
+                if follow:
+                    top = max(0, reader.line_count - rows)
+                top = max(0, min(top, max(0, reader.line_count - rows)))
+                top -= reader.trim(max(0, top - rows))
+
+                _render_tail(reader, top, rows, follow, message)
+                message = ""
+
+            deadline = time.monotonic() + POLL_INTERVAL
+            while not msvcrt.kbhit() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            if not msvcrt.kbhit():
+                change = reader.poll()
+                redraw = change is not None
+                if change in ('rotated', 'truncated', 'reset'):
+                    message = f"File {change}, reopened at end"
+                    top = max(0, reader.line_count - rows)
+                continue
+            redraw = True
+
+            key = msvcrt.getch()
+            if key in (b'\xe0', b'\x00'):
+                key = msvcrt.getch()
+                if key == b'H':      # Up
+                    top -= 1
+                    follow = False
+                elif key == b'P':    # Down
+                    top += 1
+                    follow = top >= reader.line_count - rows  # Sampai bawah = lanjut follow
+                elif key == b'I':    # Page Up
+                    top -= rows
+                    follow = False
+                elif key == b'Q':    # Page Down
+                    top += rows
+                    follow = top >= reader.line_count - rows
+                elif key == b'G':    # Home: mundur sejauh batas index
+                    follow = False
+                    while len(reader.starts) < MAX_INDEX_LINES and reader.extend_back():
+                        pass
+                    top = 0
+                    if not reader.at_start:
+                        message = f"Showing last {reader.line_count} lines (index limit)"
+                elif key == b'O':    # End
+                    follow = True
+            elif key in (b'f', b'F'):
+                follow = not follow
+            elif key in (b'\x1b', b'q', b'Q'):
+                break
+
+            if top < 0:
+                top += reader.extend_back()
+    finally:
+        reader.close()
+    return True, ""
+
+
+def follow_to_stream(path, count=10, follow=False, stream=None):
+    """
+    tail [-f] untuk CLI: tulis count baris terakhir lalu (opsional) baris baru ke stream.
+    Saat follow hanya baris yang sudah diakhiri newline yang ditulis: baris
+    terakhir yang belum lengkap ditulis setelah newline-nya di-append.
+    """
+    stream = stream or sys.stdout
+    reader = TailReader(path)
+    try:
+        while reader.line_count <= count and reader.extend_back():
+            pass
+        # Baris lengkap = len(starts) - 1 (setiap start selain yang pertama ada setelah newline)
+        end = max(0, len(reader.starts) - 1) if follow else reader.line_count
+        first = max(0, end - count)
+        for line in reader.read_lines(first, end - first):
+            stream.write(line + "\n")
+        stream.flush()
+        printed = end  # Baris lengkap yang sudah ditulis
+        while follow:
+            time.sleep(POLL_INTERVAL)
+            change = reader.poll()
+            if change is None:
+                continue
+            if change != 'grew':
+                printed = 0
+            complete = len(reader.starts) - 1
+            for line in reader.read_lines(printed, complete - printed):
+                stream.write(line + "\n")
+            stream.flush()
+            printed = complete - reader.trim(complete)
+    finally:
+        reader.close()
@@ -0,0 +1,187 @@
+"""
+I/O throttle: token bucket bytes/detik & operasi/detik untuk copy, move, delete,
+compress dan extract, supaya bulk job tidak menghabiskan disk host production
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+
+# Level limit (bytes/detik, ops/detik) dari paling ketat ke paling longgar; (0, 0) = tanpa limit
+THROTTLE_LEVELS = [
+    (1024 * 1024, 50),
+    (5 * 1024 * 1024, 200),
+    (20 * 1024 * 1024, 500),
+    (50 * 1024 * 1024, 1000),
+    (200 * 1024 * 1024, 5000),
+    (0, 0),
+]
+MAX_SLEEP = 0.1         # Tidur per langkah saat menunggu token (perubahan limit langsung berlaku)
+YIELD_TIMEOUT = 2.0     # Job background menunggu scan foreground paling lama sekian detik per operasi
+UNITS = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+
+class TokenBucket:
+    """
+    Token bucket dengan rate per detik (0 = tanpa limit) dan kapasitas burst
+    rate x burst detik. consume() boleh membuat saldo negatif (chunk copy besar
+    lewat sekaligus), pemanggil berikutnya menunggu sampai saldo positif lagi.
+    """
+
+    def __init__(self, rate=0, burst=1.0):
+        self.burst = burst
+        self._lock = threading.Lock()
+        self.rate = rate
+        self._tokens = rate * burst
+        self._stamp = time.monotonic()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self._tokens = min(self._tokens, rate * self.burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.rate * self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def consume(self, amount):
+        """Ambil amount token, tidur selama saldo masih negatif. Return detik menunggu"""
+        waited = 0.0
+        while self.rate > 0:
+            with self._lock:
+                if self.rate <= 0:
+                    break
+                self._refill()
+                if self._tokens >= 0:
+                    self._tokens -= amount
+                    break
+                delay = min(MAX_SLEEP, -self._tokens / self.rate)
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+
+def parse_rate(text):
+    """
+    "20M" / "512k" / "1.5G" -> bytes/detik, "20M,500" -> (bytes, ops).
+    "0" / "off" / "" = tanpa limit. Return (bytes_per_sec, ops_per_sec).
+    """
+    text = (text or "").strip().lower()
+    if text in ("", "0", "off", "none"):
+        return 0, 0
+    rate, _, ops = text.partition(",")
+    rate = rate.strip().rstrip("/s").rstrip("b")
+    multiplier = UNITS.get(rate[-1:], 1)
+    if rate[-1:] in UNITS:
+        rate = rate[:-1]
+    try:
+        return int(float(rate) * multiplier), int(ops) if ops.strip() else 0
+    except ValueError:
+        raise ValueError(f"Invalid I/O limit: {text}")
+
+
+class IOThrottle:
+    """
+    Limit bersama untuk semua file operation: io(nbytes, ops) dipanggil sebelum
+    setiap operasi (copy file / chunk, rename, hapus, entry archive).
+    Thread yang menjalankan job background (JobQueue) menandai dirinya dengan
+    background(); selama ada scan foreground (listing yang ditunggu user)
+    operasi background menunggu dulu supaya navigasi tetap responsif.
+    """
+
+    def __init__(self, bytes_per_sec=0, ops_per_sec=0):
+        self.bytes = TokenBucket(bytes_per_sec)
+        self.ops = TokenBucket(ops_per_sec)
+        self._foreground = 0
+        self._foreground_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def enabled(self):
+        return self.bytes.rate > 0 or self.ops.rate > 0
+
+    def set_limits(self, bytes_per_sec=None, ops_per_sec=None):
+        if bytes_per_sec is not None:
+            self.bytes.set_rate(max(0, bytes_per_sec))
+        if ops_per_sec is not None:
+            self.ops.set_rate(max(0, ops_per_sec))
+
+    def adjust(self, step):
+        """Pindah ke level limit berikutnya: step > 0 lebih longgar, step < 0 lebih ketat. Return describe()"""
+        current = (self.bytes.rate, self.ops.rate)
+        if current in THROTTLE_LEVELS:
+            index = THROTTLE_LEVELS.index(current)
+        else:
+            # Limit custom (env / CLI): mulai dari level terdekat menurut bytes/detik,
+            # atau ops/detik jika hanya limit operasi yang diset
+            field = 0 if current[0] else 1
+            index = min(range(len(THROTTLE_LEVELS) - 1),
+                        key=lambda idx: abs(THROTTLE_LEVELS[idx][field] - current[field]))
+        index = max(0, min(len(THROTTLE_LEVELS) - 1, index + step))
+        self.set_limits(*THROTTLE_LEVELS[index])
+        return self.describe()
+
+    def describe(self):
+        from .file_system import format_size
+
+        if not self.enabled:
+            return "I/O limit: off"
+        parts = [f"{format_size(self.bytes.rate)}/s" if self.bytes.rate else "no byte limit"]
+        if self.ops.rate:
+            parts.append(f"{self.ops.rate} ops/s")
+        return "I/O limit: " + ", ".join(parts)
+
+    @contextmanager
+    def foreground(self):
+        """Tandai scan foreground: job background menunggu sampai selesai"""
+        with self._foreground_lock:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._foreground_lock:
+                self._foreground -= 1
+
+    @contextmanager
+    def background(self):
+        """Tandai thread ini sebagai job background (prioritas rendah)"""
+        previous = getattr(self._local, 'background', False)
+        self._local.background = True
+        try:
+            yield
+        finally:
+            self._local.background = previous
+
+    def io(self, nbytes=0, ops=1):
+        """Tunggu jatah untuk ops operasi dan nbytes byte (langsung return jika tanpa limit)"""
+        if self._foreground and getattr(self._local, 'background', False):
+            deadline = time.monotonic() + YIELD_TIMEOUT
+            while self._foreground and time.monotonic() < deadline:
+                time.sleep(0.01)
+        if ops and self.ops.rate > 0:
+            self.ops.consume(ops)
+        if nbytes and self.bytes.rate > 0:
+            self.bytes.consume(nbytes)
+
+
+_throttle = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle():
+    """
+    Throttle global. Limit awal dari env FILE_EXPLORER_IO_LIMIT
+    (mis. "20M" atau "20M,500" = 20 MB/detik & 500 operasi/detik).
+    """
+    global _throttle
+    with _throttle_lock:
+        if _throttle is None:
+            try:
+                limits = parse_rate(os.environ.get("FILE_EXPLORER_IO_LIMIT", ""))
+            except ValueError:
+                limits = (0, 0)
+            _throttle = IOThrottle(*limits)
+        return _throttle
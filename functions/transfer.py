@@ -0,0 +1,253 @@
+"""
+Chunked, resumable file copy (temp name + journal + atomic rename)
+"""
+import os
+import json
+import time
+import errno
+import shutil
+import hashlib
+from .io_profile import get_profile_store
+from .throttle import get_throttle
+
+
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024  # File lebih kecil dari ini cukup pakai shutil.copy2
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+PARTIAL_SUFFIX = ".partial"
+JOURNAL_SUFFIX = ".partial.json"
+JOURNAL_SYNC_BYTES = 64 * 1024 * 1024  # Data + journal di-fsync tiap sekian bytes (bukan per chunk)
+DIGEST_LINE_SIZE = 33                  # blake2b 16 byte = 32 hex + newline
+
+
+def get_copy_chunk_size(path=None):
+    """
+    Ukuran chunk copy dalam bytes. Bisa di-tune lewat env FILE_EXPLORER_CHUNK_MB
+    (mis. 1-4 MB untuk HDD, 16-64 MB untuk NVMe). Tanpa env: dari throughput
+    teramati mount tujuan (path), default 8 MB.
+    """
+    try:
+        size_mb = float(os.environ.get("FILE_EXPLORER_CHUNK_MB", ""))
+    except ValueError:
+        if path is not None:
+            return get_profile_store().chunk_size(path) or DEFAULT_CHUNK_SIZE
+        return DEFAULT_CHUNK_SIZE
+    return max(64 * 1024, int(size_mb * 1024 * 1024))
+
+
+def _chunk_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _read_journal(journal_path):
+    """
+    Baca journal: (header, digests, offset akhir tiap baris digest).
+    Baris terakhir yang terpotong (crash saat append) diabaikan.
+    """
+    try:
+        with open(journal_path, 'rb') as f:
+            header = json.loads(f.readline())
+            position = f.tell()
+            digests, ends = [], []
+            for line in f:
+                if not line.endswith(b"\n") or len(line) != DIGEST_LINE_SIZE:
+                    break
+                position += len(line)
+                digests.append(line[:-1].decode('ascii'))
+                ends.append(position)
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None, [], []
+    if not isinstance(header, dict):
+        return None, [], []
+    return header, digests, ends
+
+
+def _load_journal(journal_path, source, stat, chunk_size):
+    """Load journal jika masih cocok dengan source (size, mtime, chunk size sama): (digests, ends)"""
+    header, digests, ends = _read_journal(journal_path)
+    if (header is None or header.get('source') != source or header.get('size') != stat.st_size or
+            header.get('mtime') != stat.st_mtime or header.get('chunk_size') != chunk_size):
+        return None
+    return digests, ends
+
+
+def _journal_chunk_size(journal_path):
+    """Chunk size copy yang terputus (resume harus memakai chunk size yang sama)"""
+    try:
+        with open(journal_path, 'rb') as f:
+            return json.loads(f.readline()).get('chunk_size')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _open_journal(journal_path, header, keep_bytes=0):
+    """
+    Buka journal untuk append. keep_bytes > 0: journal lama dipotong ke prefix
+    yang sudah terverifikasi; 0: journal baru (baris header) ditulis dulu.
+    """
+    if keep_bytes:
+        journal = open(journal_path, 'r+b')
+        journal.truncate(keep_bytes)
+        journal.seek(keep_bytes)
+    else:
+        journal = open(journal_path, 'wb')
+        journal.write(json.dumps(header).encode('utf-8') + b"\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+    return journal
+
+
+def _resume_point(partial_path, digests, chunk_size):
+    """
+    Cek chunk terakhir yang tercatat di journal masih cocok dengan isi file partial.
+    Return jumlah chunk yang valid (0 = mulai dari awal).
+    """
+    count = len(digests)
+    try:
+        with open(partial_path, 'rb') as f:
+            while count:
+                offset = (count - 1) * chunk_size
+                f.seek(offset)
+                data = f.read(chunk_size)
+                if data and _chunk_digest(data) == digests[count - 1]:
+                    return count
+                # Chunk terakhir rusak (mis. crash sebelum data sampai disk), mundur satu
+                count -= 1
+    except OSError:
+        pass
+    return 0
+
+
+def copy_file_resumable(source, dest, chunk_size=None, verify=False, progress=None, should_cancel=None):
+    """
+    Copy satu file per chunk ke `dest.partial`, lalu rename atomic ke `dest`.
+
+    Digest setiap chunk di-append ke journal `dest.partial.json` (baris header
+    JSON, lalu satu baris digest per chunk). Data di-fsync per batch
+    (JOURNAL_SYNC_BYTES) dan digest batch itu baru ditulis & di-fsync setelahnya,
+    jadi journal tidak pernah mencatat chunk yang belum sampai disk. Copy yang
+    terputus bisa dilanjutkan dari chunk terakhir yang terverifikasi dengan
+    memanggil fungsi ini lagi dengan argumen yang sama.
+
+    verify=True: setiap chunk dibaca ulang dari tujuan dan dicocokkan digest-nya
+    di pass yang sama (tanpa baca ulang source). Baca ulang ini biasanya dilayani
+    page cache OS, jadi hanya membuktikan data yang ditulis benar sampai ke cache
+    file tujuan, bukan bahwa data sudah benar di media disk.
+
+    Return blake2b digest seluruh file (sama dengan hash_full), atau None jika
+    dibatalkan lewat should_cancel (file partial & journal disimpan untuk resume).
+    """
+    source = os.path.abspath(source)
+    dest = os.path.abspath(dest)
+    partial_path = dest + PARTIAL_SUFFIX
+    journal_path = dest + JOURNAL_SUFFIX
+    chunk_size = chunk_size or _journal_chunk_size(journal_path) or get_copy_chunk_size(os.path.dirname(dest))
+
+    stat = os.stat(source)
+    loaded = _load_journal(journal_path, source, stat, chunk_size)
+    done_chunks = 0
+    if loaded is not None and os.path.exists(partial_path):
+        done_chunks = _resume_point(partial_path, loaded[0], chunk_size)
+    header = {'source': source, 'size': stat.st_size, 'mtime': stat.st_mtime, 'chunk_size': chunk_size}
+    keep_bytes = loaded[1][done_chunks - 1] if done_chunks else 0
+
+    file_digest = hashlib.blake2b()
+    offset = done_chunks * chunk_size
+    mode = 'r+b' if done_chunks and os.path.exists(partial_path) else 'wb'
+    sync_every = max(1, JOURNAL_SYNC_BYTES // chunk_size)
+
+    with open(source, 'rb') as src, open(partial_path, mode) as dst, \
+            _open_journal(journal_path, header, keep_bytes) as journal:
+        if done_chunks:
+            # Bangun ulang digest dari bagian yang sudah ada (baca lokal, bukan copy ulang)
+            dst.seek(0)
+            remaining = offset
+            while remaining > 0:
+                data = dst.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                file_digest.update(data)
+                remaining -= len(data)
+            dst.truncate(offset)
+            dst.seek(offset)
+            src.seek(offset)
+
+        pending = []  # Digest chunk yang datanya belum di-fsync
+
+        def sync_batch():
+            if pending:
+                os.fsync(dst.fileno())
+                journal.write("".join(digest + "\n" for digest in pending).encode('ascii'))
+                journal.flush()
+                os.fsync(journal.fileno())
+                pending.clear()
+
+        copied = offset
+        throttle = get_throttle()
+        throttle.io()
+        started = time.monotonic()
+        while True:
+            if should_cancel is not None and should_cancel():
+                sync_batch()
+                return None
+
+            data = src.read(chunk_size)
+            if not data:
+                break
+            throttle.io(len(data), ops=0)
+
+            position = dst.tell()
+            dst.write(data)
+            dst.flush()
+
+            digest = _chunk_digest(data)
+            if verify:
+                with open(partial_path, 'rb') as check:
+                    check.seek(position)
+                    if _chunk_digest(check.read(len(data))) != digest:
+                        raise OSError(errno.EIO, f"Checksum mismatch at offset {position}", dest)
+
+            file_digest.update(data)
+            pending.append(digest)
+            if len(pending) >= sync_every:
+                sync_batch()
+
+            copied += len(data)
+            if progress is not None:
+                progress(copied, stat.st_size)
+        sync_batch()
+
+    # Throughput copy ini jadi dasar chunk size copy berikutnya ke mount yang sama
+    store = get_profile_store()
+    store.record_transfer(os.path.dirname(dest), copied - offset, time.monotonic() - started)
+    store.save()
+
+    shutil.copystat(source, partial_path)
+    os.replace(partial_path, dest)
+    try:
+        os.remove(journal_path)
+    except OSError:
+        pass
+    return file_digest.hexdigest()
+
+
+def copy_file(source, dest, **kwargs):
+    """Copy file: file besar lewat copy_file_resumable, sisanya shutil.copy2"""
+    try:
+        size = os.path.getsize(source)
+    except OSError:
+        size = 0
+    if size >= LARGE_FILE_THRESHOLD and not os.path.islink(source):
+        if copy_file_resumable(source, dest, **kwargs) is None:
+            raise OSError(errno.EINTR, "Copy cancelled", source)
+        return dest
+    get_throttle().io(size)
+    return shutil.copy2(source, dest, follow_symlinks=False)
+
+
+def discard_partial(dest):
+    """Hapus sisa copy yang tidak akan dilanjutkan (file .partial dan journal)"""
+    for path in (dest + PARTIAL_SUFFIX, dest + JOURNAL_SUFFIX):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,234 @@
+"""
+Tree walker bersama untuk copy, zip, hapus permanen dan du: hard link dikenali
+lewat (dev, inode), symlink / junction mengikuti policy, dan loop (link ke
+folder induk) dideteksi
+"""
+import os
+import stat as stat_module
+import shutil
+from .transfer import copy_file
+
+
+SYMLINK_POLICIES = ('preserve', 'follow', 'skip')
+DEFAULT_SYMLINK_POLICY = 'preserve'
+IO_REPARSE_TAG_MOUNT_POINT = getattr(stat_module, 'IO_REPARSE_TAG_MOUNT_POINT', 0xA0000003)
+
+
+def get_symlink_policy():
+    """
+    Policy symlink untuk copy: preserve (buat ulang link-nya), follow (copy isi
+    target) atau skip. Bisa diatur lewat env FILE_EXPLORER_SYMLINKS.
+    """
+    policy = os.environ.get("FILE_EXPLORER_SYMLINKS", "").strip().lower()
+    return policy if policy in SYMLINK_POLICIES else DEFAULT_SYMLINK_POLICY
+
+
+class WalkEntry:
+    """
+    Satu item hasil walk_tree. kind: dir, file, hardlink (link = rel path
+    kemunculan pertama inode yang sama), symlink (link = target), loop (folder
+    yang menunjuk ke folder induknya sendiri, tidak dimasuki).
+    """
+
+    __slots__ = ('path', 'rel', 'kind', 'stat', 'link')
+
+    def __init__(self, path, rel, kind, stat=None, link=None):
+        self.path = path
+        self.rel = rel
+        self.kind = kind
+        self.stat = stat
+        self.link = link
+
+
+def is_junction(entry):
+    """True jika DirEntry adalah NTFS junction (bukan symlink, tapi tetap link ke folder lain)"""
+    check = getattr(entry, 'is_junction', None)  # Python 3.12+
+    if check is not None:
+        return check()
+    if os.name != 'nt':
+        return False
+    try:
+        stat = entry.stat(follow_symlinks=False)
+    except OSError:
+        return False
+    return (bool(stat.st_file_attributes & stat_module.FILE_ATTRIBUTE_REPARSE_POINT)
+            and stat.st_reparse_tag == IO_REPARSE_TAG_MOUNT_POINT)
+
+
+def link_key(path, stat, resolve=True):
+    """
+    (dev, inode) untuk file dengan st_nlink > 1, None untuk file biasa.
+    Di Windows DirEntry.stat() tidak mengisi st_nlink / st_ino (selalu 0),
+    jadi dengan resolve=True file di-stat ulang dengan os.stat.
+    """
+    if stat.st_nlink == 0 and resolve and os.name == 'nt':
+        stat = os.stat(path, follow_symlinks=False)
+    if stat.st_nlink <= 1:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+class LinkTracker:
+    """Ingat file dengan st_nlink > 1 berdasarkan (dev, inode), lihat link_key"""
+
+    def __init__(self, resolve=True):
+        self.resolve = resolve
+        self._seen = {}
+
+    def first_seen(self, path, stat, rel=None):
+        """rel / path kemunculan pertama jika inode ini sudah pernah dilihat, selain itu None (lalu dicatat)"""
+        key = link_key(path, stat, self.resolve)
+        if key is None:
+            return None
+        first = self._seen.get(key)
+        if first is None:
+            self._seen[key] = rel if rel is not None else path
+        return first
+
+
+def dest_in_source(src, dst):
+    """True jika dst sama dengan src atau ada di dalam src (seperti shutil._destinsrc)"""
+    src = os.path.normcase(os.path.realpath(src))
+    dst = os.path.normcase(os.path.realpath(dst))
+    return dst == src or dst.startswith(src.rstrip(os.sep) + os.sep)
+
+
+def _dir_identity(path):
+    stat = os.stat(path)
+    return (stat.st_dev, stat.st_ino)
+
+
+def walk_tree(root, symlinks=DEFAULT_SYMLINK_POLICY, hardlinks=True, errors=None):
+    """
+    Walk subtree root (root sendiri tidak di-yield) tanpa rekursi, folder
+    di-yield sebelum isinya. rel = path relatif terhadap root.
+    symlinks: preserve (yield sebagai 'symlink'), follow (masuk ke target,
+    link yang rusak tetap 'symlink'), skip. hardlinks=True: kemunculan kedua
+    dst. dari inode yang sama di-yield sebagai 'hardlink'.
+    NTFS junction diperlakukan seperti symlink folder (ikut policy symlinks).
+    Folder yang identitasnya (dev, inode) sama dengan salah satu induknya
+    di-yield sebagai 'loop' dan tidak dimasuki.
+    errors: list untuk menampung (path, pesan) dari folder / item yang gagal dibaca.
+    """
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(f"Unknown symlink policy: {symlinks}")
+    tracker = LinkTracker() if hardlinks else None
+    stack = [(root, "", (_dir_identity(root),))]
+
+    while stack:
+        folder, rel_folder, ancestors = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError as e:
+            if errors is not None:
+                errors.append((folder, str(e)))
+            continue
+
+        for entry in entries:
+            rel = os.path.join(rel_folder, entry.name) if rel_folder else entry.name
+            try:
+                stat = None
+                if entry.is_symlink() or is_junction(entry):
+                    if symlinks == 'skip':
+                        continue
+                    if symlinks == 'preserve':
+                        yield WalkEntry(entry.path, rel, 'symlink', link=os.readlink(entry.path))
+                        continue
+                    try:
+                        stat = os.stat(entry.path)
+                    except OSError:
+                        yield WalkEntry(entry.path, rel, 'symlink', link=os.readlink(entry.path))
+                        continue
+                    is_dir = stat_module.S_ISDIR(stat.st_mode)
+                else:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+
+                if is_dir:
+                    # Bind mount / junction yang di-follow tetap bisa membuat loop
+                    identity = _dir_identity(entry.path)
+                    if identity in ancestors:
+                        yield WalkEntry(entry.path, rel, 'loop')
+                        continue
+                    yield WalkEntry(entry.path, rel, 'dir')
+                    stack.append((entry.path, rel, ancestors + (identity,)))
+                    continue
+
+                if stat is None:
+                    stat = entry.stat(follow_symlinks=False)
+                first = tracker.first_seen(entry.path, stat, rel) if tracker is not None else None
+                if first is not None:
+                    yield WalkEntry(entry.path, rel, 'hardlink', stat, first)
+                else:
+                    yield WalkEntry(entry.path, rel, 'file', stat)
+            except OSError as e:
+                if errors is not None:
+                    errors.append((entry.path, str(e)))
+
+
+def _make_symlink(target, dest, source):
+    try:
+        os.symlink(target, dest, target_is_directory=os.path.isdir(source))
+    except OSError:
+        # Windows tanpa hak membuat symlink: copy isi target (jika file)
+        if not os.path.isfile(source):
+            raise
+        copy_file(source, dest)
+
+
+def copy_tree(src, dst, symlinks=None, resume=False, copy_function=copy_file):
+    """
+    Pengganti shutil.copytree: hard link di dalam src dibuat ulang sebagai hard
+    link di dst (data di-copy sekali), symlink sesuai policy, loop dilewati.
+    resume=True: folder / link yang sudah ada dipakai ulang (replay journal).
+    Error dikumpulkan lalu di-raise sebagai shutil.Error di akhir.
+    dst di dalam src ditolak (walk akan ikut menyalin hasil copy-nya sendiri).
+    Return (files, hardlinks, bytes yang di-copy).
+    """
+    if dest_in_source(src, dst):
+        raise shutil.Error(f"Cannot copy a folder into itself: {os.path.basename(src)}")
+    symlinks = symlinks or get_symlink_policy()
+    errors = []
+    walk_errors = []
+    files = links = copied = 0
+    dirs = [(src, dst)]
+    os.makedirs(dst, exist_ok=resume)
+
+    for entry in walk_tree(src, symlinks, errors=walk_errors):
+        target = os.path.join(dst, entry.rel)
+        try:
+            if entry.kind == 'dir':
+                os.makedirs(target, exist_ok=resume)
+                dirs.append((entry.path, target))
+            elif entry.kind == 'file':
+                copy_function(entry.path, target)
+                files += 1
+                copied += entry.stat.st_size
+            elif entry.kind == 'hardlink':
+                if resume and os.path.lexists(target):
+                    continue
+                try:
+                    os.link(os.path.join(dst, entry.link), target)
+                    links += 1
+                except OSError:
+                    # File system tujuan tanpa hard link (FAT / exFAT): copy biasa
+                    copy_function(entry.path, target)
+                    files += 1
+                    copied += entry.stat.st_size
+            elif entry.kind == 'symlink':
+                if resume and os.path.lexists(target):
+                    continue
+                _make_symlink(entry.link, target, entry.path)
+        except (OSError, shutil.Error) as e:
+            errors.append((entry.path, target, str(e)))
+
+    errors.extend((path, "", f"Cannot read: {message}") for path, message in walk_errors)
+    # Timestamp folder di-set terakhir (menulis isi folder mengubah mtime-nya)
+    for source_dir, dest_dir in reversed(dirs):
+        try:
+            shutil.copystat(source_dir, dest_dir)
+        except OSError:
+            pass
+    if errors:
+        raise shutil.Error(errors)
+    return files, links, copied
@@ -4,6 +4,7 @@ UI rendering functions
 import os
 import shutil
 import math
+from . import metrics
 
 
 def clear_screen():
@@ -81,11 +82,13 @@ def draw_header(current_path, search_mode=False, search_query="", filter_ext="",
     print("├" + "─" * (cols - 2) + "┤")
 
 
-def draw_footer(search_mode=False, is_filter_mode=False, has_pagination=False):
+def draw_footer(search_mode=False, is_filter_mode=False, has_pagination=False, dual_pane=False):
     """Gambar footer dengan help commands"""
     cols, _ = get_terminal_size()
     
-    if search_mode:
+    if dual_pane:
+        help_text = " [Tab:Switch pane F5:Copy→ F6:Move→ Ctrl+S:Sync→ Space:Select O:Single pane Q:Quit] "
+    elif search_mode:
         if is_filter_mode:
             help_text = " [Type extension | Enter: Apply | ESC: Cancel] "
         else:
@@ -100,7 +103,7 @@ def draw_footer(search_mode=False, is_filter_mode=False, has_pagination=False):
     print(help_text.center(cols))
 
 
-def render_ui_single_column(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, page=0, items_per_page=20):
+def render_ui_single_column(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, page=0, items_per_page=20, viewport=None):
     """Render UI single column dengan pagination"""
     from .sorting import format_item_display
     
@@ -111,17 +114,23 @@ def render_ui_single_column(current_path, items, selected_index, message="", sea
     
     cols, lines = get_terminal_size()
     
-    # Calculate pagination
-    total_pages = math.ceil(len(items) / items_per_page) if items else 1
-    current_page = page + 1
-    start_idx = page * items_per_page
-    end_idx = min(start_idx + items_per_page, len(items))
-    visible_items = items[start_idx:end_idx] if items else []
-    
-    # Page info
-    page_info = ""
-    if len(items) > items_per_page:
-        page_info = f" Page {current_page}/{total_pages} ({len(items)} items total)"
+    if viewport is not None:
+        # Viewport sudah tahu halaman aktif, ambil window-nya saja
+        start_idx = viewport.start
+        visible_items = viewport.window(items)
+        page_info = viewport.page_info()
+    else:
+        # Calculate pagination
+        total_pages = math.ceil(len(items) / items_per_page) if items else 1
+        current_page = page + 1
+        start_idx = page * items_per_page
+        end_idx = min(start_idx + items_per_page, len(items))
+        visible_items = items[start_idx:end_idx] if items else []
+        
+        # Page info
+        page_info = ""
+        if len(items) > items_per_page:
+            page_info = f" Page {current_page}/{total_pages} ({len(items)} items total)"
     
     # Header
     draw_header(current_path, search_mode, search_query, filter_ext if not search_mode else (filter_ext if is_filter else None), clipboard_info, sort_mode, view_mode, len(selected_items), 1, page_info)
@@ -139,8 +148,8 @@ def render_ui_single_column(current_path, items, selected_index, message="", sea
             actual_idx = start_idx + idx
             display_text = format_item_display(item, cols - 6, view_mode)
             
-            # Check if item is selected
-            is_selected = actual_idx in selected_items
+            # Check if item is selected (selection berdasarkan path)
+            is_selected = item[4] in selected_items
             
             if actual_idx == selected_index:
                 # Current cursor position
@@ -157,13 +166,32 @@ def render_ui_single_column(current_path, items, selected_index, message="", sea
     
     # Footer
     print()
-    draw_footer(search_mode, is_filter, len(items) > items_per_page)
+    draw_footer(search_mode, is_filter, bool(page_info))
 
 
-def render_ui_multi_column(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, num_columns=2, page=0):
-    """Render UI multi-column dengan pagination"""
+def format_cell(item, column_width, is_cursor, is_selected, view_mode="detailed"):
+    """Satu cell grid (prefix cursor/selection + item), lebar column_width - 1"""
     from .sorting import format_item_display
     
+    # Format display dengan column width
+    display_text = format_item_display(item, column_width - 5, view_mode)
+    
+    # Truncate jika terlalu panjang
+    if len(display_text) > column_width - 5:
+        display_text = display_text[:column_width-8] + "..."
+    
+    # Add selection/cursor indicators
+    if is_cursor:
+        prefix = "✓>" if is_selected else "> "
+    else:
+        prefix = "✓ " if is_selected else "  "
+    
+    cell = prefix + display_text
+    return cell[:column_width-1].ljust(column_width-1)
+
+
+def render_ui_multi_column(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, num_columns=2, page=0, viewport=None):
+    """Render UI multi-column dengan pagination"""
     if selected_items is None:
         selected_items = set()
     
@@ -171,31 +199,41 @@ def render_ui_multi_column(current_path, items, selected_index, message="", sear
     
     cols, lines = get_terminal_size()
     
-    # Calculate items per page based on screen height
-    extra_lines = 8  # Header + footer + margins
-    if message:
-        extra_lines += 2
-    if search_mode or filter_ext:
-        extra_lines += 1
-    if clipboard_info:
-        extra_lines += 1
-    if len(items) > (lines - extra_lines):
-        extra_lines += 1  # Page info
-    
-    rows_per_page = lines - extra_lines
-    items_per_page = rows_per_page * num_columns
-    
-    # Calculate pagination
-    total_pages = math.ceil(len(items) / items_per_page) if items else 1
-    current_page = page + 1
-    start_idx = page * items_per_page
-    end_idx = min(start_idx + items_per_page, len(items))
-    visible_items = items[start_idx:end_idx] if items else []
-    
-    # Page info
-    page_info = ""
-    if len(items) > items_per_page:
-        page_info = f" Page {current_page}/{total_pages} ({len(items)} items total)"
+    if viewport is not None:
+        # Layout grid harus sama dengan yang dipakai navigasi di viewport
+        start_idx = viewport.start
+        visible_items = viewport.window(items)
+        page_info = viewport.page_info()
+        num_rows = min(viewport.rows_per_page, len(visible_items))
+    else:
+        # Calculate items per page based on screen height
+        extra_lines = 8  # Header + footer + margins
+        if message:
+            extra_lines += 2
+        if search_mode or filter_ext:
+            extra_lines += 1
+        if clipboard_info:
+            extra_lines += 1
+        if len(items) > (lines - extra_lines):
+            extra_lines += 1  # Page info
+        
+        rows_per_page = lines - extra_lines
+        items_per_page = rows_per_page * num_columns
+        
+        # Calculate pagination
+        total_pages = math.ceil(len(items) / items_per_page) if items else 1
+        current_page = page + 1
+        start_idx = page * items_per_page
+        end_idx = min(start_idx + items_per_page, len(items))
+        visible_items = items[start_idx:end_idx] if items else []
+        
+        # Split items into rows
+        num_rows = math.ceil(len(visible_items) / num_columns)
+        
+        # Page info
+        page_info = ""
+        if len(items) > items_per_page:
+            page_info = f" Page {current_page}/{total_pages} ({len(items)} items total)"
     
     # Header
     draw_header(current_path, search_mode, search_query, filter_ext if not search_mode else (filter_ext if is_filter else None), clipboard_info, sort_mode, view_mode, len(selected_items), num_columns, page_info)
@@ -212,9 +250,6 @@ def render_ui_multi_column(current_path, items, selected_index, message="", sear
     if not visible_items:
         print("   (No items found)")
     else:
-        # Split items into rows
-        num_rows = math.ceil(len(visible_items) / num_columns)
-        
         for row in range(num_rows):
             line = " "
             
@@ -225,31 +260,11 @@ def render_ui_multi_column(current_path, items, selected_index, message="", sear
                     actual_idx = start_idx + idx
                     item = visible_items[idx]
                     
-                    # Format display dengan column width
-                    display_text = format_item_display(item, column_width - 5, view_mode)
-                    
-                    # Truncate jika terlalu panjang
-                    if len(display_text) > column_width - 5:
-                        display_text = display_text[:column_width-8] + "..."
-                    
-                    # Check if item is selected
-                    is_selected = actual_idx in selected_items
-                    
-                    # Add selection/cursor indicators
-                    if actual_idx == selected_index:
-                        if is_selected:
-                            prefix = "✓>"
-                        else:
-                            prefix = "> "
-                    else:
-                        if is_selected:
-                            prefix = "✓ "
-                        else:
-                            prefix = "  "
+                    # Check if item is selected (selection berdasarkan path)
+                    is_selected = item[4] in selected_items
                     
                     # Add to line with padding
-                    cell = prefix + display_text
-                    cell = cell[:column_width-1].ljust(column_width-1)
+                    cell = format_cell(item, column_width, actual_idx == selected_index, is_selected, view_mode)
                     line += cell + " "
                 else:
                     # Empty cell
@@ -259,12 +274,159 @@ def render_ui_multi_column(current_path, items, selected_index, message="", sear
     
     # Footer
     print()
-    draw_footer(search_mode, is_filter, len(items) > items_per_page)
+    draw_footer(search_mode, is_filter, bool(page_info))
 
 
-def render_ui(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, num_columns=1, page=0):
+@metrics.timed
+def render_ui(current_path, items, selected_index, message="", search_mode=False, search_query="", filter_ext="", is_filter=False, clipboard_info="", sort_mode="name", view_mode="detailed", selected_items=None, num_columns=1, page=0, viewport=None):
     """Render UI dengan single atau multi-column"""
+    overlay = metrics.format_overlay(get_terminal_size()[0]) if metrics.is_enabled() else []
+    
+    if viewport is not None:
+        # Viewport yang menentukan cursor & jumlah kolom efektif
+        viewport.reserved_lines = len(overlay)
+        viewport.sync(items)
+        selected_index = viewport.cursor
+        num_columns = viewport.effective_columns
+    
     if num_columns == 1:
-        render_ui_single_column(current_path, items, selected_index, message, search_mode, search_query, filter_ext, is_filter, clipboard_info, sort_mode, view_mode, selected_items, page)
+        render_ui_single_column(current_path, items, selected_index, message, search_mode, search_query, filter_ext, is_filter, clipboard_info, sort_mode, view_mode, selected_items, page, viewport=viewport)
     else:
-        render_ui_multi_column(current_path, items, selected_index, message, search_mode, search_query, filter_ext, is_filter, clipboard_info, sort_mode, view_mode, selected_items, num_columns, page)
\ No newline at end of file
+        render_ui_multi_column(current_path, items, selected_index, message, search_mode, search_query, filter_ext, is_filter, clipboard_info, sort_mode, view_mode, selected_items, num_columns, page, viewport=viewport)
+    
+    # Overlay metrics (toggle dengan tombol `)
+    for line in overlay:
+        print(line)
+
+
+# Baris pane terakhir yang digambar: index pane -> (key, lines)
+_pane_lines = {}
+
+
+def _render_pane(index, session, viewport, view_mode, width, rows, is_active, version):
+    """
+    Baris teks satu pane (judul + rows). Hasil di-cache per pane, jadi perubahan di
+    satu pane (cursor, job selesai, event watcher) tidak memformat ulang pane lainnya.
+    """
+    items = session.items
+    key = (session.path, version, id(items), len(items), viewport.start, viewport.cursor,
+           session.sort_mode, session.sort_reverse, session.selection.version, view_mode, width, rows, is_active)
+    cached = _pane_lines.get(index)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    marker = "▶" if is_active else " "
+    title = f"{marker} {session.path}"
+    info = f" [{session.sort_mode}{' ↓' if session.sort_reverse else ''}] {len(items)} items"
+    if session.selection:
+        info += f", {len(session.selection)} selected"
+    if len(title) + len(info) > width - 1:
+        title = title[:max(0, width - 1 - len(info) - 3)] + "..."
+    lines = [(title + info)[:width - 1].ljust(width - 1), "─" * (width - 1)]
+
+    visible_items = viewport.window(items)
+    for idx in range(rows):
+        if idx < len(visible_items):
+            item = visible_items[idx]
+            is_cursor = is_active and viewport.start + idx == viewport.cursor
+            lines.append(format_cell(item, width, is_cursor, item[4] in session.selection, view_mode))
+        else:
+            lines.append(" " * (width - 1))
+
+    _pane_lines[index] = (key, lines)
+    return lines
+
+
+@metrics.timed
+def render_ui_dual_pane(panes, viewports, active, message="", view_modes=("detailed", "detailed"), clipboard_info="", versions=(0, 0), job_status=""):
+    """
+    Render dua pane berdampingan (layout di atas grid multi-column, satu kolom per pane).
+    job_status: status line job background & I/O limit di atas footer.
+    """
+    overlay = metrics.format_overlay(get_terminal_size()[0]) if metrics.is_enabled() else []
+    session = panes[active]
+
+    clear_screen()
+    cols, _ = get_terminal_size()
+    pane_width = (cols - 3) // 2
+
+    for viewport, pane in zip(viewports, panes):
+        viewport.reserved_lines = len(overlay) + 2 + (1 if job_status else 0)  # Judul pane + separator (+ status job)
+        viewport.sync(pane.items)
+    rows = max(viewport.rows_per_page for viewport in viewports)
+
+    draw_header(session.path, filter_ext=session.filter_ext, clipboard_info=clipboard_info, sort_mode=session.sort_mode,
+                view_mode=view_modes[active], selected_count=len(session.selection), num_columns=2)
+
+    # Message (jika ada)
+    if message:
+        print(f" ⓘ {message}")
+        print()
+
+    left, right = (_render_pane(idx, panes[idx], viewports[idx], view_modes[idx], pane_width, rows, idx == active, versions[idx])
+                   for idx in range(2))
+    print("\n".join(f" {left_line}│{right_line}" for left_line, right_line in zip(left, right)))
+
+    # Footer
+    print()
+    if job_status:
+        print(f" {job_status}"[:cols - 1])
+    draw_footer(dual_pane=True)
+
+    # Overlay metrics (toggle dengan tombol `)
+    for line in overlay:
+        print(line)
+
+
+def _preview_lines(preview, width, rows):
+    """Baris panel preview (judul + isi), dipotong ke lebar & tinggi panel"""
+    if preview is None:
+        title, body, truncated = "Loading preview...", [], False
+    else:
+        title, body, truncated = preview.title, preview.lines, preview.truncated
+
+    lines = [title[:width - 1].ljust(width - 1), "─" * (width - 1)]
+    body = body[:rows]
+    if truncated and len(body) == rows and rows > 0:
+        body = body[:-1] + ["…"]
+    elif truncated:
+        body = body + ["…"]
+    for line in body:
+        lines.append(line[:width - 1].ljust(width - 1))
+    while len(lines) < rows + 2:
+        lines.append(" " * (width - 1))
+    return lines
+
+
+@metrics.timed
+def render_ui_preview(session, viewport, preview, message="", view_mode="detailed", clipboard_info="", version=0):
+    """Render listing (kiri) dan panel preview file di bawah cursor (kanan)"""
+    overlay = metrics.format_overlay(get_terminal_size()[0]) if metrics.is_enabled() else []
+
+    clear_screen()
+    cols, _ = get_terminal_size()
+    pane_width = (cols - 3) // 2
+
+    viewport.reserved_lines = len(overlay) + 2  # Judul pane + separator
+    viewport.sync(session.items)
+    rows = viewport.rows_per_page
+
+    draw_header(session.path, filter_ext=session.filter_ext, clipboard_info=clipboard_info, sort_mode=session.sort_mode,
+                view_mode=view_mode, selected_count=len(session.selection), num_columns=1, page_info=viewport.page_info())
+
+    # Message (jika ada)
+    if message:
+        print(f" ⓘ {message}")
+        print()
+
+    left = _render_pane("preview", session, viewport, view_mode, pane_width, rows, True, version)
+    right = _preview_lines(preview, pane_width, rows)
+    print("\n".join(f" {left_line}│{right_line}" for left_line, right_line in zip(left, right)))
+
+    # Footer
+    print()
+    draw_footer(has_pagination=bool(viewport.page_info()))
+
+    # Overlay metrics (toggle dengan tombol `)
+    for line in overlay:
+        print(line)
@@ -0,0 +1,293 @@
+"""
+Viewport / virtualized paging
+"""
+import math
+from .ui import get_terminal_size
+
+
+# Header + footer + message + info lines yang mungkin muncul
+LAYOUT_OVERHEAD = 12
+
+
+def calculate_layout_info(num_columns, total_items, lines=None):
+    """Calculate layout information and adjust columns if needed"""
+    if lines is None:
+        _, lines = get_terminal_size()
+
+    # Calculate available space
+    available_rows = max(1, lines - LAYOUT_OVERHEAD)
+
+    # Determine effective columns based on items
+    effective_columns = num_columns
+
+    if num_columns > 1:
+        # Calculate minimum items needed for multi-column layout
+        min_items_for_columns = available_rows * num_columns
+
+        # If not enough items to fill all columns, reduce column count
+        if total_items < min_items_for_columns:
+            # Try to find optimal column count
+            for cols_test in range(num_columns, 0, -1):
+                if total_items >= available_rows * cols_test or cols_test == 1:
+                    effective_columns = cols_test
+                    break
+
+    # Calculate items per page with effective columns
+    rows_per_page = available_rows
+    items_per_page = rows_per_page * effective_columns
+
+    return effective_columns, items_per_page, rows_per_page
+
+
+def get_position_in_grid(selected, num_columns, rows_per_page):
+    """Get row and column position of selected item in grid"""
+    if num_columns == 1:
+        return selected, 0
+
+    # In multi-column layout, items are arranged in column-major order
+    row = selected % rows_per_page
+    col = selected // rows_per_page
+
+    return row, col
+
+
+def move_in_grid(selected, direction, num_columns, rows_per_page, total_items):
+    """Calculate new selection based on direction in grid layout"""
+    if total_items == 0:
+        return 0
+
+    if num_columns == 1:
+        # Single column - simple up/down
+        if direction == 'UP':
+            return max(0, selected - 1)
+        elif direction == 'DOWN':
+            return min(total_items - 1, selected + 1)
+        return selected
+
+    # Multi-column layout
+    current_row, current_col = get_position_in_grid(selected, num_columns, rows_per_page)
+
+    if direction == 'UP':
+        # Move up one row
+        new_row = current_row - 1
+        if new_row < 0:
+            # Wrap to bottom of previous column
+            new_col = current_col - 1
+            if new_col < 0:
+                return 0  # Already at top-left
+            new_row = rows_per_page - 1
+            new_selected = new_col * rows_per_page + new_row
+            return min(total_items - 1, max(0, new_selected))
+        else:
+            new_selected = current_col * rows_per_page + new_row
+            return min(total_items - 1, new_selected)
+
+    elif direction == 'DOWN':
+        # Move down one row
+        new_row = current_row + 1
+        new_selected = current_col * rows_per_page + new_row
+
+        if new_selected >= total_items:
+            # Try to wrap to top of next column
+            new_col = current_col + 1
+            if new_col >= num_columns:
+                return total_items - 1  # Already at bottom-right
+            new_selected = new_col * rows_per_page
+            return min(total_items - 1, new_selected)
+
+        return new_selected
+
+    elif direction == 'LEFT':
+        # Move to previous column
+        new_col = current_col - 1
+        if new_col < 0:
+            return selected  # Already at leftmost column
+
+        new_selected = new_col * rows_per_page + current_row
+        return min(total_items - 1, max(0, new_selected))
+
+    elif direction == 'RIGHT':
+        # Move to next column
+        new_col = current_col + 1
+        if new_col >= num_columns:
+            return selected  # Already at rightmost column
+
+        new_selected = new_col * rows_per_page + current_row
+
+        if new_selected >= total_items:
+            # Target position doesn't exist, stay in current position
+            return selected
+
+        return new_selected
+
+    return selected
+
+
+def get_window(source, start, end):
+    """Ambil hanya item di range [start, end) dari source"""
+    if hasattr(source, 'window'):
+        return source.window(start, end)
+    return source[start:end]
+
+
+class StreamingSource:
+    """
+    Adapter untuk source lazy/streaming (generator, iterator hasil walk, dll).
+    Item hanya ditarik dari iterator sejauh yang dibutuhkan viewport.
+    """
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._items = []
+        self.exhausted = False
+
+    def ensure(self, count):
+        """Tarik item dari iterator sampai ada minimal `count` item"""
+        while not self.exhausted and len(self._items) < count:
+            try:
+                self._items.append(next(self._iterator))
+            except StopIteration:
+                self.exhausted = True
+
+    def window(self, start, end):
+        self.ensure(end)
+        return self._items[start:end]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.window(key.start or 0, key.stop if key.stop is not None else len(self._items))
+        self.ensure(key + 1)
+        return self._items[key]
+
+    def __iter__(self):
+        idx = 0
+        while True:
+            self.ensure(idx + 1)
+            if idx >= len(self._items):
+                return
+            yield self._items[idx]
+            idx += 1
+
+
+class Viewport:
+    """
+    Viewport menyimpan posisi cursor, halaman aktif, rows per page dan jumlah kolom.
+    Renderer hanya menerima window item yang terlihat, jadi biaya gambar tidak
+    tergantung total item di listing.
+    """
+
+    def __init__(self, num_columns=1):
+        self.num_columns = num_columns  # Preferensi user (1-4)
+        self.effective_columns = num_columns
+        self.rows_per_page = 1
+        self.items_per_page = 1
+        self.cursor = 0
+        self.page = 0
+        self.total = 0
+        self.complete = True
+        self.reserved_lines = 0  # Baris terminal yang dipakai overlay (mis. metrics)
+        self._layout_key = None
+
+    def sync(self, source):
+        """Update total & layout dari source (layout hanya dihitung ulang jika perlu)"""
+        if hasattr(source, 'ensure'):
+            # Streaming source: tarik cukup item untuk halaman ini + halaman berikutnya
+            source.ensure((self.page + 2) * max(1, self.items_per_page))
+        self.total = len(source)
+        self.complete = getattr(source, 'exhausted', True)
+
+        _, lines = get_terminal_size()
+        lines -= self.reserved_lines
+        layout_key = (self.total, lines, self.num_columns)
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self.effective_columns, self.items_per_page, self.rows_per_page = calculate_layout_info(
+                self.num_columns, self.total, lines)
+
+        # Pastikan page & cursor masih valid
+        self.page = max(0, min(self.page, self.total_pages - 1))
+        if self.total == 0:
+            self.cursor = 0
+        else:
+            self.cursor = max(0, min(self.cursor, self.total - 1))
+        return self
+
+    @property
+    def total_pages(self):
+        return max(1, math.ceil(self.total / self.items_per_page))
+
+    @property
+    def start(self):
+        return self.page * self.items_per_page
+
+    @property
+    def end(self):
+        return min(self.start + self.items_per_page, self.total)
+
+    def window(self, source):
+        """Item yang terlihat di halaman aktif"""
+        return get_window(source, self.start, self.end)
+
+    def page_info(self):
+        """Text info halaman untuk header"""
+        if self.complete and self.total <= self.items_per_page:
+            return ""
+        if self.complete:
+            return f" Page {self.page + 1}/{self.total_pages} ({self.total} items total)"
+        return f" Page {self.page + 1}/? ({self.total}+ items so far)"
+
+    def reset(self):
+        """Kembali ke item pertama (setelah pindah folder, sort, filter, dll)"""
+        self.cursor = 0
+        self.page = 0
+
+    def set_columns(self, num_columns):
+        """Ganti preferensi jumlah kolom"""
+        self.num_columns = num_columns
+        self._layout_key = None
+        self.reset()
+
+    def move(self, direction):
+        """Gerakkan cursor di grid halaman aktif, pindah halaman jika lewat batas"""
+        if self.total == 0:
+            return
+
+        start = self.start
+        count = self.end - start
+        relative = self.cursor - start
+
+        if direction == 'DOWN' and relative >= count - 1 and self.page < self.total_pages - 1:
+            # Lewat bawah halaman: lanjut ke item pertama halaman berikutnya
+            self.page += 1
+            self.cursor = self.start
+        elif direction == 'UP' and relative <= 0 and self.page > 0:
+            # Lewat atas halaman: ke item terakhir halaman sebelumnya
+            self.page -= 1
+            self.cursor = self.end - 1
+        else:
+            relative = move_in_grid(relative, direction, self.effective_columns, self.rows_per_page, count)
+            self.cursor = start + relative
+
+    def page_up(self):
+        """Ke halaman sebelumnya, return False jika sudah di halaman pertama"""
+        if self.page == 0:
+            return False
+        self.page -= 1
+        self.cursor = self.start
+        return True
+
+    def page_down(self):
+        """Ke halaman berikutnya, return False jika sudah di halaman terakhir"""
+        if self.page >= self.total_pages - 1:
+            return False
+        self.page += 1
+        self.cursor = self.start
+        return True
+
+    def go_to(self, index):
+        """Pindahkan cursor ke index tertentu dan ikut pindah halaman"""
+        self.cursor = max(0, min(index, max(0, self.total - 1)))
+        self.page = self.cursor // self.items_per_page
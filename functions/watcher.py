@@ -0,0 +1,299 @@
+"""
+Filesystem watcher (inotify / ReadDirectoryChangesW / polling fallback)
+"""
+import os
+import sys
+import time
+import struct
+import threading
+
+
+class PollingBackend:
+    """Fallback: bandingkan snapshot (name -> (is_dir, size, mtime)) setiap interval"""
+
+    name = "polling"
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+        self._next_check = time.monotonic() + interval
+
+    def _take_snapshot(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                        snapshot[entry.name] = (entry.is_dir(), stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return snapshot
+
+    def read_events(self):
+        """Return list of (action, name) sejak pemanggilan terakhir"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return []
+        self._next_check = now + self.interval
+
+        old = self._snapshot
+        new = self._take_snapshot()
+        self._snapshot = new
+
+        events = [('removed', name) for name in old.keys() - new.keys()]
+        events += [('added', name) for name in new.keys() - old.keys()]
+        events += [('modified', name) for name in new.keys() & old.keys() if new[name] != old[name]]
+        return events
+
+    def close(self):
+        pass
+
+
+class InotifyBackend:
+    """Linux inotify via ctypes (non-blocking read)"""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE | self.IN_DELETE_SELF | self.IN_MOVE_SELF)
+        if libc.inotify_add_watch(self._fd, os.fsencode(path), mask) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {path}")
+        self.path = path
+
+    def read_events(self):
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset + 16 <= len(data):
+                _, mask, _, length = struct.unpack_from("iIII", data, offset)
+                raw_name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+                offset += 16 + length
+                name = os.fsdecode(raw_name)
+
+                if mask & self.IN_Q_OVERFLOW:
+                    events.append(('overflow', ""))
+                elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    events.append(('gone', ""))
+                elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    events.append(('added', name))
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    events.append(('removed', name))
+                elif name:
+                    events.append(('modified', name))
+        return events
+
+    def close(self):
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class WindowsBackend:
+    """Windows ReadDirectoryChangesW via ctypes (blocking call di thread terpisah)"""
+
+    name = "ReadDirectoryChangesW"
+
+    FILE_LIST_DIRECTORY = 0x0001
+    FILE_SHARE_ALL = 0x00000007
+    OPEN_EXISTING = 3
+    FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+    NOTIFY_FILTER = 0x0000001F  # FILE_NAME | DIR_NAME | ATTRIBUTES | SIZE | LAST_WRITE
+    ACTIONS = {1: 'added', 2: 'removed', 3: 'modified', 4: 'removed', 5: 'added'}
+
+    def __init__(self, path):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._kernel32.CreateFileW.restype = wintypes.HANDLE
+        self._handle = self._kernel32.CreateFileW(
+            path, self.FILE_LIST_DIRECTORY, self.FILE_SHARE_ALL, None,
+            self.OPEN_EXISTING, self.FILE_FLAG_BACKUP_SEMANTICS, None)
+        if self._handle in (None, wintypes.HANDLE(-1).value):
+            raise OSError(ctypes.get_last_error(), f"CreateFileW failed: {path}")
+
+        self.path = path
+        self._events = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        ctypes = self._ctypes
+        buffer = ctypes.create_string_buffer(64 * 1024)
+        returned = ctypes.c_ulong(0)
+
+        while not self._closed:
+            ok = self._kernel32.ReadDirectoryChangesW(
+                self._handle, buffer, len(buffer), False, self.NOTIFY_FILTER,
+                ctypes.byref(returned), None, None)
+            if not ok:
+                break
+            if returned.value == 0:
+                # Buffer overflow: terlalu banyak perubahan sekaligus
+                with self._lock:
+                    self._events.append(('overflow', ""))
+                continue
+
+            events = []
+            offset = 0
+            while True:
+                next_offset, action, length = struct.unpack_from("III", buffer.raw, offset)
+                name = buffer.raw[offset + 12:offset + 12 + length].decode("utf-16-le")
+                events.append((self.ACTIONS.get(action, 'modified'), name))
+                if next_offset == 0:
+                    break
+                offset += next_offset
+
+            with self._lock:
+                self._events.extend(events)
+
+    def read_events(self):
+        with self._lock:
+            events = self._events
+            self._events = []
+        return events
+
+    def close(self):
+        self._closed = True
+        self._kernel32.CancelIoEx(self._handle, None)
+        self._kernel32.CloseHandle(self._handle)
+
+
+def create_backend(path):
+    """Pilih backend terbaik untuk platform ini, fallback ke polling"""
+    try:
+        if sys.platform.startswith("linux"):
+            return InotifyBackend(path)
+        if sys.platform == "win32":
+            return WindowsBackend(path)
+    except (OSError, AttributeError, ImportError):
+        pass
+    return PollingBackend(path)
+
+
+def coalesce_events(events):
+    """
+    Gabungkan banyak event menjadi satu perubahan final per nama.
+    added + removed = hilang, removed + added = modified.
+    Return dict name -> 'added' / 'removed' / 'modified', atau None jika perlu rescan penuh.
+    """
+    changes = {}
+    for action, name in events:
+        if action in ('overflow', 'gone'):
+            return None
+        previous = changes.get(name)
+        if action == 'added':
+            changes[name] = 'modified' if previous == 'removed' else 'added'
+        elif action == 'removed':
+            if previous == 'added':
+                del changes[name]
+            else:
+                changes[name] = 'removed'
+        elif previous is None:
+            changes[name] = 'modified'
+    return changes
+
+
+class DirectoryWatcher:
+    """
+    Watch folder aktif dan kumpulkan event dengan debounce.
+    drain() baru mengembalikan perubahan setelah tidak ada event baru selama
+    `quiet` detik (atau burst sudah berlangsung `max_delay` detik), jadi
+    10k file yang muncul sekaligus cukup satu kali repaint.
+    """
+
+    def __init__(self, quiet=0.3, max_delay=2.0):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.path = None
+        self._backend = None
+        self._events = []
+        self._first_event = None
+        self._last_event = None
+
+    @property
+    def active(self):
+        return self._backend is not None
+
+    @property
+    def backend_name(self):
+        return self._backend.name if self._backend else None
+
+    def watch(self, path):
+        """Mulai watch folder baru (watch lama otomatis dihentikan)"""
+        self.stop()
+        self.path = str(path)
+        self._backend = create_backend(self.path)
+
+    def stop(self):
+        if self._backend is not None:
+            self._backend.close()
+        self._backend = None
+        self._events = []
+        self._first_event = None
+        self._last_event = None
+
+    def drain(self):
+        """
+        Return perubahan yang sudah "tenang": dict name -> action,
+        None jika perlu rescan penuh, atau {} jika belum ada yang siap.
+        """
+        if self._backend is None:
+            return {}
+
+        now = time.monotonic()
+        new_events = self._backend.read_events()
+        if new_events:
+            self._events.extend(new_events)
+            self._last_event = now
+            if self._first_event is None:
+                self._first_event = now
+
+        if not self._events:
+            return {}
+        if now - self._last_event < self.quiet and now - self._first_event < self.max_delay:
+            return {}
+
+        events = self._events
+        self._events = []
+        self._first_event = None
+        self._last_event = None
+        return coalesce_events(events)
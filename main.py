@@ -1,758 +1,584 @@
 """
 File Explorer - Main Application
 Terminal-based File Explorer for Windows
+
+Tanpa argumen: TUI interaktif. Dengan argumen: CLI non-interaktif
+(mis. `python main.py ls D:/data --sort size`, lihat `python main.py --help`).
 """
+import time
+_START = time.perf_counter()  # Titik awal "time to first render" (startup profile)
+
 import os
-import math
+import sys
+import threading
 from pathlib import Path
 
-# Import semua functions dari package
+# CLI dijalankan sebelum import TUI (keyboard / msvcrt), jadi juga jalan di luar Windows
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from functions.cli import run_cli
+    sys.exit(run_cli(sys.argv[1:]))
+
+# Import semua functions dari package. Duplicates (sqlite3, multiprocessing),
+# compression (zipfile, tarfile) dan sync di-import di handler key-nya saat
+# pertama dipakai supaya tidak memperlambat frame pertama
 from functions import (
     # Keyboard
     get_key,
-    
+
     # UI
     clear_screen,
     render_ui,
-    get_terminal_size,
-    
+    render_ui_dual_pane,
+    render_ui_preview,
+
+    # Viewport
+    Viewport,
+
     # File System
-    scan_directory,
-    open_file,
-    change_directory,
-    go_to_parent,
-    
-    # File Operations
-    copy_item,
-    move_item,
-    delete_item,
-    rename_item,
-    create_folder,
-    create_file,
-    copy_multiple_items,
-    move_multiple_items,
-    delete_multiple_items,
-    
+    format_size,
+
     # Sorting
-    sort_items,
     show_sort_menu,
     show_view_menu,
-    
+
     # Search & Filter
-    filter_by_extension,
     search_mode_input,
     filter_mode_input,
-    
+
     # Dialogs
     get_text_input,
     get_filename_input,
     confirm_dialog,
-    
-    # Compression
-    is_archive,
-    compress_to_zip,
-    compress_to_7z,
-    compress_to_rar,
-    extract_archive,
-    show_compression_menu,
-    
+
     # Layout
     show_layout_menu,
-)
 
+    # Analyzer
+    show_analyzer,
 
-def calculate_layout_info(num_columns, total_items):
-    """Calculate layout information and adjust columns if needed"""
-    cols, lines = get_terminal_size()
-    
-    # Calculate available space
-    extra_lines = 8  # Base overhead (header + footer)
-    available_rows = lines - extra_lines
-    
-    # Determine effective columns based on items
-    effective_columns = num_columns
-    
-    if num_columns > 1:
-        # Calculate minimum items needed for multi-column layout
-        min_items_for_columns = available_rows * num_columns
-        
-        # If not enough items to fill all columns, reduce column count
-        if total_items < min_items_for_columns:
-            # Try to find optimal column count
-            for cols_test in range(num_columns, 0, -1):
-                if total_items >= available_rows * cols_test or cols_test == 1:
-                    effective_columns = cols_test
-                    break
-    
-    # Calculate items per page with effective columns
-    rows_per_page = available_rows
-    items_per_page = rows_per_page * effective_columns
-    
-    return effective_columns, items_per_page, rows_per_page
-
-
-def get_position_in_grid(selected, num_columns, rows_per_page):
-    """Get row and column position of selected item in grid"""
-    if num_columns == 1:
-        return selected, 0
-    
-    # In multi-column layout, items are arranged in column-major order
-    row = selected % rows_per_page
-    col = selected // rows_per_page
-    
-    return row, col
-
-
-def move_in_grid(selected, direction, num_columns, rows_per_page, total_items):
-    """Calculate new selection based on direction in grid layout"""
-    if total_items == 0:
-        return 0
-    
-    if num_columns == 1:
-        # Single column - simple up/down
-        if direction == 'UP':
-            return max(0, selected - 1)
-        elif direction == 'DOWN':
-            return min(total_items - 1, selected + 1)
-        return selected
-    
-    # Multi-column layout
-    current_row, current_col = get_position_in_grid(selected, num_columns, rows_per_page)
-    
-    if direction == 'UP':
-        # Move up one row
-        new_row = current_row - 1
-        if new_row < 0:
-            # Wrap to bottom of previous column
-            new_col = current_col - 1
-            if new_col < 0:
-                return 0  # Already at top-left
-            new_row = rows_per_page - 1
-            new_selected = new_col * rows_per_page + new_row
-            return min(total_items - 1, max(0, new_selected))
-        else:
-            new_selected = current_col * rows_per_page + new_row
-            return min(total_items - 1, new_selected)
-    
-    elif direction == 'DOWN':
-        # Move down one row
-        new_row = current_row + 1
-        new_selected = current_col * rows_per_page + new_row
-        
-        if new_selected >= total_items:
-            # Try to wrap to top of next column
-            new_col = current_col + 1
-            if new_col >= num_columns:
-                return total_items - 1  # Already at bottom-right
-            new_selected = new_col * rows_per_page
-            return min(total_items - 1, new_selected)
-        
-        return new_selected
-    
-    elif direction == 'LEFT':
-        # Move to previous column
-        new_col = current_col - 1
-        if new_col < 0:
-            return selected  # Already at leftmost column
-        
-        new_selected = new_col * rows_per_page + current_row
-        return min(total_items - 1, max(0, new_selected))
-    
-    elif direction == 'RIGHT':
-        # Move to next column
-        new_col = current_col + 1
-        if new_col >= num_columns:
-            return selected  # Already at rightmost column
-        
-        new_selected = new_col * rows_per_page + current_row
-        
-        if new_selected >= total_items:
-            # Target position doesn't exist, stay in current position
-            return selected
-        
-        return new_selected
-    
-    return selected
+    # Session
+    ExplorerSession,
+
+    # State
+    get_session_state,
+    show_bookmark_menu,
+)
+from functions import metrics, startup
 
 
 def main():
-    """Main application loop"""
-    # Start dari current directory
-    current_path = os.getcwd()
-    selected = 0
-    message = ""
-    filter_ext = ""
-    
-    # Sort & View settings
-    sort_mode = "name"  # name, size, date, type
-    sort_reverse = False
+    """Main application loop (front end TUI untuk ExplorerSession)"""
+    # State launch sebelumnya: path terakhir, prefs per folder, bookmarks & snapshot listing
+    state = get_session_state()
+    start_path = state.last_path if state.last_path and os.path.isdir(state.last_path) else os.getcwd()
+
+    # Session menyimpan path, listing, sort, filter, selection, clipboard & job background
+    session = ExplorerSession(start_path, watch=True, state=state)
+    selected_items = session.selection
     view_mode = "detailed"  # detailed, compact, list
-    
-    # Layout settings
-    num_columns = 1  # Number of columns (1-4) - user preference
-    current_page = 0  # Current page for pagination
-    
-    # Multi-selection
-    selected_items = set()  # Set of indices yang di-select
-    
-    # Clipboard untuk copy/cut
-    clipboard = None
-    clipboard_mode = None  # 'copy' atau 'cut'
-    clipboard_items = []  # List of paths untuk multi-item clipboard
-    
-    # Scan directory pertama kali
-    all_items = scan_directory(current_path)
-    items = sort_items(all_items, sort_mode, sort_reverse)
-    
+
+    # Layout settings: viewport menyimpan cursor, halaman & jumlah kolom (1-4)
+    view = Viewport(num_columns=1)
+
+    # Dual pane (tombol O): viewport & view mode per pane, session/view = pane aktif
+    dual = None
+    pane_views = None
+    pane_modes = None
+
+    # Preview pane (tombol P): engine async + preview file di bawah cursor
+    preview_engine = None
+    preview_item = None
+    preview_path = None
+    listing_version = 0  # Naik saat listing berubah dari background (cache render pane)
+
+    def apply_prefs():
+        # View & jumlah kolom tersimpan untuk folder aktif (sort diatur session)
+        nonlocal view_mode
+        prefs = session.prefs
+        view_mode = prefs.get('view', view_mode)
+        if 'columns' in prefs and dual is None and preview_engine is None:
+            view.set_columns(prefs['columns'])
+
+    apply_prefs()
+
+    # Journal operasi: replay batch yang terputus (crash) sebelum listing ditampilkan
+    _, message = session.journal.recover()
+    if message:
+        session.refresh()
+
+    def draw(message):
+        if dual is not None:
+            pane_modes[dual.active] = view_mode
+            render_ui_dual_pane(dual.panes, pane_views, dual.active, message, view_modes=pane_modes, clipboard_info=session.clipboard_info, versions=dual.versions, job_status=dual.job_status())
+            return
+        if preview_engine is not None:
+            request_preview()
+            render_ui_preview(session, view, preview_item, message, view_mode=view_mode, clipboard_info=session.clipboard_info, version=listing_version)
+            return
+        render_ui(session.path, session.items, view.cursor, message, filter_ext=session.filter_ext, clipboard_info=session.clipboard_info, sort_mode=session.sort_mode, view_mode=view_mode, selected_items=selected_items, viewport=view)
+
+    def request_preview():
+        # Minta preview hanya jika item di bawah cursor berubah (cache hit langsung tampil)
+        nonlocal preview_item, preview_path
+        view.sync(session.items)
+        items = session.items
+        path = items[view.cursor][4] if items and view.cursor < len(items) else None
+        if path != preview_path:
+            preview_path = path
+            preview_item = preview_engine.request(path) if path else None
+
+    def change_dir(success, msg):
+        # Setelah pindah folder cursor & halaman kembali ke awal
+        if success:
+            view.reset()
+            apply_prefs()
+        return msg
+
     # Render pertama
-    effective_columns, items_per_page, rows_per_page = calculate_layout_info(num_columns, len(items))
-    render_ui(current_path, items, selected, message, filter_ext=filter_ext, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-    
+    draw(message)
+
+    if startup.is_profiling():
+        startup.report_first_render(_START)
+        session.close()
+        return
+
+    # Bersihkan trash lama di background setelah frame pertama (folder besar tidak menahan key pertama)
+    threading.Thread(target=session.journal.purge_trash, daemon=True).start()
+
     while True:
-        # Generate clipboard info text
-        clipboard_info = ""
-        if clipboard_items:
-            mode_text = "Copy" if clipboard_mode == 'copy' else "Cut"
-            count = len(clipboard_items)
-            if count == 1:
-                clipboard_info = f"{mode_text}: {Path(clipboard_items[0]).name}"
-            else:
-                clipboard_info = f"{mode_text}: {count} items"
-        
-        key = get_key()
+        # Selama ada pekerjaan background / watcher aktif, jangan blocking
+        background = dual is not None or session.busy or (preview_engine is not None and preview_engine.is_busy())
+        key = get_key(timeout=0.2 if background else None)
+
+        if key is None:
+            # Dual pane: changed = set pane yang berubah (pane lain tidak diformat ulang)
+            changed, msg = dual.poll() if dual is not None else session.poll()
+            if changed:
+                listing_version += 1
+                preview_path = None  # File di bawah cursor mungkin berubah, cek ulang (cache key ikut mtime)
+            if preview_engine is not None:
+                result = preview_engine.poll()
+                if result is not None:
+                    preview_item = result
+                    changed = True
+            if msg is not None:
+                message = msg
+            if changed:
+                draw(message)
+            continue
+
         message = ""  # Reset message
-        
-        # Calculate effective layout
-        effective_columns, items_per_page, rows_per_page = calculate_layout_info(num_columns, len(items))
-        total_pages = math.ceil(len(items) / items_per_page) if items else 1
-        
-        # Ensure current page is valid
-        current_page = max(0, min(current_page, total_pages - 1))
-        
-        # Calculate visible range for current page
-        start_idx = current_page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(items))
-        
-        if key == 'UP':
-            new_selected = move_in_grid(selected, 'UP', effective_columns, rows_per_page, len(items))
-            selected = new_selected
-            
-            # Adjust page if selected item is before current page
-            if selected < start_idx:
-                current_page = max(0, current_page - 1)
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-            
-        elif key == 'DOWN':
-            new_selected = move_in_grid(selected, 'DOWN', effective_columns, rows_per_page, len(items))
-            selected = new_selected
-            
-            # Adjust page if selected item is after current page
-            if selected >= end_idx:
-                current_page = min(total_pages - 1, current_page + 1)
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'LEFT':
-            if effective_columns > 1:
-                new_selected = move_in_grid(selected, 'LEFT', effective_columns, rows_per_page, len(items))
-                selected = new_selected
-                
-                # Adjust page if needed
-                if selected < start_idx:
-                    current_page = max(0, current_page - 1)
-                
-                render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'RIGHT':
-            if effective_columns > 1:
-                new_selected = move_in_grid(selected, 'RIGHT', effective_columns, rows_per_page, len(items))
-                selected = new_selected
-                
-                # Adjust page if needed
-                if selected >= end_idx:
-                    current_page = min(total_pages - 1, current_page + 1)
-                
-                render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+        items = session.items
+        current_path = session.path
+        filter_ext = session.filter_ext
+
+        # Sync viewport (layout hanya dihitung ulang jika jumlah item / terminal berubah)
+        view.sync(items)
+
+        # Item di bawah cursor (None jika listing kosong)
+        current = items[view.cursor] if items and view.cursor < len(items) else None
+
+        if key in ['UP', 'DOWN']:
+            view.move(key)
+
+        elif key in ['LEFT', 'RIGHT']:
+            if view.effective_columns <= 1:
+                continue
+            view.move(key)
+
         elif key == 'PAGE_UP':
             # Go to previous page
-            if current_page > 0:
-                current_page -= 1
-                # Move selection to first item of new page
-                selected = current_page * items_per_page
-                message = f"Page {current_page + 1}/{total_pages}"
+            if view.page_up():
+                message = f"Page {view.page + 1}/{view.total_pages}"
             else:
                 message = "Already at first page"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'PAGE_DOWN':
             # Go to next page
-            if current_page < total_pages - 1:
-                current_page += 1
-                # Move selection to first item of new page
-                selected = current_page * items_per_page
-                message = f"Page {current_page + 1}/{total_pages}"
+            if view.page_down():
+                message = f"Page {view.page + 1}/{view.total_pages}"
             else:
                 message = "Already at last page"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'SPACE':
             # Toggle selection untuk item saat ini
-            if items and selected < len(items):
-                name = items[selected][0]
+            if current:
+                name, is_dir, size, modified, full_path = current
                 if name != "..":  # Don't select parent marker
-                    if selected in selected_items:
-                        selected_items.remove(selected)
-                        message = f"Deselected: {name}"
-                    else:
-                        selected_items.add(selected)
+                    if selected_items.toggle(full_path):
                         message = f"Selected: {name}"
+                    else:
+                        message = f"Deselected: {name}"
                 else:
                     message = "Cannot select parent directory marker"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'SELECT_ALL':
             # Select/Deselect all items (excluding "..")
             if selected_items:
-                # If something is selected, deselect all
                 selected_items.clear()
                 message = "Deselected all items"
             else:
-                # Select all (except "..")
-                for idx, item in enumerate(items):
-                    if item[0] != "..":
-                        selected_items.add(idx)
+                selected_items.select_all(items)
                 message = f"Selected {len(selected_items)} items"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'LAYOUT':
-            # Show layout menu
-            new_columns, cancelled = show_layout_menu(current_path, num_columns, filter_ext, sort_mode)
-            
+
+        elif key == 'SELECT_RANGE':
+            # Select dari item terakhir yang di-toggle sampai cursor
+            if current:
+                count = selected_items.select_range(items, view.cursor)
+                message = f"Selected range of {count} items ({len(selected_items)} total)"
+
+        elif key == 'INVERT_SELECTION':
+            selected_items.invert(items)
+            message = f"Selection inverted: {len(selected_items)} items selected"
+
+        elif key in ['LAYOUT', 'COL_1', 'COL_2', 'COL_3', 'COL_4']:
+            if dual is not None or preview_engine is not None:
+                message = "Layout is one column per pane in dual pane / preview mode"
+                draw(message)
+                continue
+            if key == 'LAYOUT':
+                num_columns, cancelled = show_layout_menu(current_path, view.num_columns, filter_ext, session.sort_mode)
+            else:
+                # Quick column shortcuts
+                num_columns, cancelled = int(key[-1]), False
+
             if not cancelled:
-                num_columns = new_columns
-                current_page = 0  # Reset to first page when changing layout
-                selected = 0
-                
+                view.set_columns(num_columns)  # Reset to first page when changing layout
+                session.remember_prefs(columns=num_columns)
+
                 # Calculate effective columns with new preference
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-                
+                effective_columns = view.sync(items).effective_columns
+
                 if effective_columns < num_columns:
                     message = f"Layout: {effective_columns} column{'s' if effective_columns > 1 else ''} (auto-adjusted from {num_columns})"
                 else:
                     message = f"Layout: {num_columns} column{'s' if num_columns > 1 else ''}"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key in ['COL_1', 'COL_2', 'COL_3', 'COL_4']:
-            # Quick column shortcuts
-            column_map = {
-                'COL_1': 1,
-                'COL_2': 2,
-                'COL_3': 3,
-                'COL_4': 4
-            }
-            num_columns = column_map[key]
-            current_page = 0
-            selected = 0
-            
-            # Calculate effective columns
-            effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            
-            if effective_columns < num_columns:
-                message = f"Layout: {effective_columns} column{'s' if effective_columns > 1 else ''} (auto-adjusted)"
+
+        elif key == 'DIR_SIZES':
+            # Hitung ukuran semua folder di directory ini (background)
+            _, message = session.start_dir_sizes()
+
+        elif key == 'ANALYZE':
+            # Disk usage analyzer untuk subtree saat ini
+            target_path = show_analyzer(current_path)
+            if target_path:
+                message = change_dir(*session.open(target_path))
+
+        elif key == 'DUPLICATES':
+            # Cari file duplikat di subtree ini, tampilkan sebagai list
+            from functions import run_duplicate_finder, duplicate_items
+            groups = run_duplicate_finder(current_path)
+            if groups:
+                dup_items, extras = duplicate_items(groups, current_path)
+                session.show_items(dup_items)
+                view.reset()
+                selected_items.clear()
+                selected_items.update(extras)  # Pre-select file extra, tinggal tekan D
+                wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+                message = f"Found {len(groups)} duplicate groups ({format_size(wasted)} wasted). Extras selected, press D to delete"
+            else:
+                message = "No duplicate files found"
+
+        elif key == 'CHECKSUM':
+            # Buat manifest checksum (selection / subtree) atau verifikasi manifest di bawah cursor
+            from functions import run_checksum_tool
+            cursor_path = current[4] if current and current[0] != ".." else None
+            written, result_items, message = run_checksum_tool(current_path, session.selection.paths(), cursor_path)
+            if result_items:
+                session.show_items(result_items)
+                view.reset()
+                selected_items.clear()
+            elif written:
+                session.refresh()
+
+        elif key == 'TAIL':
+            # Tail / follow viewer untuk file log di bawah cursor
+            if current and not current[1] and current[0] != "..":
+                from functions import show_tail_viewer
+                _, message = show_tail_viewer(current[4])
             else:
-                message = f"Layout: {num_columns} column{'s' if num_columns > 1 else ''}"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+                message = "Select a file to tail"
+
         elif key == 'COMPRESS':
-            # Compress selected items or current item
-            items_to_compress = []
-            
-            if selected_items:
-                # Multi-select mode
-                for idx in selected_items:
-                    if idx < len(items) and items[idx][0] != "..":
-                        items_to_compress.append(items[idx][4])  # full_path
-            elif items and selected < len(items):
-                # Single item mode
-                name, is_dir, size, modified, full_path = items[selected]
-                if name != "..":
-                    items_to_compress.append(full_path)
-            
+            items_to_compress = session.target_paths(view.cursor)
+
             if items_to_compress:
+                from functions import show_compression_menu
+
                 # Show compression menu
                 format_type, cancelled = show_compression_menu(current_path, filter_ext)
-                
+
                 if not cancelled:
                     # Get archive name
                     if len(items_to_compress) == 1:
                         default_name = Path(items_to_compress[0]).stem
                     else:
                         default_name = "archive"
-                    
+
                     archive_name, cancelled = get_text_input(
                         f"Archive name (without extension):",
-                        current_path, items, selected, filter_ext,
+                        current_path, items, view.cursor, filter_ext,
                         initial_value=default_name
                     )
-                    
+
                     if not cancelled and archive_name:
-                        output_path = os.path.join(current_path, f"{archive_name}.{format_type}")
-                        
-                        # Compress
-                        if format_type == 'zip':
-                            success, msg = compress_to_zip(items_to_compress, output_path)
-                        elif format_type == '7z':
-                            success, msg = compress_to_7z(items_to_compress, output_path)
-                        elif format_type == 'rar':
-                            success, msg = compress_to_rar(items_to_compress, output_path)
-                        
-                        message = msg
-                        
-                        # Refresh directory
-                        all_items = scan_directory(current_path)
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        selected_items.clear()
-                        
-                        # Recalculate layout
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                        _, message = session.compress(items_to_compress, f"{archive_name}.{format_type}", format_type)
                     else:
                         message = "Compression cancelled"
             else:
                 message = "No items to compress"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'EXTRACT':
             # Extract archive
-            if items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                
+            if current:
+                from functions import is_archive
+                name, is_dir, size, modified, full_path = current
+
                 if not is_dir and is_archive(name):
-                    # Get extraction folder name
-                    default_folder = Path(name).stem
-                    
                     folder_name, cancelled = get_text_input(
                         f"Extract to folder:",
-                        current_path, items, selected, filter_ext,
-                        initial_value=default_folder
+                        current_path, items, view.cursor, filter_ext,
+                        initial_value=Path(name).stem
                     )
-                    
+
                     if not cancelled and folder_name:
-                        extract_path = os.path.join(current_path, folder_name)
-                        
-                        # Create extraction folder if not exists
-                        os.makedirs(extract_path, exist_ok=True)
-                        
-                        # Extract
-                        success, msg = extract_archive(full_path, extract_path)
-                        message = msg
-                        
-                        # Refresh directory
-                        all_items = scan_directory(current_path)
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        
-                        # Recalculate layout
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                        _, message = session.extract(full_path, folder_name)
                     else:
                         message = "Extraction cancelled"
                 else:
                     message = "Selected item is not an archive file"
-            
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-            
+
         elif key == 'BACKSPACE':
             # Naik ke parent directory
-            new_path, new_items = go_to_parent(current_path)
-            if new_path:
-                current_path = new_path
-                all_items = new_items
-                all_items = sort_items(all_items, sort_mode, sort_reverse)
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                selected = 0
-                current_page = 0
-                selected_items.clear()  # Clear selection saat pindah directory
-                message = "Moved to parent directory"
-                
-                # Recalculate layout
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            else:
-                message = "Already at root directory"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-            
+            message = change_dir(*session.go_up())
+
         elif key == 'ENTER':
-            if items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                
-                if name == "..":
-                    # Naik ke parent
-                    new_path, new_items = change_directory(full_path)
-                    if new_path:
-                        current_path = new_path
-                        all_items = new_items
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        selected = 0
-                        current_page = 0
-                        selected_items.clear()
-                        message = "Moved to parent directory"
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-                elif is_dir:
-                    # Masuk ke folder
-                    new_path, new_items = change_directory(full_path)
-                    if new_path:
-                        current_path = new_path
-                        all_items = new_items
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        selected = 0
-                        current_page = 0
-                        selected_items.clear()
-                        message = f"Opened: {name}"
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-                    else:
-                        message = f"Cannot access: {name}"
-                else:
-                    # Open file dengan aplikasi default
-                    if open_file(full_path):
-                        message = f"Opening: {name}"
-                    else:
-                        message = f"Cannot open: {name}"
-                
-                render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+            if not current:
+                continue
+            # Folder dimasuki, file dibuka dengan aplikasi default
+            success, message = session.enter(view.cursor)
+            if current[1]:
+                message = change_dir(success, message)
+
         elif key == 'SORT':
-            new_sort, reverse, cancelled = show_sort_menu(current_path, sort_mode, filter_ext)
+            new_sort, reverse, cancelled = show_sort_menu(current_path, session.sort_mode, filter_ext)
             if not cancelled:
                 if reverse:
-                    sort_reverse = not sort_reverse
-                    message = f"Sort order reversed: {'Descending' if sort_reverse else 'Ascending'}"
+                    _, message = session.set_sort(reverse=not session.sort_reverse)
                 else:
-                    sort_mode = new_sort
-                    message = f"Sorted by: {sort_mode.title()}"
-                all_items = sort_items(all_items, sort_mode, sort_reverse)
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                selected = 0
-                current_page = 0
-                selected_items.clear()
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+                    _, message = session.set_sort(new_sort)
+                view.reset()
+
         elif key in ['SORT_NAME', 'SORT_SIZE', 'SORT_DATE', 'SORT_TYPE']:
-            sort_map = {'SORT_NAME': 'name', 'SORT_SIZE': 'size', 'SORT_DATE': 'date', 'SORT_TYPE': 'type'}
-            sort_mode = sort_map[key]
-            sort_reverse = False
-            message = f"Sorted by: {sort_mode.title()}"
-            all_items = sort_items(all_items, sort_mode, sort_reverse)
-            items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-            selected = 0
-            current_page = 0
-            selected_items.clear()
-            effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+            _, message = session.set_sort(key[5:].lower(), reverse=False)
+            view.reset()
+
         elif key == 'VIEW':
-            new_view, cancelled = show_view_menu(current_path, view_mode, filter_ext, sort_mode)
+            new_view, cancelled = show_view_menu(current_path, view_mode, filter_ext, session.sort_mode)
             if not cancelled:
                 view_mode = new_view
+                session.remember_prefs(view=view_mode)
                 message = f"View mode: {view_mode.title()}"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'COPY':
-            if selected_items:
-                clipboard_items = [items[idx][4] for idx in selected_items if idx < len(items) and items[idx][0] != ".."]
-                if clipboard_items:
-                    clipboard_mode = 'copy'
-                    message = f"Copied {len(clipboard_items)} items to clipboard"
-            elif items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                if name != "..":
-                    clipboard_items = [full_path]
-                    clipboard_mode = 'copy'
-                    message = f"Copied to clipboard: {name}"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'CUT':
-            if selected_items:
-                clipboard_items = [items[idx][4] for idx in selected_items if idx < len(items) and items[idx][0] != ".."]
-                if clipboard_items:
-                    clipboard_mode = 'cut'
-                    message = f"Cut {len(clipboard_items)} items to clipboard"
-            elif items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                if name != "..":
-                    clipboard_items = [full_path]
-                    clipboard_mode = 'cut'
-                    message = f"Cut to clipboard: {name}"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
-        elif key == 'PASTE':
-            if clipboard_items:
-                if len(clipboard_items) == 1:
-                    if clipboard_mode == 'copy':
-                        success, msg = copy_item(clipboard_items[0], current_path)
-                    else:
-                        success, msg = move_item(clipboard_items[0], current_path)
-                        if success:
-                            clipboard_items = []
-                            clipboard_mode = None
+
+        elif key in ['COPY', 'CUT']:
+            paths = session.target_paths(view.cursor)
+            if paths:
+                if key == 'COPY':
+                    _, message = session.copy(paths)
                 else:
-                    if clipboard_mode == 'copy':
-                        success, msg = copy_multiple_items(clipboard_items, current_path)
-                    else:
-                        success, msg = move_multiple_items(clipboard_items, current_path)
-                        if success:
-                            clipboard_items = []
-                            clipboard_mode = None
-                message = msg
-                all_items = scan_directory(current_path)
-                all_items = sort_items(all_items, sort_mode, sort_reverse)
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                selected_items.clear()
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                    _, message = session.cut(paths)
+
+        elif key == 'PASTE':
+            # Nama bentrok: pilih policy sekali untuk seluruh batch
+            conflicts = session.paste_conflicts() if session.clipboard_items else 0
+            policy = None
+            if conflicts:
+                from functions import choose_conflict_policy
+                policy = choose_conflict_policy(conflicts, current_path, filter_ext)
+            if conflicts and policy is None:
+                message = "Paste cancelled"
+            else:
+                _, message = session.paste(policy=policy)
+
+        elif key == 'BOOKMARK':
+            _, message = session.toggle_bookmark()
+
+        elif key == 'BOOKMARKS':
+            target_path = show_bookmark_menu(current_path, state.bookmarks, filter_ext, session.sort_mode)
+            if target_path:
+                message = change_dir(*session.open(target_path))
+
+        elif key == 'METRICS':
+            # Toggle overlay metrics (juga bisa lewat env FILE_EXPLORER_METRICS=1)
+            if metrics.toggle():
+                message = f"Metrics on (exporting to {metrics.get_export_path()})"
+            else:
+                message = "Metrics off"
+
+        elif key in ['THROTTLE_UP', 'THROTTLE_DOWN']:
+            # I/O limit untuk copy / move / delete / zip (berlaku langsung ke job yang sedang jalan)
+            from functions import get_throttle
+            message = get_throttle().adjust(1 if key == 'THROTTLE_UP' else -1)
+
+        elif key in ['UNDO', 'REDO']:
+            # Undo/redo operasi terakhir dari journal (move, rename, delete ke trash, copy, create)
+            if key == 'UNDO':
+                _, message = session.undo()
+            else:
+                _, message = session.redo()
+
+        elif key == 'PREVIEW':
+            if dual is not None:
+                message = "Preview is not available in dual pane mode"
+            elif preview_engine is None:
+                from functions import PreviewEngine
+                preview_engine = PreviewEngine()
+                view.set_columns(1)
+                message = "Preview on"
+            else:
+                preview_engine.cancel()
+                preview_engine = preview_item = preview_path = None
+                apply_prefs()
+                message = "Preview off"
+
+        elif key == 'DUAL_PANE':
+            pane_modes = pane_modes or [view_mode, view_mode]
+            if preview_engine is not None:
+                preview_engine.cancel()
+                preview_engine = preview_item = preview_path = None
+            if dual is None:
+                from functions import DualPane
+                # Pane kiri = session sekarang, pane kanan mulai di folder yang sama (dari cache, tanpa scan)
+                dual = DualPane(session, state=state)
+                view.set_columns(1)
+                pane_views = [view, Viewport(num_columns=1)]
+                pane_modes = [view_mode, view_mode]
+                message = "Dual pane: Tab to switch, F5 copy, F6 move, Ctrl+S sync to the other pane"
+            else:
+                pane_modes[dual.active] = view_mode
+                session = dual.close()
+                dual = None
+                apply_prefs()
+                message = "Single pane"
+            selected_items = session.selection
+
+        elif key == 'TAB':
+            if dual is None:
+                continue
+            pane_modes[dual.active] = view_mode
+            _, message = dual.switch()
+            session = dual.session
+            view = pane_views[dual.active]
+            view_mode = pane_modes[dual.active]
+            selected_items = session.selection
+
+        elif key in ['F5', 'F6']:
+            # Copy / move langsung ke folder pane lain lewat job queue
+            if dual is not None:
+                _, message = dual.transfer(session.target_paths(view.cursor), 'copy' if key == 'F5' else 'move')
             else:
-                message = "Clipboard is empty"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+                message = "F5/F6 copy/move to the other pane (press O for dual pane)"
+
+        elif key == 'SYNC' and dual is not None:
+            # Sync item terpilih ke folder pane lain (hanya file baru / berubah)
+            _, message = dual.transfer(session.target_paths(view.cursor), 'sync')
+
+        elif key == 'SYNC':
+            # Sync isi clipboard ke folder aktif (hanya copy file yang baru / berubah)
+            if session.clipboard_items:
+                from functions import show_sync_menu
+                success, message = show_sync_menu(current_path, session.clipboard_items)
+                if success:
+                    session.refresh()
+            else:
+                message = "Clipboard is empty (copy a folder first, then Ctrl+S to sync)"
+
         elif key == 'RENAME':
-            if selected_items:
-                message = "Cannot rename multiple items. Please select only one item."
-            elif items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                if name != "..":
-                    new_name, cancelled = get_text_input(f"Rename '{name}' to:", current_path, items, selected, filter_ext, initial_value=name)
+            if len(selected_items) > 1:
+                from functions import show_bulk_rename
+                renamed, message = show_bulk_rename(current_path, session.ordered_targets())
+                if renamed:
+                    selected_items.clear()
+                    session.refresh()
+            elif current:
+                # Satu item terpilih: rename item itu, bukan item di bawah cursor
+                targets = session.target_paths(view.cursor)
+                if targets:
+                    full_path = targets[0]
+                    name = os.path.basename(full_path)
+                    new_name, cancelled = get_text_input(f"Rename '{name}' to:", current_path, items, view.cursor, filter_ext, initial_value=name)
                     if not cancelled and new_name and new_name != name:
-                        success, msg = rename_item(full_path, new_name)
-                        message = msg
-                        all_items = scan_directory(current_path)
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                        success, message = session.rename(full_path, new_name)
+                        if success:
+                            selected_items.clear()
                     elif not cancelled:
                         message = "Rename cancelled"
                 else:
                     message = "Cannot rename parent directory marker"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'DELETE_KEY' or key == 'DELETE':
-            if selected_items:
-                paths_to_delete = [items[idx][4] for idx in selected_items if idx < len(items) and items[idx][0] != ".."]
-                if paths_to_delete:
-                    confirmed = confirm_dialog(f"Delete {len(paths_to_delete)} items? This cannot be undone!", current_path, filter_ext)
-                    if confirmed:
-                        success, msg = delete_multiple_items(paths_to_delete)
-                        message = msg
-                        all_items = scan_directory(current_path)
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        selected_items.clear()
-                        if selected >= len(items):
-                            selected = max(0, len(items) - 1)
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            elif items and selected < len(items):
-                name, is_dir, size, modified, full_path = items[selected]
-                if name != "..":
-                    confirmed = confirm_dialog(f"Delete {'folder' if is_dir else 'file'} '{name}'? This cannot be undone!", current_path, filter_ext)
-                    if confirmed:
-                        success, msg = delete_item(full_path)
-                        message = msg
-                        all_items = scan_directory(current_path)
-                        all_items = sort_items(all_items, sort_mode, sort_reverse)
-                        items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                        if selected >= len(items):
-                            selected = max(0, len(items) - 1)
-                        effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+            paths_to_delete = session.target_paths(view.cursor)
+            if paths_to_delete:
+                if selected_items:
+                    prompt = f"Move {len(paths_to_delete)} items to trash? (Ctrl+Z to undo)"
+                else:
+                    name, is_dir = current[0], current[1]
+                    prompt = f"Move {'folder' if is_dir else 'file'} '{name}' to trash? (Ctrl+Z to undo)"
+                if confirm_dialog(prompt, current_path, filter_ext):
+                    _, message = session.delete(paths_to_delete)
+
         elif key == 'NEW_FOLDER':
-            folder_name, cancelled = get_text_input("New folder name:", current_path, items, selected, filter_ext)
+            folder_name, cancelled = get_text_input("New folder name:", current_path, items, view.cursor, filter_ext)
             if not cancelled and folder_name:
-                success, msg = create_folder(current_path, folder_name)
-                message = msg
-                all_items = scan_directory(current_path)
-                all_items = sort_items(all_items, sort_mode, sort_reverse)
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                _, message = session.mkdir(folder_name)
             elif not cancelled:
                 message = "Folder creation cancelled"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'NEW_FILE':
             filename, cancelled = get_filename_input(current_path, filter_ext)
             if not cancelled and filename:
-                success, msg = create_file(current_path, filename)
-                message = msg
-                all_items = scan_directory(current_path)
-                all_items = sort_items(all_items, sort_mode, sort_reverse)
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                _, message = session.touch(filename)
             elif not cancelled:
                 message = "File creation cancelled"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'SEARCH':
-            search_query, cancelled = search_mode_input(current_path, all_items, filter_ext)
+            search_query, cancelled = search_mode_input(current_path, session.all_items, filter_ext)
             if not cancelled and search_query:
-                from functions.search_filter import search_items
-                items = search_items(all_items, search_query)
-                selected = 0
-                current_page = 0
-                selected_items.clear()
-                message = f"Search results: {len(items)} items found for '{search_query}'"
-                filter_ext = ""
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                _, message = session.search(search_query)
+                view.reset()
             else:
-                items = filter_by_extension(all_items, filter_ext) if filter_ext else all_items
+                session.set_filter(filter_ext)
                 message = "Search cancelled"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-        
+
         elif key == 'FILTER':
-            new_filter, cancelled = filter_mode_input(current_path, all_items, filter_ext)
+            new_filter, cancelled = filter_mode_input(current_path, session.all_items, filter_ext)
             if not cancelled:
-                filter_ext = new_filter
-                if filter_ext:
-                    items = filter_by_extension(all_items, filter_ext)
-                    selected = 0
-                    current_page = 0
-                    selected_items.clear()
-                    message = f"Filtered by *.{filter_ext}: {len(items)} items"
-                else:
-                    items = all_items
-                    selected = 0
-                    current_page = 0
-                    message = "Filter cleared"
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
+                _, message = session.set_filter(new_filter)
+                view.reset()
             else:
                 message = "Filter cancelled"
-            render_ui(current_path, items, selected, message, filter_ext=filter_ext, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-            
+
         elif key == 'ESC':
             if selected_items:
                 selected_items.clear()
                 message = "Selection cleared"
             else:
-                filter_ext = ""
-                items = all_items
-                selected = 0
-                current_page = 0
-                message = "Filter cleared"
-                effective_columns, _, _ = calculate_layout_info(num_columns, len(items))
-            render_ui(current_path, items, selected, message, clipboard_info=clipboard_info, sort_mode=sort_mode, view_mode=view_mode, selected_items=selected_items, num_columns=effective_columns, page=current_page)
-            
+                _, message = session.set_filter("")
+                view.reset()
+
         elif key == 'QUIT':
+            if dual is not None:
+                session = dual.close()
+            session.close()
             clear_screen()
             print("Goodbye!")
             break
 
+        else:
+            continue
+
+        draw(message)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()